@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Case Archives
+Write a case's documents straight into one ZIP or tar.zst archive per case,
+appending to the existing archive when a case is resumed
+"""
+
+import io
+import os
+import abc
+import zlib
+import time
+import struct
+import tarfile
+import zipfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ARCHIVE_FORMATS = ("zip", "tar.zst")
+
+# Written last by close(); dropped and written again when an archive is reopened
+MANIFEST_NAME = "MANIFEST.txt"
+
+def case_archive_path(download_dir: Path, archive_format: str) -> Path:
+    """Archive that takes the place of a case's download folder: <out>/<case>.zip or <out>/<case>.tar.zst"""
+    download_dir = Path(download_dir)
+    return download_dir.with_name(f"{download_dir.name}.{archive_format}")
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("tar.zst archives need zstandard: pip install zstandard") from None
+    return zstandard
+
+class CaseArchive(abc.ABC):
+    """
+    Append-only archive of one case's documents
+
+    add() writes a member and makes it durable (fsync) before returning, so an
+    interrupted run loses at most the member it was writing. Reopening an
+    existing archive keeps every complete member, drops a partly written one
+    and the manifest of the previous run, and appends after them; `name in
+    archive` tells a resumed download what is already there. Thread-safe.
+    """
+
+    format = ""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        # Member name -> uncompressed size
+        self.members: Dict[str, int] = {}
+        self.created = not self.path.exists()
+        self.closed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def open(path: Path, archive_format: str) -> "CaseArchive":
+        """Open (or create) a case archive of the given format ("zip" or "tar.zst")"""
+        if archive_format == "zip":
+            return ZipCaseArchive(path)
+        if archive_format == "tar.zst":
+            return TarZstCaseArchive(path)
+        raise ValueError(f"Unknown archive format '{archive_format}', expected one of {', '.join(ARCHIVE_FORMATS)}")
+
+    def __contains__(self, name: str) -> bool:
+        with self.lock:
+            return name in self.members
+
+    def size_of(self, name: str) -> Optional[int]:
+        """Size of a member, None if the archive does not hold it"""
+        with self.lock:
+            return self.members.get(name)
+
+    def files(self) -> List[Tuple[str, int]]:
+        """(name, size) of every member except the manifest, sorted by name"""
+        with self.lock:
+            return sorted((name, size) for name, size in self.members.items() if name != MANIFEST_NAME)
+
+    def add(self, name: str, data: bytes):
+        """Append a member and flush it to disk"""
+        with self.lock:
+            self._add(name, data)
+            self.members[name] = len(data)
+
+    def close(self, manifest: Optional[str] = None):
+        """Write the manifest (if given) as the last member and close; an archive left empty is removed"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            if manifest is not None and self.members:
+                data = manifest.encode("utf-8")
+                self._add(MANIFEST_NAME, data)
+                self.members[MANIFEST_NAME] = len(data)
+            self._close()
+            if self.created and not self.members:
+                self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "CaseArchive":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @abc.abstractmethod
+    def _add(self, name: str, data: bytes):
+        """Write one member and fsync it; called with the lock held"""
+
+    @abc.abstractmethod
+    def _close(self):
+        """Finish the archive file and close it; called with the lock held"""
+
+class ZipCaseArchive(CaseArchive):
+    """
+    ZIP case archive: PDFs are stored (they are compressed already), text is deflated
+
+    Members are fsynced as they are added, but the central directory is only
+    written by close(), so an interrupted run leaves a file without one.
+    Reopening scans the local file headers instead of trusting the central
+    directory, and the next close() writes one for the members kept.
+    """
+
+    format = "zip"
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        entries, end = self._scan() if not self.created else ([], 0)
+        if entries and entries[-1].filename == MANIFEST_NAME:
+            end = entries.pop().header_offset
+        self.file = open(self.path, "r+b" if not self.created else "w+b")
+        self.file.truncate(end)
+        # Without a central directory zipfile appends at the end of the file; the kept
+        # members are registered so the next central directory lists them again
+        self.zip = zipfile.ZipFile(self.file, "a")
+        for info in entries:
+            self.zip.filelist.append(info)
+            self.zip.NameToInfo[info.filename] = info
+            self.members[info.filename] = info.file_size
+
+    def _scan(self) -> Tuple[List[zipfile.ZipInfo], int]:
+        """Complete members from the local file headers and the offset where the last one ends"""
+        entries: List[zipfile.ZipInfo] = []
+        end = 0
+        file_size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            while True:
+                offset = f.tell()
+                header = f.read(zipfile.sizeFileHeader)
+                if len(header) < zipfile.sizeFileHeader or header[:4] != zipfile.stringFileHeader:
+                    break
+                (_, extract_version, _, flags, method, dos_time, dos_date, crc, compress_size, file_size_,
+                 name_length, extra_length) = struct.unpack(zipfile.structFileHeader, header)
+                if flags & 0x08 or compress_size == 0xFFFFFFFF:
+                    # Data descriptors and ZIP64 are never written by this class
+                    break
+                name = f.read(name_length).decode("utf-8" if flags & 0x800 else "cp437")
+                if not name:
+                    break
+                data_offset = f.tell() + extra_length
+                if data_offset + compress_size > file_size:
+                    break
+                info = zipfile.ZipInfo(name, ((dos_date >> 9) + 1980, (dos_date >> 5) & 0xF, dos_date & 0x1F,
+                                              dos_time >> 11, (dos_time >> 5) & 0x3F, (dos_time & 0x1F) * 2))
+                info.flag_bits = flags
+                info.extract_version = extract_version
+                info.compress_type = method
+                info.CRC = crc
+                info.compress_size = compress_size
+                info.file_size = file_size_
+                info.header_offset = offset
+                info.external_attr = 0o644 << 16
+                entries.append(info)
+                end = data_offset + compress_size
+                f.seek(end)
+
+            # Only the last member can be incomplete: its header is written before the data
+            if entries and not self._crc_matches(f, entries[-1]):
+                end = entries.pop().header_offset
+        return entries, end
+
+    @staticmethod
+    def _crc_matches(f, info: zipfile.ZipInfo) -> bool:
+        f.seek(info.header_offset)
+        header = struct.unpack(zipfile.structFileHeader, f.read(zipfile.sizeFileHeader))
+        # Skip the name and extra field to the member data
+        f.seek(header[10] + header[11], 1)
+        data = f.read(info.compress_size)
+        try:
+            if info.compress_type == zipfile.ZIP_DEFLATED:
+                data = zlib.decompressobj(-15).decompress(data)
+            elif info.compress_type != zipfile.ZIP_STORED:
+                return False
+        except zlib.error:
+            return False
+        return len(data) == info.file_size and zlib.crc32(data) == info.CRC
+
+    def _add(self, name: str, data: bytes):
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        info.compress_type = zipfile.ZIP_STORED if name.lower().endswith(".pdf") else zipfile.ZIP_DEFLATED
+        self.zip.writestr(info, data)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _close(self):
+        # Writes the central directory, once for the whole case
+        self.zip.close()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+class TarZstCaseArchive(CaseArchive):
+    """
+    tar archive compressed with Zstandard (needs the zstandard package)
+
+    Every member is its own zstd frame, and consecutive frames decompress as one
+    tar stream (tar --zstd -xf case.tar.zst). Appending adds frames; close()
+    ends the tar stream with a frame holding the end-of-archive blocks, which a
+    reopen drops along with the manifest before it.
+    """
+
+    format = "tar.zst"
+
+    def __init__(self, path: Path):
+        self.zstd = _zstandard()
+        super().__init__(path)
+        self.compressor = self.zstd.ZstdCompressor(level=3)
+        end = 0 if self.created else self._scan()
+        self.file = open(self.path, "r+b" if not self.created else "w+b")
+        self.file.truncate(end)
+        self.file.seek(end)
+
+    def _scan(self) -> int:
+        """Register the complete members and return the offset where they end"""
+        frames = []
+        with open(self.path, "rb") as f:
+            offset = 0
+            while True:
+                decompressor = self.zstd.ZstdDecompressor().decompressobj()
+                content = []
+                try:
+                    while not decompressor.eof:
+                        chunk = f.read(1 << 20)
+                        if not chunk:
+                            break
+                        content.append(decompressor.decompress(chunk))
+                except self.zstd.ZstdError:
+                    break
+                if not decompressor.eof:
+                    break
+                end = f.tell() - len(decompressor.unused_data)
+                block = b"".join(content)
+                if not block.strip(tarfile.NUL):
+                    # End-of-archive blocks written by close()
+                    break
+                try:
+                    member = tarfile.open(fileobj=io.BytesIO(block), mode="r:").next()
+                except tarfile.TarError:
+                    break
+                if member is None:
+                    break
+                frames.append((member.name, member.size, offset))
+                offset = end
+                f.seek(end)
+
+        if frames and frames[-1][0] == MANIFEST_NAME:
+            offset = frames.pop()[2]
+        for name, size, _ in frames:
+            self.members[name] = size
+        return offset
+
+    def _write_frame(self, block: bytes):
+        self.file.write(self.compressor.compress(block))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def _add(self, name: str, data: bytes):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        padding = tarfile.NUL * (-len(data) % tarfile.BLOCKSIZE)
+        self._write_frame(info.tobuf(format=tarfile.PAX_FORMAT) + data + padding)
+
+    def _close(self):
+        self._write_frame(tarfile.NUL * (tarfile.BLOCKSIZE * 2))
+        self.file.close()
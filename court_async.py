@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Asyncio Engine
+AsyncGalvestonCourtScraper downloads documents on one event loop (httpx or aiohttp)
+while Selenium navigation runs in an executor
+"""
+
+import time
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+from court_events import DocumentStarted, DocumentFinished
+from court_http import ASYNC_HTTP_BACKENDS, create_async_http_client
+from court_retry import OUTAGE_STATUSES, circuit_breaker_for
+from court_archive import case_archive_path
+from court_scraper import (GalvestonCourtScraper, DocumentFilter, DocumentInfo, DEFAULT_DOWNLOAD_CONCURRENCY,
+                           SESSION_EXPIRY_THRESHOLD, case_download_dir, expired_runs)
+
+# Document requests in flight at once across all cases of an event loop
+DEFAULT_MAX_IN_FLIGHT = 100
+
+class AsyncGalvestonCourtScraper(GalvestonCourtScraper):
+    """
+    GalvestonCourtScraper whose downloads run as asyncio tasks
+
+    Selenium is synchronous, so navigation and session renewal run in
+    browser_executor, and saving files (or placeholders) runs in the loop's
+    default executor; the event loop itself only waits on sockets. Every
+    document is its own task that retries on its own backoff. At most
+    max_concurrent documents of a case and max_in_flight documents overall
+    (all scrapers sharing `semaphore`) are requested at once, and request starts
+    of a case are still spaced by its request_rate.
+
+    scrape_case_async returns the same result dicts as scrape_case. The
+    process-wide download scheduler (download_slots, download_bandwidth,
+    download_queue_limit) is not used: the shared semaphore takes its place.
+    """
+
+    def __init__(self, *args, async_backend: str = "httpx", max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 max_concurrent: int = DEFAULT_DOWNLOAD_CONCURRENCY, http_client=None,
+                 semaphore: Optional[asyncio.Semaphore] = None,
+                 browser_executor: Optional[ThreadPoolExecutor] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if async_backend not in ASYNC_HTTP_BACKENDS:
+            raise ValueError(f"Unknown async HTTP backend: {async_backend}")
+        if max_in_flight < 1 or max_concurrent < 1:
+            raise ValueError("max_in_flight and max_concurrent must be at least 1")
+        self.async_backend = async_backend
+        self.max_in_flight = max_in_flight
+        self.max_concurrent = max_concurrent
+        # A client, semaphore or executor passed in is shared with other scrapers and not closed here
+        self.http_client = http_client
+        self.owns_http_client = False
+        self.semaphore = semaphore
+        self.browser_executor = browser_executor
+        self.owns_browser_executor = False
+
+    async def _get_http_client(self):
+        if self.http_client is None:
+            self.http_client = create_async_http_client(self.async_backend, pool_size=self.max_in_flight,
+                                                        connect_timeout=self.connect_timeout,
+                                                        read_timeout=self.read_timeout)
+            self.owns_http_client = True
+        return self.http_client
+
+    async def in_browser(self, function, *args):
+        """Run a blocking browser call (navigation, closing the driver) in the browser executor"""
+        if self.browser_executor is None:
+            # One thread keeps all calls on this scraper's driver in order
+            self.browser_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser")
+            self.owns_browser_executor = True
+        return await asyncio.get_running_loop().run_in_executor(self.browser_executor, function, *args)
+
+    async def aclose(self):
+        """Close the browser and whatever client and executor this scraper created itself"""
+        if self.driver:
+            await self.in_browser(self.close_driver)
+        if self.owns_http_client:
+            await self.http_client.close()
+            self.http_client = None
+            self.owns_http_client = False
+        if self.owns_browser_executor:
+            self.browser_executor.shutdown(wait=False)
+            self.browser_executor = None
+            self.owns_browser_executor = False
+
+    async def __aenter__(self) -> "AsyncGalvestonCourtScraper":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def scrape_case_async(self, case_number: str, download_dir: Optional[Path] = None,
+                                document_filter: Optional[DocumentFilter] = None,
+                                list_only: Optional[bool] = None) -> Dict:
+        """
+        Navigate, parse and download a case, like scrape_case
+
+        The browser is closed as soon as the document page is open, so a case
+        waiting for download slots holds no browser.
+        """
+        try:
+            self.log(f"Starting scrape for case: {case_number}")
+            try:
+                navigation_result = await self.in_browser(self.navigate_to_case, case_number)
+            finally:
+                await self.in_browser(self.close_driver)
+            if not navigation_result:
+                return {"success": False, "error": "Navigation failed", "case_number": case_number}
+
+            html_source, cookies = navigation_result
+            return await self.process_case_page_async(case_number, html_source, cookies, download_dir,
+                                                      document_filter, list_only)
+
+        except Exception as e:
+            self.log(f"Scrape failed for case {case_number}: {str(e)}", "ERROR")
+            return {"success": False, "error": str(e), "case_number": case_number}
+
+        finally:
+            if self.driver:
+                # Opened again by a session renewal
+                await self.in_browser(self.close_driver)
+
+    async def process_case_page_async(self, case_number: str, html_source, cookies: Optional[dict],
+                                      download_dir: Optional[Path] = None,
+                                      document_filter: Optional[DocumentFilter] = None,
+                                      list_only: Optional[bool] = None) -> Dict:
+        """process_case_page with the downloads on the event loop (see process_case_page for the arguments)"""
+        loop = asyncio.get_running_loop()
+        listing = self.list_only if list_only is None else list_only
+        if listing or not download_dir:
+            # Nothing to download: the synchronous path is already the right one
+            return await loop.run_in_executor(None, self.process_case_page, case_number, html_source, cookies,
+                                              download_dir, document_filter, list_only)
+
+        self.report_progress(1, 1, "📄 Parsing document information from HTML", "parsing")
+        document_filter = document_filter or self.document_filter
+        counts = {"documents": 0, "selected": 0}
+
+        def select() -> List[DocumentInfo]:
+            filenames = self._filename_registry(download_dir)
+            return list(self._select_documents(html_source, filenames, document_filter, counts))
+
+        selected = await loop.run_in_executor(None, select)
+        priority = self.download_priority
+        if priority and priority.active:
+            unsized = [doc for doc in selected if not doc.size]
+            if priority.needs_sizes and unsized:
+                await loop.run_in_executor(None, self.fetch_document_sizes, unsized, cookies)
+            selected = priority.sort(selected)
+
+        download_stats = await self.download_documents_async(selected, download_dir, cookies,
+                                                             case_number=case_number)
+        if (download_stats["successful"] > 0 or download_stats["secured"] > 0) and not self.archive_format:
+            await loop.run_in_executor(None, self.create_manifest, download_dir)
+
+        if not counts["documents"]:
+            return {"success": True, "documents": 0, "downloaded": 0, "message": "No documents found",
+                    "case_number": case_number}
+        if document_filter and document_filter.active:
+            self.log(f"Filter selected {counts['selected']} of {counts['documents']} documents")
+        result = self._case_result(case_number, counts, download_stats)
+        if self.archive_format:
+            result["archive"] = str(case_archive_path(download_dir, self.archive_format))
+        return result
+
+    async def download_documents_async(self, documents: List[DocumentInfo], download_dir: Path,
+                                       cookies: Optional[dict] = None,
+                                       case_number: Optional[str] = None) -> Dict:
+        """
+        Download documents concurrently on the event loop; returns the stats of download_documents
+
+        Documents are started in list order and finish in any order. As in
+        download_documents, a journal skips finished documents when case_number
+        is given, and when SESSION_EXPIRY_THRESHOLD or more consecutive documents
+        (in the order the portal answered them) got the portal's session timeout
+        page the session is renewed once and the timed-out documents from there
+        on are fetched again; the rest are settled like download_documents settles
+        them. With an archive_format they are saved into the case archive, as by
+        download_documents.
+        """
+        loop = asyncio.get_running_loop()
+        if self.archive_format and self.archive is None:
+            # Opening scans the archive and closing writes its manifest, both off the event loop
+            archive = self.case_archive(download_dir)
+            await loop.run_in_executor(None, archive.__enter__)
+            try:
+                return await self.download_documents_async(documents, download_dir, cookies, case_number)
+            finally:
+                await loop.run_in_executor(None, archive.__exit__, None, None, None)
+
+        started = time.monotonic()
+        stats = {"successful": 0, "failed": 0, "skipped": 0, "secured": 0, "session_renewals": 0,
+                 "first_try": 0, "recovered": 0, "permanent_failures": [], "first_document_seconds": None}
+        if not documents:
+            self.log("No documents to download")
+            return stats
+
+        if self.archive is None:
+            await loop.run_in_executor(None, lambda: download_dir.mkdir(parents=True, exist_ok=True))
+        self.log(f"Starting async download of {len(documents)} documents to {download_dir}")
+        self.report_progress(0, len(documents), f"Preparing to download {len(documents)} documents", "download")
+
+        client = await self._get_http_client()
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        case_slots = asyncio.Semaphore(self.max_concurrent)
+        pacing = asyncio.Lock()
+        next_start = [0.0]
+        session = {"cookies": dict(cookies or {})}
+        journal = self.journal if case_number else None
+        policy = self.retry_policy
+        # (position, doc, final result) in the order results came in ('skipped' when no download was
+        # needed); position orders them by when the portal answered, before the response was handled
+        timeline = []
+        positions = itertools.count()
+        finished = [0]
+
+        async def pace():
+            # Space this case's request starts by request_delay, like the sequential loop
+            if not self.request_delay:
+                return
+            async with pacing:
+                wait = next_start[0] - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                next_start[0] = time.monotonic() + self.request_delay
+
+        async def process(doc: DocumentInfo, check_done: bool = True):
+            file_path = download_dir / doc.filename
+            if check_done:
+                if journal and journal.is_document_done(case_number, doc.key):
+                    self.log(f"SKIP: {doc.filename} (completed in journal)")
+                    timeline.append((next(positions), doc, 'skipped'))
+                    stats["skipped"] += 1
+                    self.emit_event(DocumentFinished, filename=doc.filename, fragment_id=doc.fragment_id,
+                                    status='skipped')
+                    return
+                existing_size = saved_sizes.get(doc.key)
+                if existing_size is not None:
+                    self.log(f"SKIP: {doc.filename} (exists, {existing_size:,} bytes)")
+                    timeline.append((next(positions), doc, 'skipped'))
+                    stats["skipped"] += 1
+                    if journal:
+                        await loop.run_in_executor(None, journal.record_document, case_number, doc.key,
+                                                   doc.filename, 'skipped')
+                    self.emit_event(DocumentFinished, filename=doc.filename, fragment_id=doc.fragment_id,
+                                    status='skipped')
+                    return
+
+            result, attempt = 'failed', 0
+            answered = []
+            try:
+                for attempt in range(1, policy.max_attempts + 1):
+                    answered.clear()
+                    self.emit_event(DocumentStarted, filename=doc.filename, fragment_id=doc.fragment_id,
+                                    attempt=attempt)
+                    async with self.semaphore, case_slots:
+                        await pace()
+                        result, retry_after = await self._download_once_async(
+                            client, doc, file_path, session["cookies"],
+                            on_response=lambda size: answered.append(next(positions)))
+                    gave_up = result == 'retry' and attempt >= policy.max_attempts
+                    self.emit_event(DocumentFinished, filename=doc.filename, fragment_id=doc.fragment_id,
+                                    status='failed' if gave_up else result, attempt=attempt)
+                    if result != 'retry':
+                        break
+                    if not gave_up:
+                        delay = policy.delay(attempt, retry_after)
+                        self.log(f"Retrying {doc.filename} in {delay:.1f}s (attempt {attempt} failed)")
+                        await asyncio.sleep(delay)
+            except Exception as e:
+                self.log(f"ERROR downloading {doc.filename}: {str(e)}", "ERROR")
+                result = 'failed'
+
+            if check_done:
+                # A document fetched again after a session renewal was counted the first time
+                finished[0] += 1
+            self.report_progress(finished[0], len(documents), f"Processed: {doc.filename}", "download")
+            if result == 'retry':
+                self.log(f"FAILED: {doc.filename} - giving up after {attempt} attempts", "ERROR")
+                result = 'failed'
+            timeline.append((answered[0] if answered else next(positions), doc, result))
+            if result == 'expired':
+                # Settled with its run once every document has a result
+                return
+            if result == 'success':
+                stats["successful"] += 1
+                if stats["first_document_seconds"] is None:
+                    stats["first_document_seconds"] = round(time.monotonic() - started, 3)
+                    self.log(f"First document after {stats['first_document_seconds']:.2f}s: {doc.filename}")
+                if attempt > 1:
+                    stats["recovered"] += 1
+            elif result == 'secured':
+                stats["secured"] += 1
+            else:
+                stats["failed"] += 1
+                stats["permanent_failures"].append(doc.filename)
+            if journal and result in ('success', 'secured'):
+                await loop.run_in_executor(None, journal.record_document, case_number, doc.key, doc.filename,
+                                           result)
+
+        # Saved files are looked up in one executor call up front, so no document waits on its own
+        # lookup and the request slots are taken in list order
+        saved_sizes = await loop.run_in_executor(None, lambda: {
+            doc.key: self._finished_size(download_dir / doc.filename) for doc in documents
+            if not (journal and journal.is_document_done(case_number, doc.key))})
+        await asyncio.gather(*(process(doc) for doc in documents))
+
+        def latest_results() -> List:
+            # A document fetched again after a renewal counts at the time of its new result
+            latest = {doc.key: (position, doc, result) for position, doc, result in timeline}
+            return [(doc, result) for _, doc, result in sorted(latest.values(), key=lambda entry: entry[0])]
+
+        # Timeout pages are judged by runs in the order the portal answered, as download_documents sees them
+        runs = expired_runs(latest_results())
+        long_runs = [run for run in runs if len(run) >= SESSION_EXPIRY_THRESHOLD]
+        if long_runs and case_number:
+            fresh_cookies = await self.in_browser(self._renew_session, case_number)
+            if fresh_cookies:
+                stats["session_renewals"] += 1
+                session["cookies"] = dict(fresh_cookies)
+                # download_documents carries on from the first long run with the new session
+                results = latest_results()
+                first = next(index for index, (doc, _) in enumerate(results) if doc is long_runs[0][0])
+                retry = [doc for doc, result in results[first:] if result == 'expired']
+                await asyncio.gather(*(process(doc, check_done=False) for doc in retry))
+                runs = expired_runs(latest_results())
+
+        for run in runs:
+            run_secured, run_failures = await loop.run_in_executor(
+                None, self._settle_expired_run, [(doc, download_dir / doc.filename) for doc in run], journal,
+                case_number)
+            stats["secured"] += run_secured
+            stats["failed"] += len(run_failures)
+            stats["permanent_failures"].extend(run_failures)
+
+        stats["first_try"] = stats["successful"] - stats["recovered"]
+        self.log(f"Download complete: {stats['successful']} successful ({stats['recovered']} after retries), "
+                 f"{stats['secured']} secured, {stats['failed']} failed, {stats['skipped']} skipped")
+        return stats
+
+    async def _download_once_async(self, client, doc: DocumentInfo, file_path: Path,
+                                   cookies: Optional[dict] = None,
+                                   on_response: Optional[Callable[[int], None]] = None):
+        """
+        One download attempt on the async client, as _download_once (including on_response)
+
+        Only a tripped circuit breaker blocks, so only then is it waited for in
+        an executor thread. The response is validated and written in the default
+        executor, keeping file I/O off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        url = urljoin(self.base_url, doc.url)
+        policy = self.retry_policy
+        breaker = circuit_breaker_for(url, policy.breaker_threshold, policy.breaker_reset)
+
+        self.log(f"Downloading: {doc.filename}")
+        if breaker.is_open:
+            waited = await loop.run_in_executor(None, breaker.before_request)
+            if waited >= 1:
+                self.log(f"Portal circuit breaker held {doc.filename} for {waited:.1f}s", "WARNING")
+        else:
+            breaker.before_request()
+
+        try:
+            response = await client.get(url, cookies=cookies)
+        except Exception as e:
+            if not policy.should_retry_exception(e):
+                breaker.release()
+                self.log(f"ERROR downloading {doc.filename}: {str(e)}", "ERROR")
+                return 'failed', None
+            breaker.record_failure()
+            self.log(f"Exception downloading {doc.filename}, will retry: {str(e) or type(e).__name__}", "WARNING")
+            return 'retry', None
+
+        if on_response:
+            on_response(len(response.content))
+        if response.status_code in OUTAGE_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        return await loop.run_in_executor(None, self._handle_download_response, doc, file_path, response)
+
+async def scrape_cases_async(case_numbers: List[str], out_dir: Path, browsers: int = 1,
+                             max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, async_backend: str = "httpx",
+                             rate: float = 1.0, headless: bool = True, verbose: bool = False,
+                             on_result=None, journal=None, scraper_options: Optional[Dict] = None,
+                             scraper_class=AsyncGalvestonCourtScraper) -> List[Dict]:
+    """
+    Scrape several cases on one event loop
+
+    All cases share one async HTTP client and one semaphore of max_in_flight
+    document requests; at most `browsers` cases navigate at the same time.
+
+    Args:
+        case_numbers: Case numbers to process
+        out_dir: Folder that receives one sub-folder per case
+        browsers: Cases navigated at the same time (each in its own browser)
+        max_in_flight: Document requests in flight at once across all cases
+        async_backend: "httpx" or "aiohttp"
+        rate, headless, verbose, on_result, journal, scraper_options: As for run_cases
+
+    Returns:
+        List of result dicts in completion order
+    """
+    options = dict(scraper_options or {})
+    connect_timeout = options.get("connect_timeout", 10.0)
+    read_timeout = options.get("read_timeout", 30.0)
+    browser_executor = ThreadPoolExecutor(max_workers=max(1, browsers), thread_name_prefix="browser")
+    client = create_async_http_client(async_backend, pool_size=max_in_flight, connect_timeout=connect_timeout,
+                                      read_timeout=read_timeout)
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    results = []
+
+    def record(result: Dict):
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    if journal:
+        for case_number in [case for case in case_numbers if journal.is_case_done(case)]:
+            record(dict(journal.case_result(case_number), resumed=True))
+        case_numbers = [case for case in case_numbers if not journal.is_case_done(case)]
+
+    async def process(case_number: str) -> Dict:
+        download_dir = case_download_dir(out_dir, case_number)
+        scraper = scraper_class(headless=headless, verbose=verbose, request_rate=rate, journal=journal,
+                                async_backend=async_backend, max_in_flight=max_in_flight, http_client=client,
+                                semaphore=semaphore, browser_executor=browser_executor, **options)
+        try:
+            result = await scraper.scrape_case_async(case_number, download_dir)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        result.setdefault("case_number", case_number)
+        result["download_dir"] = str(download_dir)
+        if journal:
+            await asyncio.get_running_loop().run_in_executor(None, journal.record_case, case_number, result)
+        return result
+
+    try:
+        for next_result in asyncio.as_completed([process(case_number) for case_number in case_numbers]):
+            record(await next_result)
+    finally:
+        await client.close()
+        browser_executor.shutdown(wait=False)
+    return results
+
+def run_async(case_numbers: List[str], out_dir: Path, browsers: int = 1,
+              max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, async_backend: str = "httpx", **kwargs) -> List[Dict]:
+    """Scrape cases with the asyncio engine from synchronous code (see scrape_cases_async)"""
+    return asyncio.run(scrape_cases_async(case_numbers, out_dir, browsers=browsers, max_in_flight=max_in_flight,
+                                          async_backend=async_backend, **kwargs))
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Batch Runners
+Spread a list of cases over several worker processes, each with its own browser,
+or pipeline one browser's navigation with the previous case's downloads
+"""
+
+import time
+import queue
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from court_scraper import GalvestonCourtScraper, DEFAULT_DOWNLOAD_CONCURRENCY, case_download_dir
+from court_journal import BatchJournal
+
+def _process_worker(worker_id: int, conn, out_dir: str, scraper_class, scraper_options: Dict,
+                    journal_path: Optional[str] = None):
+    """
+    Worker process loop: scrape every case received on conn until None arrives
+
+    Each worker owns one scraper (and therefore one browser at a time). Document
+    completion goes to the shared journal file; the parent records finished cases.
+    """
+    if journal_path:
+        scraper_options = dict(scraper_options, journal=BatchJournal(Path(journal_path), resume=True))
+    scraper = scraper_class(**scraper_options)
+    while True:
+        case_number = conn.recv()
+        if case_number is None:
+            break
+
+        download_dir = case_download_dir(Path(out_dir), case_number)
+        try:
+            result = scraper.scrape_case(case_number, download_dir)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        result.setdefault("case_number", case_number)
+        result["download_dir"] = str(download_dir)
+        result["worker"] = worker_id
+        conn.send((case_number, result))
+
+class ShardedBatchRunner:
+    """
+    Run a case list across several processes and collect the results
+
+    Cases are handed out one at a time to whichever worker is idle, so a slow
+    case never holds back a whole pre-assigned shard. The parent always knows
+    which case each worker holds: if a worker dies, its case is sent to a fresh
+    worker (up to max_case_retries times) and then reported as failed, so no
+    case is ever silently lost. Each worker talks to the parent over its own
+    pipe, so a worker killed mid-message cannot block the others.
+
+    With a journal, cases it lists as finished are reported from the journal
+    without starting a worker, and workers skip documents already finished.
+    """
+
+    def __init__(self, out_dir: Path, processes: Optional[int] = None, headless: bool = True,
+                 verbose: bool = False, rate: float = 1.0, max_case_retries: int = 1,
+                 scraper_class=GalvestonCourtScraper, start_method: Optional[str] = None,
+                 journal: Optional[BatchJournal] = None, scraper_options: Optional[Dict] = None):
+        self.out_dir = Path(out_dir)
+        self.journal = journal
+        self.processes = max(1, processes or multiprocessing.cpu_count())
+        self.scraper_options = dict(scraper_options or {}, headless=headless, verbose=verbose,
+                                    request_rate=rate)
+        self.max_case_retries = max_case_retries
+        self.scraper_class = scraper_class
+        self.context = multiprocessing.get_context(start_method)
+
+    def _start_worker(self, worker_id: int) -> Dict:
+        """Start a worker process connected to the parent by a pipe"""
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(
+            target=_process_worker,
+            args=(worker_id, child_conn, str(self.out_dir), self.scraper_class, self.scraper_options,
+                  str(self.journal.path) if self.journal else None),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return {"id": worker_id, "process": process, "conn": parent_conn, "case": None}
+
+    def run(self, case_numbers: List[str], on_result=None, on_progress=None) -> List[Dict]:
+        """
+        Process all cases and return their result dicts in completion order
+
+        Args:
+            case_numbers: Case numbers to process
+            on_result: Optional callable invoked with each result dict as its case finishes
+            on_progress: Optional callable invoked with (completed, total) after each case
+        """
+        pending = list(dict.fromkeys(case_numbers))
+        total = len(pending)
+        attempts = {case_number: 0 for case_number in pending}
+        results = []
+
+        def record(result: Dict):
+            if self.journal and not result.get("resumed"):
+                self.journal.record_case(result["case_number"], result)
+            results.append(result)
+            if on_result:
+                on_result(result)
+            if on_progress:
+                on_progress(len(results), total)
+
+        if self.journal:
+            for case_number in [case for case in pending if self.journal.is_case_done(case)]:
+                record(dict(self.journal.case_result(case_number), resumed=True))
+            pending = [case for case in pending if not self.journal.is_case_done(case)]
+
+        workers = []
+        next_worker_id = 0
+
+        def assign(worker: Dict):
+            worker["case"] = pending.pop(0) if pending else None
+            if worker["case"] is not None:
+                attempts[worker["case"]] += 1
+            worker["conn"].send(worker["case"])
+
+        def worker_died(worker: Dict):
+            workers.remove(worker)
+            worker["conn"].close()
+            worker["process"].join()
+            case_number = worker["case"]
+            if case_number is None:
+                return
+            if attempts[case_number] <= self.max_case_retries:
+                pending.insert(0, case_number)
+            else:
+                record({
+                    "success": False,
+                    "error": f"Worker process exited with code {worker['process'].exitcode}",
+                    "case_number": case_number,
+                    "download_dir": str(case_download_dir(self.out_dir, case_number)),
+                    "worker": worker["id"]
+                })
+
+        try:
+            while len(results) < total:
+                # Keep one live worker per process slot while cases are waiting
+                busy = sum(1 for worker in workers if worker["case"] is not None)
+                while pending and busy < self.processes:
+                    idle = [worker for worker in workers if worker["case"] is None
+                            and worker["process"].is_alive()]
+                    if idle:
+                        worker = idle[0]
+                    else:
+                        worker = self._start_worker(next_worker_id)
+                        workers.append(worker)
+                        next_worker_id += 1
+                    assign(worker)
+                    busy += 1
+
+                active = [worker for worker in workers if worker["case"] is not None]
+                ready = wait([worker["conn"] for worker in active] +
+                             [worker["process"].sentinel for worker in active])
+                for worker in active:
+                    if worker["conn"] in ready:
+                        try:
+                            case_number, result = worker["conn"].recv()
+                        except (EOFError, OSError):
+                            worker_died(worker)
+                            continue
+                        worker["case"] = None
+                        record(result)
+                    elif worker["process"].sentinel in ready:
+                        worker_died(worker)
+        finally:
+            for worker in workers:
+                try:
+                    worker["conn"].send(None)
+                except OSError:
+                    pass
+            for worker in workers:
+                worker["process"].join(timeout=5)
+                if worker["process"].is_alive():
+                    worker["process"].terminate()
+                worker["conn"].close()
+
+        return results
+
+def run_sharded(case_numbers: List[str], out_dir: Path, processes: Optional[int] = None,
+                rate: float = 1.0, headless: bool = True, verbose: bool = False,
+                on_result=None, on_progress=None, journal: Optional[BatchJournal] = None,
+                scraper_options: Optional[Dict] = None) -> List[Dict]:
+    """Scrape cases across worker processes (see ShardedBatchRunner)"""
+    runner = ShardedBatchRunner(out_dir, processes=processes, headless=headless, verbose=verbose,
+                                rate=rate, journal=journal, scraper_options=scraper_options)
+    return runner.run(case_numbers, on_result=on_result, on_progress=on_progress)
+
+class PipelinedBatchRunner:
+    """
+    Run a case list in two overlapping stages: navigation and downloads
+
+    One browser navigates case after case and puts each open document page (its
+    HTML and session cookies) on a bounded queue. Download threads take pages off
+    the queue and parse and download them with process_case_page, which needs no
+    browser. So while case N downloads, the browser already navigates case N+1.
+    When queue_size navigated cases are waiting, the browser pauses until a
+    download thread takes one, which keeps page HTML and session cookies from
+    piling up or going stale.
+
+    After run(), stats holds the wall time and how busy each stage was:
+    navigation_utilization is the browser's busy share of the wall time, and
+    download_utilization is the download threads' average busy share.
+    navigation_blocked_seconds (queue full) shows that downloads are the
+    bottleneck; download_idle_seconds (queue empty) shows that navigation is.
+    """
+
+    def __init__(self, out_dir: Path, download_workers: int = 1, queue_size: int = 2, headless: bool = True,
+                 verbose: bool = False, rate: float = 1.0, scraper_class=GalvestonCourtScraper,
+                 journal: Optional[BatchJournal] = None, scraper_options: Optional[Dict] = None):
+        self.out_dir = Path(out_dir)
+        self.download_workers = max(1, download_workers)
+        self.queue_size = max(1, queue_size)
+        self.journal = journal
+        self.scraper_class = scraper_class
+        self.scraper_options = dict(scraper_options or {}, headless=headless, verbose=verbose,
+                                    request_rate=rate)
+        # The download threads share the process-wide download pool
+        self.scraper_options.setdefault("http_pool_size", DEFAULT_DOWNLOAD_CONCURRENCY * self.download_workers)
+        self.stats: Dict = {}
+
+    def run(self, case_numbers: List[str], on_result=None, on_progress=None) -> List[Dict]:
+        """
+        Process all cases and return their result dicts in completion order
+
+        Args:
+            case_numbers: Case numbers to process
+            on_result: Optional callable invoked with each result dict as its case finishes
+            on_progress: Optional callable invoked with (completed, total) after each case
+        """
+        pending = list(dict.fromkeys(case_numbers))
+        total = len(pending)
+        results = []
+        lock = threading.Lock()
+        stop = threading.Event()
+        pages = queue.Queue(maxsize=self.queue_size)
+        timings = {"navigation_busy": 0.0, "navigation_blocked": 0.0, "download_busy": 0.0,
+                   "download_idle": 0.0, "max_queue_depth": 0}
+        done = object()
+
+        def record(result: Dict):
+            with lock:
+                if self.journal and not result.get("resumed"):
+                    self.journal.record_case(result["case_number"], result)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+                if on_progress:
+                    on_progress(len(results), total)
+
+        if self.journal:
+            for case_number in [case for case in pending if self.journal.is_case_done(case)]:
+                record(dict(self.journal.case_result(case_number), resumed=True))
+            pending = [case for case in pending if not self.journal.is_case_done(case)]
+
+        def navigate():
+            navigator = self.scraper_class(**self.scraper_options)
+            try:
+                for case_number in pending:
+                    if stop.is_set():
+                        break
+                    started = time.monotonic()
+                    try:
+                        page = navigator.navigate_to_case(case_number)
+                        error = None if page else "Navigation failed"
+                    except Exception as e:
+                        page, error = None, str(e)
+                    timings["navigation_busy"] += time.monotonic() - started
+
+                    started = time.monotonic()
+                    while not stop.is_set():
+                        try:
+                            pages.put((case_number, page, error), timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    timings["navigation_blocked"] += time.monotonic() - started
+                    with lock:
+                        timings["max_queue_depth"] = max(timings["max_queue_depth"], pages.qsize())
+            finally:
+                navigator.close_driver()
+                for _ in range(self.download_workers):
+                    pages.put(done)
+
+        def download():
+            options = dict(self.scraper_options, journal=self.journal)
+            while True:
+                started = time.monotonic()
+                item = pages.get()
+                idle = time.monotonic() - started
+                if item is done:
+                    break
+                if stop.is_set():
+                    # Interrupted: pages still queued are dropped, not downloaded
+                    continue
+                case_number, page, error = item
+                started = time.monotonic()
+                download_dir = case_download_dir(self.out_dir, case_number)
+                if page is None:
+                    result = {"success": False, "error": error}
+                else:
+                    # A browser only starts if the portal session has to be renewed
+                    scraper = self.scraper_class(**options)
+                    try:
+                        result = scraper.process_case_page(case_number, page[0], page[1], download_dir)
+                    except Exception as e:
+                        result = {"success": False, "error": str(e)}
+                    finally:
+                        scraper.close_driver()
+                result.setdefault("case_number", case_number)
+                result["download_dir"] = str(download_dir)
+                with lock:
+                    timings["download_idle"] += idle
+                    timings["download_busy"] += time.monotonic() - started
+                if not stop.is_set():
+                    record(result)
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=navigate, name="navigation", daemon=True)]
+        threads += [threading.Thread(target=download, name=f"download-{n}", daemon=True)
+                    for n in range(self.download_workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except BaseException:
+            # Interrupted: the browser stops after its current case, queued pages are dropped
+            stop.set()
+            raise
+        finally:
+            wall = time.monotonic() - started
+            self.stats = {
+                "cases": len(pending),
+                "wall_seconds": round(wall, 3),
+                "navigation_busy_seconds": round(timings["navigation_busy"], 3),
+                "navigation_blocked_seconds": round(timings["navigation_blocked"], 3),
+                "download_busy_seconds": round(timings["download_busy"], 3),
+                "download_idle_seconds": round(timings["download_idle"], 3),
+                "navigation_utilization": round(timings["navigation_busy"] / wall, 3) if wall else 0.0,
+                "download_utilization": round(timings["download_busy"] / (wall * self.download_workers), 3)
+                                        if wall else 0.0,
+                "max_queue_depth": timings["max_queue_depth"]
+            }
+
+        return results
+
+def run_pipelined(case_numbers: List[str], out_dir: Path, download_workers: int = 1, queue_size: int = 2,
+                  rate: float = 1.0, headless: bool = True, verbose: bool = False, on_result=None,
+                  on_progress=None, on_stats=None, journal: Optional[BatchJournal] = None,
+                  scraper_options: Optional[Dict] = None) -> List[Dict]:
+    """Scrape cases with navigation and downloads overlapped (see PipelinedBatchRunner)"""
+    runner = PipelinedBatchRunner(out_dir, download_workers=download_workers, queue_size=queue_size,
+                                  headless=headless, verbose=verbose, rate=rate, journal=journal,
+                                  scraper_options=scraper_options)
+    try:
+        return runner.run(case_numbers, on_result=on_result, on_progress=on_progress)
+    finally:
+        if on_stats and runner.stats:
+            on_stats(runner.stats)
+
+def summarize_results(results: List[Dict]) -> Dict:
+    """Aggregate per-case result dicts into batch totals"""
+    summary = {"cases": len(results), "succeeded": 0, "failed": 0, "documents": 0,
+               "downloaded": 0, "recovered": 0, "secured": 0, "failed_documents": 0, "skipped": 0}
+    for result in results:
+        if not result.get("success"):
+            summary["failed"] += 1
+            continue
+        summary["succeeded"] += 1
+        summary["documents"] += result.get("documents", 0)
+        summary["downloaded"] += result.get("downloaded", 0)
+        summary["recovered"] += result.get("recovered", 0)
+        summary["secured"] += result.get("secured", 0)
+        summary["failed_documents"] += result.get("failed", 0)
+        summary["skipped"] += result.get("skipped", 0)
+    return summary
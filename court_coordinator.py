@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Job Coordinator
+Spread large backfills over several machines with leased case jobs
+
+The coordinator keeps every case job in SQLite and hands them out over a small
+HTTP/JSON API. Workers lease one case at a time, send heartbeats while the case
+runs and report the result dict from scrape_case. A lease that is not renewed
+before it expires (worker killed, machine lost) goes back to the queue.
+
+Usage:
+    python court_coordinator.py serve --db coordinator.db --port 8765
+    python court_coordinator.py submit --url http://host:8765 --cases-file cases.txt
+    python court_coordinator.py worker --url http://host:8765 --out downloads
+    python court_coordinator.py status --url http://host:8765
+"""
+
+import sys
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import requests
+from pathlib import Path
+from typing import List, Dict, Optional
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from court_scraper import GalvestonCourtScraper, case_download_dir, load_case_numbers
+from court_deeplinks import DEEP_LINK_FILENAME
+
+DEFAULT_PORT = 8765
+DEFAULT_LEASE_SECONDS = 900
+
+# Job states
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+class JobStore:
+    """SQLite-backed case job queue with leases"""
+
+    def __init__(self, db_path: str, max_attempts: int = 3):
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                case_number TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+
+    def close(self):
+        """Close the database connection"""
+        with self.lock:
+            self.conn.close()
+
+    @staticmethod
+    def _job(row) -> Dict:
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def add_jobs(self, case_numbers: List[str]) -> int:
+        """Queue case numbers that are not known yet, returns the number added"""
+        now = time.time()
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (case_number, status, created, updated) VALUES (?, ?, ?, ?)",
+                    [(case_number, QUEUED, now, now) for case_number in case_numbers]
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return self.conn.total_changes - before
+
+    def _expire_leases(self, now: float):
+        """Return jobs with expired leases to the queue (or fail them after max_attempts)"""
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "worker = NULL, lease_expires = NULL, updated = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (self.max_attempts, FAILED, QUEUED, now, LEASED, now)
+        )
+
+    def lease(self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Dict]:
+        """Lease the oldest queued job to a worker, or return None if nothing is queued"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_leases(now)
+                row = self.conn.execute(
+                    "SELECT case_number FROM jobs WHERE status = ? ORDER BY created, case_number LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                    "updated = ? WHERE case_number = ?",
+                    (LEASED, worker, now + lease_seconds, now, row["case_number"])
+                )
+                job = self.conn.execute("SELECT * FROM jobs WHERE case_number = ?",
+                                        (row["case_number"],)).fetchone()
+                self.conn.execute("COMMIT")
+                return self._job(job)
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, case_number: str, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a lease, returns False if the worker no longer holds it"""
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? "
+                "WHERE case_number = ? AND worker = ? AND status = ? AND lease_expires >= ?",
+                (now + lease_seconds, now, case_number, worker, LEASED, now)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, case_number: str, worker: str, result: Dict) -> bool:
+        """
+        Record the result of a leased job, returns False if the lease was lost
+
+        Failed scrapes go back to the queue until max_attempts is reached.
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT attempts FROM jobs WHERE case_number = ? AND worker = ? AND status = ?",
+                    (case_number, worker, LEASED)
+                ).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return False
+                if result.get("success"):
+                    status = DONE
+                else:
+                    status = FAILED if row["attempts"] >= self.max_attempts else QUEUED
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, result = ?, updated = ? "
+                    "WHERE case_number = ?",
+                    (status, json.dumps(result), now, case_number)
+                )
+                self.conn.execute("COMMIT")
+                return True
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def status(self, include_jobs: bool = False) -> Dict:
+        """Return job counts per state (and optionally every job)"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_leases(time.time())
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+            for row in self.conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["n"]
+            status = {"counts": counts, "total": sum(counts.values())}
+            if include_jobs:
+                rows = self.conn.execute("SELECT * FROM jobs ORDER BY created, case_number")
+                status["jobs"] = [self._job(row) for row in rows]
+            return status
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """JSON API for the job coordinator"""
+
+    server_version = "GalvestonCoordinator/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status_code: int, payload: Optional[Dict] = None):
+        body = json.dumps(payload if payload is not None else {}).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/status":
+            self._send_json(200, self.server.store.status(include_jobs="jobs=1" in self.path))
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+        except ValueError:
+            self._send_json(400, {"error": "Invalid JSON body"})
+            return
+
+        store = self.server.store
+        lease_seconds = self.server.lease_seconds
+        path = self.path.split("?")[0]
+        error = self._invalid_payload(path, payload)
+        if error:
+            self._send_json(400, {"error": error})
+            return
+
+        if path == "/jobs":
+            case_numbers = [case.strip() for case in payload["case_numbers"] if case.strip()]
+            self._send_json(200, {"added": store.add_jobs(case_numbers)})
+        elif path == "/lease":
+            job = store.lease(payload["worker"], lease_seconds)
+            self._send_json(200, {"job": job, "lease_seconds": lease_seconds})
+        elif path == "/heartbeat":
+            ok = store.heartbeat(payload["case_number"], payload["worker"], lease_seconds)
+            self._send_json(200 if ok else 409, {"ok": ok})
+        elif path == "/complete":
+            ok = store.complete(payload["case_number"], payload["worker"], payload.get("result") or {})
+            self._send_json(200 if ok else 409, {"ok": ok})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    @staticmethod
+    def _invalid_payload(path: str, payload) -> Optional[str]:
+        """Describe what is wrong with a POST body, None if it is valid for the path"""
+        if not isinstance(payload, dict):
+            return "Expected a JSON object"
+        if path == "/jobs":
+            case_numbers = payload.get("case_numbers")
+            if not isinstance(case_numbers, list) or not all(isinstance(case, str) for case in case_numbers):
+                return "Expected a case_numbers list"
+            return None
+        required = {"/lease": ("worker",), "/heartbeat": ("case_number", "worker"),
+                    "/complete": ("case_number", "worker")}.get(path, ())
+        missing = [field for field in required if not isinstance(payload.get(field), str) or not payload[field]]
+        if missing:
+            return f"Missing {' and '.join(missing)}"
+        if path == "/complete" and not isinstance(payload.get("result") or {}, dict):
+            return "Expected result to be an object"
+        return None
+
+class CoordinatorServer(ThreadingHTTPServer):
+    """HTTP server that owns the job store"""
+
+    daemon_threads = True
+
+    def __init__(self, address, store: JobStore, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 verbose: bool = False):
+        super().__init__(address, CoordinatorHandler)
+        self.store = store
+        self.lease_seconds = lease_seconds
+        self.verbose = verbose
+
+class CoordinatorClient:
+    """Small client for the coordinator API"""
+
+    def __init__(self, url: str, timeout: float = 30):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _post(self, path: str, payload: Dict) -> requests.Response:
+        return self.session.post(f"{self.url}{path}", json=payload, timeout=self.timeout)
+
+    def submit(self, case_numbers: List[str]) -> int:
+        response = self._post("/jobs", {"case_numbers": case_numbers})
+        response.raise_for_status()
+        return response.json()["added"]
+
+    def lease(self, worker: str) -> Dict:
+        """Returns {"job": job dict or None, "lease_seconds": lease length}"""
+        response = self._post("/lease", {"worker": worker})
+        response.raise_for_status()
+        return response.json()
+
+    def heartbeat(self, worker: str, case_number: str) -> bool:
+        return self._post("/heartbeat", {"worker": worker, "case_number": case_number}).status_code == 200
+
+    def complete(self, worker: str, case_number: str, result: Dict) -> bool:
+        response = self._post("/complete", {"worker": worker, "case_number": case_number, "result": result})
+        return response.status_code == 200
+
+    def status(self, include_jobs: bool = False) -> Dict:
+        response = self.session.get(f"{self.url}/status", params={"jobs": 1} if include_jobs else None,
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+class CoordinatorWorker:
+    """
+    Worker mode: lease cases from the coordinator and scrape them with scrape_case
+
+    A background thread renews the lease while a case runs. If the coordinator
+    reports the lease as lost, the result is still sent but will be ignored.
+    """
+
+    def __init__(self, url: str, out_dir: Path, worker_id: Optional[str] = None,
+                 headless: bool = True, verbose: bool = False, rate: float = 1.0,
+                 heartbeat_interval: Optional[float] = None, poll_interval: float = 5.0,
+                 scraper_class=GalvestonCourtScraper, scraper_options: Optional[Dict] = None):
+        self.client = CoordinatorClient(url)
+        self.out_dir = Path(out_dir)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{threading.get_native_id()}"
+        self.scraper_options = dict(scraper_options or {}, headless=headless, verbose=verbose,
+                                    request_rate=rate)
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.scraper_class = scraper_class
+        self.stop_event = threading.Event()
+
+    def _heartbeat_loop(self, case_number: str, interval: float, done: threading.Event):
+        while not done.wait(interval):
+            try:
+                if not self.client.heartbeat(self.worker_id, case_number):
+                    print(f"Lease lost for {case_number}", file=sys.stderr)
+                    return
+            except requests.RequestException as e:
+                print(f"Heartbeat failed for {case_number}: {e}", file=sys.stderr)
+
+    def process_job(self, job: Dict, lease_seconds: float) -> Dict:
+        """Scrape one leased case while renewing its lease"""
+        case_number = job["case_number"]
+        download_dir = case_download_dir(self.out_dir, case_number)
+        interval = self.heartbeat_interval or max(1.0, lease_seconds / 3)
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(case_number, interval, done),
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            scraper = self.scraper_class(**self.scraper_options)
+            try:
+                result = scraper.scrape_case(case_number, download_dir)
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+        finally:
+            done.set()
+            heartbeat.join()
+
+        result.setdefault("case_number", case_number)
+        result["download_dir"] = str(download_dir)
+        result["worker"] = self.worker_id
+        self._complete(case_number, result)
+        return result
+
+    def _complete(self, case_number: str, result: Dict):
+        """Send a result, retrying until the coordinator takes it or the worker is stopped"""
+        while True:
+            try:
+                if not self.client.complete(self.worker_id, case_number, result):
+                    print(f"Lease lost for {case_number}, result ignored", file=sys.stderr)
+                return
+            except requests.RequestException as e:
+                print(f"Could not report {case_number}: {e}", file=sys.stderr)
+            if self.stop_event.wait(self.poll_interval):
+                return
+
+    def run(self, exit_when_idle: bool = False, on_result=None) -> int:
+        """Lease and process jobs until stopped, returns the number of cases processed"""
+        processed = 0
+        while not self.stop_event.is_set():
+            try:
+                payload = self.client.lease(self.worker_id)
+            except requests.RequestException as e:
+                print(f"Coordinator unavailable: {e}", file=sys.stderr)
+                self.stop_event.wait(self.poll_interval)
+                continue
+
+            job = payload.get("job")
+            if job is None:
+                if exit_when_idle:
+                    try:
+                        if self.client.status()["counts"][LEASED] == 0:
+                            break
+                    except requests.RequestException as e:
+                        print(f"Coordinator unavailable: {e}", file=sys.stderr)
+                self.stop_event.wait(self.poll_interval)
+                continue
+
+            result = self.process_job(job, payload.get("lease_seconds", DEFAULT_LEASE_SECONDS))
+            processed += 1
+            if on_result:
+                on_result(result)
+        return processed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the coordinator and its workers"""
+    parser = argparse.ArgumentParser(description="Coordinate case downloads across several machines.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the coordinator service")
+    serve.add_argument("--db", default="coordinator.db", help="SQLite job database (default: coordinator.db)")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    serve.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                       help=f"Lease length before a silent worker loses its job (default: {DEFAULT_LEASE_SECONDS})")
+    serve.add_argument("--max-attempts", type=int, default=3, help="Attempts per case before it fails (default: 3)")
+    serve.add_argument("-v", "--verbose", action="store_true", help="Log every request")
+
+    submit = commands.add_parser("submit", help="Queue case numbers on the coordinator")
+    submit.add_argument("--url", required=True, help="Coordinator URL")
+    submit.add_argument("--case", action="append", default=[], help="Case number (repeatable)")
+    submit.add_argument("--cases-file", help="File with one case number per line ('-' reads stdin)")
+
+    worker = commands.add_parser("worker", help="Lease and download cases from the coordinator")
+    worker.add_argument("--url", required=True, help="Coordinator URL")
+    worker.add_argument("--out", default="downloads", help="Output folder (default: downloads)")
+    worker.add_argument("--id", help="Worker name (default: hostname and thread id)")
+    worker.add_argument("--rate", type=float, default=1.0, help="Document requests per second (default: 1.0)")
+    worker.add_argument("--no-headless", dest="headless", action="store_false", help="Show the browser window")
+    worker.add_argument("--lean", action="store_true", help="Lean browser profile (no images, CSS or fonts)")
+    worker.add_argument("--deep-link-cache", metavar="PATH",
+                        help="Cache of case document page URLs (default: <out>/.deep_links.jsonl)")
+    worker.add_argument("--exit-when-idle", action="store_true", help="Exit once no jobs are queued or leased")
+    worker.add_argument("-v", "--verbose", action="store_true", help="Print detailed scraper logs")
+
+    status = commands.add_parser("status", help="Show job counts")
+    status.add_argument("--url", required=True, help="Coordinator URL")
+    status.add_argument("--jobs", action="store_true", help="Include every job")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        store = JobStore(args.db, max_attempts=args.max_attempts)
+        server = CoordinatorServer((args.host, args.port), store, args.lease_seconds, args.verbose)
+        print(f"Coordinator listening on http://{args.host}:{server.server_port} (db: {args.db})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            store.close()
+        return 0
+
+    client = CoordinatorClient(args.url)
+    if args.command == "submit":
+        case_numbers = list(args.case)
+        if args.cases_file:
+            case_numbers.extend(load_case_numbers(args.cases_file))
+        print(f"Queued {client.submit(case_numbers)} new cases")
+        return 0
+
+    if args.command == "status":
+        print(json.dumps(client.status(include_jobs=args.jobs), indent=2))
+        return 0
+
+    deep_link_cache = args.deep_link_cache or str(Path(args.out) / DEEP_LINK_FILENAME)
+    runner = CoordinatorWorker(args.url, Path(args.out), worker_id=args.id, headless=args.headless,
+                               verbose=args.verbose, rate=args.rate,
+                               scraper_options={"lean": args.lean, "deep_link_cache": deep_link_cache})
+    try:
+        runner.run(exit_when_idle=args.exit_when_idle,
+                   on_result=lambda result: print(json.dumps(result, sort_keys=True), flush=True))
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Deep-Link Cache
+Persistent map of case number to document page URL, so known cases skip the search steps
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+DEEP_LINK_FILENAME = ".deep_links.jsonl"
+
+# Process-wide caches by resolved file path (shared_deep_link_cache)
+_shared_caches: Dict[Path, "DeepLinkCache"] = {}
+_shared_lock = threading.Lock()
+
+class DeepLinkCache:
+    """
+    Remember the document page URL that step 6 of the navigation lands on
+
+    Entries are appended as JSON lines (last line for a case wins), so several
+    processes can share one cache file the same way they share a BatchJournal.
+    A URL that stops working is discarded with a null entry and re-learned by
+    the next full navigation.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.links: Dict[str, str] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """Read existing entries from the cache file"""
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._apply(entry)
+
+    def _apply(self, entry: Dict):
+        if entry.get("url"):
+            self.links[entry["case_number"]] = entry["url"]
+        else:
+            self.links.pop(entry.get("case_number"), None)
+
+    def _append(self, entry: Dict):
+        entry["time"] = time.time()
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self.lock:
+            self._apply(entry)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def get(self, case_number: str) -> Optional[str]:
+        """Return the cached document page URL of a case, None if unknown"""
+        return self.links.get(case_number)
+
+    def record(self, case_number: str, url: str):
+        """Store the document page URL reached for a case"""
+        if self.links.get(case_number) != url:
+            self._append({"case_number": case_number, "url": url})
+
+    def discard(self, case_number: str):
+        """Forget a case whose cached URL no longer leads to its document page"""
+        if case_number in self.links:
+            self._append({"case_number": case_number, "url": None})
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+def shared_deep_link_cache(path: Path) -> DeepLinkCache:
+    """
+    Return the process-wide cache for this file, reading the file on first use
+
+    Every scraper of a process shares it, so a batch reads the file once
+    instead of once per case. Entries appended later by other processes are
+    not seen; such a case just runs the full navigation.
+    """
+    key = Path(path).resolve()
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = DeepLinkCache(key)
+            _shared_caches[key] = cache
+        return cache
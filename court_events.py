@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Scrape Events
+Typed events yielded by GalvestonCourtScraper.scrape_case_iter and scrape_case_aiter
+"""
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import ClassVar, Dict, Optional
+
+class ScrapeCancelled(BaseException):
+    """
+    Raised inside a scrape whose event consumer went away
+
+    A BaseException, like KeyboardInterrupt, so the per-document error handling
+    of the download loop does not swallow it and the scrape stops at once.
+    """
+
+@dataclass
+class ScrapeEvent:
+    """Base of all events: the case they belong to and when they happened"""
+    kind: ClassVar[str] = "event"
+    case_number: str
+    time: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready dict with the event's kind"""
+        return dict(asdict(self), kind=self.kind)
+
+@dataclass
+class NavigationEvent(ScrapeEvent):
+    """A navigation step started (step of total_steps)"""
+    kind: ClassVar[str] = "navigation"
+    step: int = 0
+    total_steps: int = 0
+    message: str = ""
+
+@dataclass
+class ParseEvent(ScrapeEvent):
+    """Document page parsing started"""
+    kind: ClassVar[str] = "parse"
+    message: str = ""
+
+@dataclass
+class DocumentStarted(ScrapeEvent):
+    """A document request is about to be sent (attempt 2+ are retries)"""
+    kind: ClassVar[str] = "document_started"
+    filename: str = ""
+    fragment_id: str = ""
+    attempt: int = 1
+
+@dataclass
+class DocumentBytes(ScrapeEvent):
+    """A document's response body arrived (total is the Content-Length, None if not sent)"""
+    kind: ClassVar[str] = "document_bytes"
+    filename: str = ""
+    received: int = 0
+    total: Optional[int] = None
+
+@dataclass
+class DocumentFinished(ScrapeEvent):
+    """
+    A document attempt ended
+
+    status is 'success', 'secured', 'expired', 'failed', 'retry' (deferred for
+    another attempt) or 'skipped' (finished by an earlier run).
+    """
+    kind: ClassVar[str] = "document_finished"
+    filename: str = ""
+    fragment_id: str = ""
+    status: str = ""
+    attempt: int = 1
+
+@dataclass
+class CaseSummary(ScrapeEvent):
+    """The case finished; result is the dict scrape_case returns"""
+    kind: ClassVar[str] = "summary"
+    result: Dict = field(default_factory=dict)
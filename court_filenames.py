@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Filename Registry
+Persistent per-case map of DocumentFragmentID to filename, so a document keeps
+its name across runs even when the docket order changes
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+FILENAME_MAP_FILENAME = ".filenames.jsonl"
+
+class FilenameRegistry:
+    """
+    Filename namespace of one case
+
+    The first name given to a document is final: later runs look the fragment ID
+    up instead of resolving collisions again, so a shifted docket cannot rename a
+    document and download it twice. Collisions are resolved only against this
+    case's names (dict lookups, independent of how many cases were processed).
+
+    With a path, assignments are appended to that JSON lines file (last line for
+    a fragment ID wins); without one, or with persist=False (listings, which must
+    not write to the download folder), new names live in memory only.
+    Documents without a fragment ID get a name for this run but are not stored.
+
+    New names are buffered and written by flush() with one fsync, which the parser
+    calls once a case's docket has been read. Names lost to a crash before that are
+    given again by the next run's parse of the same docket.
+    """
+
+    def __init__(self, path: Optional[Path] = None, persist: bool = True):
+        self.path = Path(path) if path else None
+        self.persist = persist
+        self.lock = threading.Lock()
+        self.names: Dict[str, str] = {}
+        self.owners: Dict[str, str] = {}
+        self.pending: List[str] = []
+        if self.path and self.path.exists():
+            self._load()
+
+    @classmethod
+    def for_case(cls, download_dir: Optional[Path], persist: bool = True) -> "FilenameRegistry":
+        """Registry stored in a case's download folder, in memory when there is none"""
+        return cls(Path(download_dir) / FILENAME_MAP_FILENAME if download_dir else None, persist)
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("fragment_id") and entry.get("filename"):
+                    self._apply(entry["fragment_id"], entry["filename"])
+
+    def _apply(self, fragment_id: str, filename: str):
+        previous = self.names.get(fragment_id)
+        if previous:
+            self.owners.pop(previous, None)
+        self.names[fragment_id] = filename
+        self.owners[filename] = fragment_id
+
+    def flush(self):
+        """Append the names assigned since the last flush to the file, with one fsync"""
+        with self.lock:
+            if not self.pending:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(self.pending)
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending = []
+
+    def get(self, fragment_id: str) -> Optional[str]:
+        """Return the filename assigned to a document, None if it has none yet"""
+        return self.names.get(fragment_id)
+
+    def assign(self, base_filename: str, fragment_id: str) -> str:
+        """
+        Return the document's filename, assigning one on first sight
+
+        Args:
+            base_filename: Preferred name without extension, e.g. '2025.01.15_Order'
+            fragment_id: DocumentFragmentID, or 'unknown'
+
+        Returns:
+            The stored name, or the first free one of '<base>.pdf',
+            '<base>_(ID<fragment_id>).pdf', '<base>_(ID<fragment_id>)_<n>.pdf'
+        """
+        known = fragment_id != "unknown"
+        with self.lock:
+            if known and fragment_id in self.names:
+                return self.names[fragment_id]
+
+            filename = f"{base_filename}.pdf"
+            if filename in self.owners:
+                filename = f"{base_filename}_(ID{fragment_id}).pdf"
+                counter = 1
+                while filename in self.owners:
+                    filename = f"{base_filename}_(ID{fragment_id})_{counter}.pdf"
+                    counter += 1
+
+            if known:
+                self._apply(fragment_id, filename)
+                if self.path and self.persist:
+                    self.pending.append(json.dumps({"fragment_id": fragment_id, "filename": filename},
+                                                   sort_keys=True) + "\n")
+            else:
+                self.owners[filename] = fragment_id
+            return filename
+
+    def __len__(self) -> int:
+        return len(self.names)
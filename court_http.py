@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - HTTP Clients
+Pluggable document download clients: requests (default) or httpx with HTTP/2,
+and asyncio clients (httpx or aiohttp) for AsyncGalvestonCourtScraper
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional, Tuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+HTTP_BACKENDS = ("requests", "httpx")
+
+ASYNC_HTTP_BACKENDS = ("httpx", "aiohttp")
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+}
+
+# Portal certificates are not always valid, downloads skip verification
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Process-wide clients by settings, see shared_http_client
+_shared_clients: Dict[Tuple, object] = {}
+_shared_lock = threading.Lock()
+_shared_pid = os.getpid()
+
+def _cookie_header(cookies: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Cookie request header for cookies passed per request (clients store none)"""
+    if not cookies:
+        return {}
+    return {"Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items())}
+
+class RequestsClient:
+    """
+    requests.Session with a connection pool sized to the download concurrency
+
+    Cookies are passed with every request and never stored in the session, so
+    one client can serve several cases (each with its own portal session).
+    """
+
+    name = "requests"
+
+    def __init__(self, pool_size: int = 3, connect_timeout: float = 10.0, read_timeout: float = 30.0):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.verify = False
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, cookies: Optional[Dict[str, str]] = None):
+        """GET a URL; the response has status_code, headers and content"""
+        return self.session.get(url, cookies=cookies, timeout=self.timeout)
+
+    def head(self, url: str, cookies: Optional[Dict[str, str]] = None):
+        """HEAD a URL (following redirects); the response has status_code and headers"""
+        return self.session.head(url, cookies=cookies, timeout=self.timeout, allow_redirects=True)
+
+    def close(self):
+        self.session.close()
+
+class HttpxClient:
+    """
+    httpx.Client with HTTP/2, keep-alive and per-phase timeouts
+
+    HTTP/2 needs the h2 package (pip install "httpx[http2]"); without it the
+    client falls back to HTTP/1.1 keep-alive. HTTP/2 is only negotiated over TLS.
+    """
+
+    name = "httpx"
+
+    def __init__(self, pool_size: int = 3, connect_timeout: float = 10.0, read_timeout: float = 30.0,
+                 keepalive_expiry: float = 30.0, http2: bool = True):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('The httpx backend needs httpx: pip install "httpx[http2]"') from None
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                http2 = False
+        self.http2 = http2
+        self.client = httpx.Client(
+            http2=http2,
+            verify=False,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=read_timeout)
+        )
+        self.client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def get(self, url: str, cookies: Optional[Dict[str, str]] = None):
+        """GET a URL; the response has status_code, headers and content"""
+        return self.client.get(url, headers=_cookie_header(cookies))
+
+    def head(self, url: str, cookies: Optional[Dict[str, str]] = None):
+        """HEAD a URL (following redirects); the response has status_code and headers"""
+        return self.client.head(url, headers=_cookie_header(cookies))
+
+    def close(self):
+        self.client.close()
+
+class AsyncResponse:
+    """Fully read response of an async client: status_code, headers and content"""
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+class AsyncHttpxClient:
+    """
+    httpx.AsyncClient counterpart of HttpxClient (HTTP/2 when h2 is installed)
+
+    Like the sync clients it keeps no cookies: every request carries its case's
+    session cookies.
+    """
+
+    name = "httpx"
+
+    def __init__(self, pool_size: int = 100, connect_timeout: float = 10.0, read_timeout: float = 30.0,
+                 keepalive_expiry: float = 30.0, http2: bool = True):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('The async httpx backend needs httpx: pip install "httpx[http2]"') from None
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                http2 = False
+        self.http2 = http2
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            verify=False,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=None)
+        )
+        self.client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    async def get(self, url: str, cookies: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        response = await self.client.get(url, headers=_cookie_header(cookies))
+        return AsyncResponse(response.status_code, response.headers, response.content)
+
+    async def close(self):
+        await self.client.aclose()
+
+class AioHttpClient:
+    """aiohttp.ClientSession download client (HTTP/1.1 keep-alive), no cookie storage"""
+
+    name = "aiohttp"
+
+    def __init__(self, pool_size: int = 100, connect_timeout: float = 10.0, read_timeout: float = 30.0):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("The aiohttp backend needs aiohttp: pip install aiohttp") from None
+        self.session = aiohttp.ClientSession(
+            headers=DEFAULT_HEADERS,
+            connector=aiohttp.TCPConnector(limit=pool_size, ssl=False),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        )
+
+    async def get(self, url: str, cookies: Optional[Dict[str, str]] = None) -> AsyncResponse:
+        async with self.session.get(url, headers=_cookie_header(cookies)) as response:
+            return AsyncResponse(response.status, response.headers, await response.read())
+
+    async def close(self):
+        await self.session.close()
+
+def create_async_http_client(backend: str = "httpx", pool_size: int = 100, connect_timeout: float = 10.0,
+                             read_timeout: float = 30.0):
+    """
+    Create an asyncio document download client; call it inside the event loop that uses it
+
+    Args:
+        backend: "httpx" or "aiohttp"
+        pool_size: Connections kept open at most, normally the in-flight request limit
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for response data
+    """
+    if backend == "httpx":
+        return AsyncHttpxClient(pool_size, connect_timeout, read_timeout)
+    if backend == "aiohttp":
+        return AioHttpClient(pool_size, connect_timeout, read_timeout)
+    raise ValueError(f"Unknown async HTTP backend: {backend}")
+
+def create_http_client(backend: str = "requests", pool_size: int = 3, connect_timeout: float = 10.0,
+                       read_timeout: float = 30.0):
+    """
+    Create a document download client
+
+    Args:
+        backend: "requests" or "httpx"
+        pool_size: Connections kept per host, normally the download concurrency
+        connect_timeout: Seconds to establish a connection
+        read_timeout: Seconds to wait for response data
+    """
+    if backend == "requests":
+        return RequestsClient(pool_size, connect_timeout, read_timeout)
+    if backend == "httpx":
+        return HttpxClient(pool_size, connect_timeout, read_timeout)
+    raise ValueError(f"Unknown HTTP backend: {backend}")
+
+def shared_http_client(backend: str = "requests", pool_size: int = 3, connect_timeout: float = 10.0,
+                       read_timeout: float = 30.0):
+    """
+    Return the process-wide client for these settings, creating it on first use
+
+    Consecutive and concurrent cases in one process reuse its warm connections.
+    The clients keep no cookies, so every case passes its own portal session
+    cookies per request. A forked child process starts with no shared clients.
+    """
+    global _shared_pid
+    key = (backend, pool_size, connect_timeout, read_timeout)
+    with _shared_lock:
+        if _shared_pid != os.getpid():
+            # Sockets inherited through fork belong to the parent
+            _shared_clients.clear()
+            _shared_pid = os.getpid()
+        client = _shared_clients.get(key)
+        if client is None:
+            client = create_http_client(backend, pool_size, connect_timeout, read_timeout)
+            _shared_clients[key] = client
+        return client
+
+def close_shared_http_clients():
+    """Close every process-wide client (they are created again on next use)"""
+    with _shared_lock:
+        for client in _shared_clients.values():
+            client.close()
+        _shared_clients.clear()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Batch Journal
+Append-only checkpoint log that lets an interrupted batch resume where it stopped
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+JOURNAL_FILENAME = ".batch_journal.jsonl"
+
+class BatchJournal:
+    """
+    Record per-case and per-document completion as a batch runs
+
+    Every event is one JSON line, flushed and fsynced before the call returns,
+    so a killed process loses at most the line it was writing. A truncated last
+    line is ignored when the journal is loaded again. Several processes may
+    append to the same journal file.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.cases: Dict[str, Dict] = {}
+        self.documents: Dict[str, Dict[str, str]] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume:
+            self._load()
+        else:
+            self.path.write_text("", encoding="utf-8")
+
+    def _load(self):
+        """Read existing events from the journal file"""
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                self._apply(event)
+
+    def _apply(self, event: Dict):
+        if event.get("event") == "document":
+            self.documents.setdefault(event["case_number"], {})[event["document"]] = event["filename"]
+        elif event.get("event") == "case":
+            self.cases[event["case_number"]] = event["result"]
+
+    def _append(self, event: Dict):
+        event["time"] = time.time()
+        line = json.dumps(event, sort_keys=True) + "\n"
+        with self.lock:
+            self._apply(event)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_document(self, case_number: str, document_key: str, filename: str, status: str):
+        """
+        Mark a document as finished (downloaded, placeholder written or already on disk)
+
+        document_key identifies the document within its case, normally its fragment ID.
+        """
+        self._append({"event": "document", "case_number": case_number, "document": document_key,
+                      "filename": filename, "status": status})
+
+    def record_case(self, case_number: str, result: Dict):
+        """Mark a case as finished; only cases without failed documents are skipped on resume"""
+        if result.get("success") and not result.get("failed"):
+            self._append({"event": "case", "case_number": case_number, "result": result})
+
+    def is_case_done(self, case_number: str) -> bool:
+        return case_number in self.cases
+
+    def case_result(self, case_number: str) -> Optional[Dict]:
+        """Return the recorded result of a finished case"""
+        return self.cases.get(case_number)
+
+    def is_document_done(self, case_number: str, document_key: str) -> bool:
+        return document_key in self.documents.get(case_number, {})
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Retry Policy
+Exponential backoff with jitter, per-status and per-exception rules, Retry-After
+support and a per-host circuit breaker shared by every worker thread of a process
+"""
+
+import time
+import random
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+# Responses worth retrying: the portal is busy or briefly unavailable
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Of those, statuses that count against the circuit breaker (the portal looks down)
+OUTAGE_STATUSES = frozenset({500, 502, 503, 504})
+
+def _default_retry_exceptions() -> Tuple[type, ...]:
+    exceptions = [requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                  requests.exceptions.ChunkedEncodingError, ConnectionError, TimeoutError]
+    try:
+        import httpx
+        exceptions.append(httpx.TransportError)
+    except ImportError:
+        pass
+    try:
+        import aiohttp
+        exceptions += [aiohttp.ClientConnectionError, aiohttp.ClientPayloadError]
+    except ImportError:
+        pass
+    exceptions.append(asyncio.TimeoutError)
+    return tuple(exceptions)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date), None if absent or invalid"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a request
+
+    Attempt n (1-based) waits base_delay * multiplier ** (n - 1), capped at
+    max_delay, then shortened by up to `jitter` (a fraction) at random so
+    workers that failed together do not retry together. A Retry-After header
+    raises the wait to what the server asked for, up to max_retry_after.
+    breaker_threshold and breaker_reset configure the per-host CircuitBreaker.
+    """
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    multiplier: float = 2.0
+    max_delay: float = 60.0
+    jitter: float = 0.5
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: RETRY_STATUSES)
+    retry_exceptions: Tuple[type, ...] = field(default_factory=_default_retry_exceptions)
+    respect_retry_after: bool = True
+    max_retry_after: float = 300.0
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+
+    def should_retry_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def should_retry_exception(self, error: BaseException) -> bool:
+        return isinstance(error, self.retry_exceptions)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)"""
+        backoff = min(self.max_delay, self.base_delay * self.multiplier ** max(0, attempt - 1))
+        backoff -= backoff * self.jitter * random.random()
+        if retry_after is not None and self.respect_retry_after:
+            backoff = max(backoff, min(retry_after, self.max_retry_after))
+        return backoff
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a host that keeps failing
+
+    After failure_threshold consecutive failures the breaker opens: every
+    thread calling before_request waits instead of hammering the host. After
+    reset_timeout seconds one trial request is let through (half-open); its
+    success closes the breaker, its failure opens it for another period.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_running = False
+        self.condition = threading.Condition()
+
+    def before_request(self) -> float:
+        """Wait until a request may be sent, returns the seconds spent waiting"""
+        started = time.monotonic()
+        with self.condition:
+            while True:
+                if self.state == self.CLOSED:
+                    break
+                if self.state == self.OPEN:
+                    remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                    if remaining <= 0:
+                        self.state = self.HALF_OPEN
+                        continue
+                    self.condition.wait(remaining)
+                    continue
+                # Half-open: one trial request at a time
+                if not self.trial_running:
+                    self.trial_running = True
+                    break
+                self.condition.wait()
+        return time.monotonic() - started
+
+    def record_success(self):
+        with self.condition:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trial_running = False
+            self.condition.notify_all()
+
+    def record_failure(self):
+        with self.condition:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+            self.condition.notify_all()
+
+    def release(self):
+        """Finish a request that says nothing about the host's health"""
+        with self.condition:
+            self.trial_running = False
+            self.condition.notify_all()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != self.CLOSED
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def circuit_breaker_for(url: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> CircuitBreaker:
+    """Return the process-wide circuit breaker of a URL's host, creating it on first use"""
+    host = urlparse(url).netloc
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold, reset_timeout)
+            _breakers[host] = breaker
+        return breaker
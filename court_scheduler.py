@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Download Scheduler
+Process-wide fair-share scheduling of document requests across concurrent cases,
+with a global concurrency cap, a bandwidth cap and priority-based load shedding
+"""
+
+import os
+import time
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Process-wide schedulers by settings, see shared_download_scheduler
+_shared_schedulers: Dict[Tuple, "DownloadScheduler"] = {}
+_shared_lock = threading.Lock()
+_shared_pid = os.getpid()
+
+class SchedulerOverloaded(Exception):
+    """A document request was shed because too many requests are waiting"""
+
+class _Waiter:
+    __slots__ = ("case_id", "priority", "start_tag", "sequence", "granted", "shed")
+
+    def __init__(self, case_id: str, priority: int, start_tag: float, sequence: int):
+        self.case_id = case_id
+        self.priority = priority
+        self.start_tag = start_tag
+        self.sequence = sequence
+        self.granted = False
+        self.shed = False
+
+    def rank(self) -> Tuple:
+        # Higher priority first, then the smallest fair-share tag, then arrival order
+        return (-self.priority, self.start_tag, self.sequence)
+
+class DownloadScheduler:
+    """
+    Grant document request slots to the cases of a process fairly
+
+    Every case calls acquire() before a document request and release() after it.
+    At most max_concurrent requests run at once. Waiting requests are granted by
+    priority, then by start-time fair queuing: each case's tag grows by one per
+    granted request, and a case that starts late begins at the current virtual
+    time, so a 5-document case is served between the requests of a 500-document
+    case instead of after all of them.
+
+    With max_bytes_per_second, downloaded bytes are charged to a token bucket
+    holding one second of bandwidth; no request is granted while it is in debt.
+    With max_waiting, a request arriving at a full queue sheds the lowest-priority
+    waiter (possibly itself) with SchedulerOverloaded.
+    """
+
+    def __init__(self, max_concurrent: int = 6, max_bytes_per_second: Optional[float] = None,
+                 max_waiting: Optional[int] = None):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_bytes_per_second = max_bytes_per_second
+        self.max_waiting = max_waiting
+        self.condition = threading.Condition()
+        self.active = 0
+        self.waiting: List[_Waiter] = []
+        self.finish_tags: Dict[str, float] = {}
+        self.virtual_time = 0.0
+        self.tokens = float(max_bytes_per_second or 0)
+        self.refilled_at = time.monotonic()
+        self.sequence = itertools.count()
+        self.granted: Dict[str, int] = {}
+        self.shed = 0
+
+    def acquire(self, case_id: str, priority: int = 0) -> float:
+        """
+        Wait for a request slot
+
+        Args:
+            case_id: Case the request belongs to (its fair-share queue)
+            priority: Higher values are granted first and shed last
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            SchedulerOverloaded: The request was shed
+        """
+        started = time.monotonic()
+        with self.condition:
+            start_tag = max(self.virtual_time, self.finish_tags.get(case_id, 0.0))
+            waiter = _Waiter(case_id, priority, start_tag, next(self.sequence))
+            self.finish_tags[case_id] = start_tag + 1
+            self.waiting.append(waiter)
+            if self.max_waiting is not None and len(self.waiting) > self.max_waiting:
+                # Shed the lowest-priority, most recently queued waiter
+                victim = max(self.waiting, key=lambda entry: (-entry.priority, entry.sequence))
+                self._remove(victim)
+                victim.shed = True
+                self.shed += 1
+                self.condition.notify_all()
+            while True:
+                if waiter.shed:
+                    raise SchedulerOverloaded(f"Download of case {case_id} shed: "
+                                              f"{len(self.waiting)} requests already waiting")
+                self._dispatch()
+                if waiter.granted:
+                    return time.monotonic() - started
+                self.condition.wait(self._refill_wait())
+
+    def release(self, case_id: str, nbytes: int = 0):
+        """Finish a request granted by acquire(), charging the bytes it downloaded"""
+        with self.condition:
+            self.active -= 1
+            if self.max_bytes_per_second:
+                self._refill()
+                self.tokens -= nbytes
+            self._dispatch()
+            self.condition.notify_all()
+
+    def stats(self) -> Dict:
+        with self.condition:
+            return {"active": self.active, "waiting": len(self.waiting), "shed": self.shed,
+                    "granted": dict(self.granted)}
+
+    def _remove(self, waiter: _Waiter):
+        self.waiting.remove(waiter)
+        if not waiter.granted:
+            # Give the unused tag back so the case is not penalized for the shed request
+            self.finish_tags[waiter.case_id] = min(self.finish_tags[waiter.case_id], waiter.start_tag)
+
+    def _dispatch(self):
+        """Grant slots to the best-ranked waiters while capacity allows"""
+        while self.waiting and self.active < self.max_concurrent:
+            if self.max_bytes_per_second:
+                self._refill()
+                if self.tokens < 0:
+                    return
+            waiter = min(self.waiting, key=_Waiter.rank)
+            self.waiting.remove(waiter)
+            waiter.granted = True
+            self.active += 1
+            self.virtual_time = max(self.virtual_time, waiter.start_tag)
+            self.granted[waiter.case_id] = self.granted.get(waiter.case_id, 0) + 1
+            self.condition.notify_all()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_bytes_per_second,
+                          self.tokens + (now - self.refilled_at) * self.max_bytes_per_second)
+        self.refilled_at = now
+
+    def _refill_wait(self) -> Optional[float]:
+        """Seconds until the bandwidth debt is paid off, None to wait for a release"""
+        if self.max_bytes_per_second and self.tokens < 0 and self.active < self.max_concurrent:
+            return -self.tokens / self.max_bytes_per_second
+        return None
+
+def shared_download_scheduler(max_concurrent: int = 6, max_bytes_per_second: Optional[float] = None,
+                              max_waiting: Optional[int] = None) -> DownloadScheduler:
+    """
+    Return the process-wide scheduler for these settings, creating it on first use
+
+    Every case of a process that uses the same settings competes in one scheduler.
+    A forked child process starts with no shared schedulers.
+    """
+    global _shared_pid
+    key = (max_concurrent, max_bytes_per_second, max_waiting)
+    with _shared_lock:
+        if _shared_pid != os.getpid():
+            _shared_schedulers.clear()
+            _shared_pid = os.getpid()
+        scheduler = _shared_schedulers.get(key)
+        if scheduler is None:
+            scheduler = DownloadScheduler(max_concurrent, max_bytes_per_second, max_waiting)
+            _shared_schedulers[key] = scheduler
+        return scheduler
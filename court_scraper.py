@@ -8,14 +8,32 @@ import time
 import logging
 import re
 import os
-import requests
+import sys
+import csv
+import io
+import json
+import argparse
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from contextlib import contextmanager
+from datetime import datetime
+from collections import deque
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import threading
 import queue
+import asyncio
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from court_events import (ScrapeCancelled, ScrapeEvent, NavigationEvent, ParseEvent, DocumentStarted,
+                          DocumentBytes, DocumentFinished, CaseSummary)
+from court_archive import ARCHIVE_FORMATS, CaseArchive, case_archive_path
+from court_filenames import FILENAME_MAP_FILENAME, FilenameRegistry
+from court_http import HTTP_BACKENDS, create_http_client, shared_http_client
+from court_scheduler import SchedulerOverloaded, shared_download_scheduler
+from court_retry import RetryPolicy, OUTAGE_STATUSES, circuit_breaker_for, parse_retry_after
 
 # Selenium imports
 from selenium import webdriver
@@ -26,6 +44,92 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
+# Process exit codes for command line usage
+EXIT_OK = 0               # Every case processed successfully
+EXIT_CASE_FAILED = 1      # At least one case failed
+EXIT_USAGE = 2            # Bad arguments or unreadable case list
+EXIT_INTERRUPTED = 130    # Interrupted with Ctrl+C
+
+CASE_NUMBER_PATTERN = re.compile(r'^\d{2}-[A-Z]{2,3}-\d{3,5}$')
+
+# Download connections per case (download_documents max_concurrent)
+DEFAULT_DOWNLOAD_CONCURRENCY = 3
+
+# Fields of a document listing (scrape_case with list_only)
+LISTING_FIELDS = ('index', 'date', 'doc_type', 'display_name', 'fragment_id', 'filename', 'size')
+
+# Times a document request shed by the download scheduler is deferred without using up
+# a retry attempt; later sheds count as failed attempts
+MAX_SHED_DEFERRALS = 10
+
+# Consecutive session-expired responses that trigger a session renewal
+SESSION_EXPIRY_THRESHOLD = 3
+
+# Placeholder reason for a document that only ever got the portal's session timeout page
+EXPIRED_PLACEHOLDER_REASON = "Portal session expired"
+
+# CSS selector for document links on the case documents page
+DOCUMENT_LINK_SELECTOR = "a[href*='ViewDocumentFragment.aspx']"
+NO_RECORDS_TEXT = "No records found"
+
+# Case links and the pager of the Date Filed search results grid
+CASE_LINK_SELECTOR = "a[href*='CaseDetail.aspx']"
+NEXT_PAGE_XPATH = "//a[normalize-space(text())='Next' or normalize-space(text())='>']"
+CASE_NUMBER_SEARCH = re.compile(r'\b\d{2}-[A-Z]{2,3}-\d{3,5}\b')
+
+# In-page wait: resolves as soon as a selector matches or a text appears, using a
+# MutationObserver instead of polling the DOM over the WebDriver connection
+WAIT_FOR_DOM_SCRIPT = """
+const selector = arguments[0], text = arguments[1], timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+function check() {
+    if (selector && document.querySelector(selector)) return 'selector';
+    if (text && document.body && document.body.textContent.includes(text)) return 'text';
+    return null;
+}
+const found = check();
+if (found) { done(found); return; }
+const observer = new MutationObserver(() => {
+    const result = check();
+    if (result) { observer.disconnect(); clearTimeout(timer); done(result); }
+});
+const timer = setTimeout(() => { observer.disconnect(); done(null); }, timeoutMs);
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+"""
+
+# In-page extraction of the document table: one compact array per document link
+# (fields in DOCUMENT_ROW_FIELDS order). Text is gathered like BeautifulSoup's
+# get_text(strip=True) so both modes build identical filenames.
+DOCUMENT_ROW_FIELDS = ('href', 'text', 'first_cell', 'fragment_id')
+EXTRACT_DOCUMENTS_SCRIPT = """
+function strippedText(node) {
+    const walker = document.createTreeWalker(node, NodeFilter.SHOW_TEXT);
+    let text = '';
+    while (walker.nextNode()) text += walker.currentNode.nodeValue.trim();
+    return text;
+}
+return Array.from(document.querySelectorAll(arguments[0])).map(link => {
+    const row = link.closest('tr');
+    const cell = row ? row.querySelector('td') : null;
+    const href = link.getAttribute('href');
+    const match = /DocumentFragmentID=(\\d+)/.exec(href);
+    return [href, strippedText(link), cell ? strippedText(cell) : null, match ? match[1] : 'unknown'];
+});
+"""
+
+# Resources blocked by the lean browser profile: navigation only needs the DOM
+LEAN_BLOCKED_URL_PATTERNS = [
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.bmp", "*.ico", "*.svg", "*.webp",
+    # Stylesheets and fonts
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Third-party hosts (analytics, tag managers, font and script CDNs)
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*ajax.googleapis.com*",
+    "*cdnjs.cloudflare.com*", "*cdn.jsdelivr.net*", "*code.jquery.com*",
+    "*newrelic.com*", "*nr-data.net*", "*hotjar.com*"
+]
+
 @dataclass
 class DocumentInfo:
     """Document information container"""
@@ -38,19 +142,231 @@ class DocumentInfo:
     doc_type: str
     size: int = 0
     status: str = "pending"
+    
+    @property
+    def key(self) -> str:
+        """Identifier of the document within its case (fragment ID, or filename when unknown)"""
+        return self.fragment_id if self.fragment_id != "unknown" else self.filename
+
+@dataclass
+class DocumentFilter:
+    """
+    Select which parsed documents to download, before any request is made
+    
+    date_from/date_to are inclusive MM/DD/YYYY bounds on DocumentInfo.date.
+    include/exclude are case-insensitive regular expressions searched in
+    doc_type and display_name. fragment_ids, when given, is an allowlist.
+    Invalid dates or patterns raise ValueError.
+    """
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    include: Optional[str] = None
+    exclude: Optional[str] = None
+    fragment_ids: Optional[List[str]] = None
+    
+    def __post_init__(self):
+        self._from = self._parse_date(self.date_from)
+        self._to = self._parse_date(self.date_to)
+        self._include = self._compile(self.include)
+        self._exclude = self._compile(self.exclude)
+        self._fragments = {str(fragment).strip() for fragment in self.fragment_ids} if self.fragment_ids else None
+    
+    @staticmethod
+    def _parse_date(value: Optional[str]):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value.strip(), "%m/%d/%Y")
+        except ValueError:
+            raise ValueError(f"Invalid date '{value}', expected MM/DD/YYYY") from None
+    
+    @staticmethod
+    def _compile(pattern: Optional[str]):
+        if not pattern:
+            return None
+        try:
+            return re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern '{pattern}': {e}") from None
+    
+    @property
+    def active(self) -> bool:
+        return any(value is not None for value in (self._from, self._to, self._include, self._exclude, self._fragments))
+    
+    def matches(self, doc: DocumentInfo) -> bool:
+        if self._fragments is not None and doc.fragment_id not in self._fragments:
+            return False
+        if self._from or self._to:
+            try:
+                filed = datetime.strptime(doc.date, "%m/%d/%Y")
+            except ValueError:
+                return False
+            if (self._from and filed < self._from) or (self._to and filed > self._to):
+                return False
+        text = f"{doc.doc_type}\n{doc.display_name}"
+        if self._include and not self._include.search(text):
+            return False
+        if self._exclude and self._exclude.search(text):
+            return False
+        return True
+    
+    def apply(self, documents: List[DocumentInfo]) -> List[DocumentInfo]:
+        """Return the matching documents, keeping their order"""
+        return [doc for doc in documents if self.matches(doc)]
+
+# Orders of DownloadPriority: the docket's own order, newest filing first, smallest file first
+DOWNLOAD_ORDERS = ("docket", "newest", "smallest")
+
+@dataclass
+class DownloadPriority:
+    """
+    Order in which download_documents fetches a case's documents
+    
+    types is an optional list of case-insensitive regular expressions searched
+    in doc_type and display_name: documents matching the first pattern come
+    first, then the second, and so on, with non-matching documents last. Within
+    each group documents follow `order`. "smallest" needs sizes, which
+    download_documents fetches with HEAD requests when the docket has none.
+    Subclasses can override key() for other schemes; ties keep docket order.
+    Invalid orders or patterns raise ValueError.
+    """
+    order: str = "docket"
+    types: Optional[List[str]] = None
+    
+    def __post_init__(self):
+        if self.order not in DOWNLOAD_ORDERS:
+            raise ValueError(f"Unknown download order '{self.order}', expected one of {', '.join(DOWNLOAD_ORDERS)}")
+        self._types = [DocumentFilter._compile(pattern) for pattern in self.types or []]
+    
+    @property
+    def active(self) -> bool:
+        return self.order != "docket" or bool(self._types)
+    
+    @property
+    def needs_sizes(self) -> bool:
+        return self.order == "smallest"
+    
+    def key(self, doc: DocumentInfo) -> Tuple:
+        text = f"{doc.doc_type}\n{doc.display_name}"
+        type_rank = next((rank for rank, pattern in enumerate(self._types) if pattern.search(text)),
+                         len(self._types))
+        if self.order == "newest":
+            try:
+                return (type_rank, -datetime.strptime(doc.date, "%m/%d/%Y").toordinal())
+            except ValueError:
+                # Undated documents after the dated ones
+                return (type_rank, 1)
+        if self.order == "smallest":
+            # Unknown sizes (0) after the known ones
+            return (type_rank, 0 if doc.size else 1, doc.size)
+        return (type_rank,)
+    
+    def sort(self, documents: List[DocumentInfo]) -> List[DocumentInfo]:
+        """Return the documents in download order (a stable sort, so ties keep docket order)"""
+        return sorted(documents, key=self.key)
 
 class GalvestonCourtScraper:
     """Complete Galveston County court document scraper"""
     
-    def __init__(self, headless: bool = True, verbose: bool = False, progress_callback=None):
+    def __init__(self, headless: bool = True, verbose: bool = False, progress_callback=None,
+                 request_rate: float = 1.0, journal=None, lean: bool = False,
+                 blocked_url_patterns: Optional[List[str]] = None, base_url: Optional[str] = None,
+                 wait_strategy: str = "element", extract_mode: str = "html", deep_link_cache=None,
+                 case_detail_urls: Optional[Dict[str, str]] = None, http_backend: str = "requests",
+                 connect_timeout: float = 10.0, read_timeout: float = 30.0, shared_http_pool: bool = True,
+                 http_pool_size: Optional[int] = None, retry_policy: Optional[RetryPolicy] = None,
+                 document_filter: Optional[DocumentFilter] = None, list_only: bool = False,
+                 head_sizes: bool = False, download_priority: Optional[DownloadPriority] = None,
+                 download_slots: Optional[int] = None, download_bandwidth: Optional[float] = None,
+                 download_queue_limit: Optional[int] = None, case_priorities: Optional[Dict[str, int]] = None,
+                 archive_format: Optional[str] = None):
         self.headless = headless
         self.verbose = verbose
         self.driver = None
-        self.base_url = "https://publicaccess.galvestoncountytx.gov/PublicAccess/"
+        self.base_url = base_url or "https://publicaccess.galvestoncountytx.gov/PublicAccess/"
         self.documents = []
-        self.used_filenames = set()
         self.progress_callback = progress_callback
         
+        # Delay between document requests (request_rate is requests per second, 0 = no delay)
+        self.request_delay = 1.0 / request_rate if request_rate and request_rate > 0 else 0.0
+        
+        # Optional BatchJournal (court_journal.py) recording finished documents and cases
+        self.journal = journal
+        
+        # Lean navigation profile: eager page loads, no images, CSS, fonts or third-party hosts
+        self.lean = lean
+        self.blocked_url_patterns = LEAN_BLOCKED_URL_PATTERNS + list(blocked_url_patterns or [])
+        
+        # Navigation waits: "element" polls for specific elements, "observer" waits in-page
+        # with a MutationObserver (one WebDriver round trip per wait)
+        if wait_strategy not in ("element", "observer"):
+            raise ValueError(f"Unknown wait strategy: {wait_strategy}")
+        self.wait_strategy = wait_strategy
+        self.step_timings = []
+        
+        # Step 7 extraction: "html" transfers page_source, "json" extracts the document rows in-page
+        if extract_mode not in ("html", "json"):
+            raise ValueError(f"Unknown extract mode: {extract_mode}")
+        self.extract_mode = extract_mode
+        
+        # Optional DeepLinkCache (court_deeplinks.py), or the path of its file (the process-wide
+        # cache of that file is used): known cases open their document page directly instead of running steps 1-5
+        if isinstance(deep_link_cache, (str, Path)):
+            from court_deeplinks import shared_deep_link_cache
+            deep_link_cache = shared_deep_link_cache(deep_link_cache)
+        self.deep_link_cache = deep_link_cache
+        
+        # Case detail URLs found by a Date Filed search (search_cases_by_date): those
+        # cases open their detail page directly and only run steps 6 and 7
+        self.case_detail_urls = dict(case_detail_urls or {})
+        
+        # Document download client (court_http.py): "requests" or "httpx" (HTTP/2), with
+        # separate connect and read timeouts in seconds
+        if http_backend not in HTTP_BACKENDS:
+            raise ValueError(f"Unknown HTTP backend: {http_backend}")
+        self.http_backend = http_backend
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        
+        # Reuse one process-wide connection pool across cases instead of a client per case;
+        # http_pool_size defaults to the download concurrency
+        self.shared_http_pool = shared_http_pool
+        self.http_pool_size = http_pool_size
+        
+        # Backoff, Retry-After and circuit breaker settings for downloads and navigation
+        self.retry_policy = retry_policy or RetryPolicy()
+        
+        # Default DocumentFilter for scrape_case: unwanted documents are never requested
+        self.document_filter = document_filter
+        
+        # Listing mode: scrape_case returns the parsed docket without downloading,
+        # optionally with sizes from HEAD requests
+        self.list_only = list_only
+        self.head_sizes = head_sizes
+        
+        # Download order (None keeps the docket order)
+        self.download_priority = download_priority
+        
+        # Process-wide fair-share scheduler (court_scheduler.py) shared by every case that
+        # sets any of these: at most download_slots requests at once, download_bandwidth
+        # bytes per second, download_queue_limit waiting requests before load is shed.
+        # case_priorities raises the priority of listed cases (default 0)
+        self.download_slots = download_slots
+        self.download_bandwidth = download_bandwidth
+        self.download_queue_limit = download_queue_limit
+        self.case_priorities = dict(case_priorities or {})
+        
+        # Archive output (court_archive.py): "zip" or "tar.zst" writes each case into
+        # <out>/<case>.<format> instead of a folder; archive is the one being written
+        if archive_format is not None and archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format: {archive_format}")
+        self.archive_format = archive_format
+        self.archive = None
+        
+        # Receiver of typed events while scrape_case_iter/scrape_case_aiter runs
+        self.event_sink = None
+        self.event_case = None
+        
         # Setup logging
         self.setup_logging()
         
@@ -84,10 +400,20 @@ class GalvestonCourtScraper:
         else:
             self.logger.info(message)
     
-    def report_progress(self, step: int, total_steps: int, message: str, phase: str = "navigation"):
-        """Report progress to callback if available"""
+    def report_progress(self, step: int, total_steps: Optional[int], message: str, phase: str = "navigation"):
+        """
+        Report progress to callback if available
+        
+        total_steps is None while the total is not known yet (documents streamed
+        from a page still being parsed); percentage is then None as well.
+        """
+        # Download progress reaches event consumers as per-document events instead
+        if phase == "navigation":
+            self.emit_event(NavigationEvent, step=step, total_steps=total_steps, message=message)
+        elif phase == "parsing":
+            self.emit_event(ParseEvent, message=message)
         if self.progress_callback:
-            percentage = (step / total_steps) * 100
+            percentage = (step / total_steps) * 100 if total_steps else None
             self.progress_callback({
                 'phase': phase,
                 'step': step,
@@ -96,6 +422,11 @@ class GalvestonCourtScraper:
                 'percentage': percentage
             })
     
+    def emit_event(self, event_class, **fields):
+        """Send a typed event (court_events.py) to the consumer of scrape_case_iter, if any"""
+        if self.event_sink:
+            self.event_sink(event_class(self.event_case or "", **fields))
+    
     def setup_driver(self):
         """Setup Chrome WebDriver with appropriate options"""
         try:
@@ -117,10 +448,18 @@ class GalvestonCourtScraper:
             chrome_options.add_argument("--disable-extensions")
             chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
             
+            if self.lean:
+                self._apply_lean_options(chrome_options)
+            
             # Create driver
             self.driver = webdriver.Chrome(options=chrome_options)
             self.driver.set_page_load_timeout(30)
-            self.driver.implicitly_wait(10)
+            # Explicit waits only: an implicit wait would stretch every poll of an explicit wait
+            self.driver.implicitly_wait(0)
+            self.driver.set_script_timeout(30)
+            
+            if self.lean:
+                self._block_resources()
             
             self.log("Browser initialized successfully")
             return True
@@ -129,6 +468,35 @@ class GalvestonCourtScraper:
             self.log(f"Failed to initialize browser: {str(e)}", "ERROR")
             return False
     
+    def _apply_lean_options(self, chrome_options: Options):
+        """Configure Chrome to build the DOM only: no images, stylesheets or fonts"""
+        # Hand control back once the DOM is ready instead of waiting for every subresource
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-remote-fonts")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-component-update")
+        chrome_options.add_argument("--disable-default-apps")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--mute-audio")
+        self.log("Using lean browser profile (eager loading, images/CSS/fonts blocked)")
+    
+    def _block_resources(self):
+        """Block resource URLs through the Chrome DevTools Protocol"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_url_patterns})
+            self.log(f"Blocking {len(self.blocked_url_patterns)} resource URL patterns")
+        except WebDriverException as e:
+            # Prefs above still block images; navigation works without CDP blocking
+            self.log(f"Could not enable CDP resource blocking: {e}", "ERROR")
+    
     def close_driver(self):
         """Close the browser driver"""
         if self.driver:
@@ -139,22 +507,45 @@ class GalvestonCourtScraper:
                 self.log(f"Error closing browser: {e}", "ERROR")
             self.driver = None
     
-    def navigate_to_case(self, case_number: str, max_retries: int = 2) -> Optional[tuple]:
+    def navigate_to_case(self, case_number: str, max_retries: Optional[int] = None,
+                         use_deep_link: bool = True) -> Optional[tuple]:
         """
         Navigate through the 7-step process to get case documents HTML
         
+        With a deep-link cache, a case seen before opens its cached document page
+        directly; the full 7 steps only run when that link fails.
+        
         Args:
             case_number: Case number like '25-CV-0880'
-            max_retries: Number of retry attempts if navigation fails
+            max_retries: Number of retry attempts if navigation fails (default: from the retry policy)
+            use_deep_link: Try the cached document page URL first
             
         Returns:
-            Tuple of (HTML source, cookies dict) or None if failed
+            Tuple of (HTML source, cookies dict) or None if failed. With
+            extract_mode="json" the first item is the list of document rows.
         """
+        cached_url = self.deep_link_cache.get(case_number) if self.deep_link_cache and use_deep_link else None
+        if cached_url:
+            try:
+                return self._navigate_deep_link(case_number, cached_url)
+            except Exception as e:
+                self.log(f"Cached link for case {case_number} failed, running full navigation: {str(e)}", "WARNING")
+                self.deep_link_cache.discard(case_number)
+        
+        detail_url = self.case_detail_urls.get(case_number) if use_deep_link else None
+        if detail_url:
+            try:
+                return self._navigate_from_detail(case_number, detail_url)
+            except Exception as e:
+                self.log(f"Case detail link for {case_number} failed, running full navigation: {str(e)}", "WARNING")
+        
+        if max_retries is None:
+            max_retries = self.retry_policy.max_attempts - 1
         for attempt in range(max_retries + 1):
             if attempt > 0:
                 self.log(f"Retry attempt {attempt} for case {case_number}")
                 self.close_driver()
-                time.sleep(2)
+                time.sleep(self.retry_policy.delay(attempt))
             
             try:
                 return self._perform_navigation(case_number)
@@ -166,8 +557,51 @@ class GalvestonCourtScraper:
         
         return None
     
+    def _wait_for_page_change(self, clicked_element, timeout: float = 15):
+        """Wait until a clicked element has left the DOM (the next page replaced it)"""
+        try:
+            WebDriverWait(self.driver, timeout).until(EC.staleness_of(clicked_element))
+        except TimeoutException:
+            # Some portal links update the page in place; the next wait checks the content
+            self.log("Page did not reload after click, continuing with content wait")
+    
+    def _wait_for_dom(self, selector: Optional[str], text: Optional[str], timeout: float = 15):
+        """Wait until a CSS selector matches or a text appears on the current page"""
+        if self.wait_strategy == "observer":
+            found = self.driver.execute_async_script(WAIT_FOR_DOM_SCRIPT, selector, text, int(timeout * 1000))
+            if not found:
+                raise TimeoutException(f"Timed out waiting for {selector or text}")
+            return
+        
+        conditions = []
+        if selector:
+            conditions.append(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        if text:
+            conditions.append(EC.presence_of_element_located(
+                (By.XPATH, f"//*[contains(normalize-space(text()), '{text}')]")))
+        WebDriverWait(self.driver, timeout).until(EC.any_of(*conditions))
+    
+    def _wait_for_case_page(self, case_number: str, clicked_element):
+        """Wait for the case detail page after the first case link click (step 5)"""
+        self._wait_for_page_change(clicked_element)
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.PARTIAL_LINK_TEXT, case_number))
+        )
+    
+    def _wait_for_document_page(self, clicked_element):
+        """Wait for the document list (or the 'No records found' notice) after step 6"""
+        self._wait_for_page_change(clicked_element)
+        self._wait_for_dom(DOCUMENT_LINK_SELECTOR, NO_RECORDS_TEXT, timeout=15)
+    
+    def _record_step(self, step: int, started: float) -> float:
+        """Record how long a navigation step took, returns the start time of the next step"""
+        now = time.perf_counter()
+        self.step_timings.append((step, now - started))
+        return now
+    
     def _perform_navigation(self, case_number: str) -> tuple:
         """Perform the actual 7-step navigation"""
+        self.step_timings = []
         
         # Step 1: Open Galveston County Public Access
         self.log(f"Step 1/7: {self.navigation_steps[0]}")
@@ -177,13 +611,9 @@ class GalvestonCourtScraper:
             if not self.setup_driver():
                 raise Exception("Failed to setup browser driver")
         
+        started = time.perf_counter()
         self.driver.get(f"{self.base_url}default.aspx")
         
-        # Wait for page to load
-        WebDriverWait(self.driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
-        
         # Step 2: Click "Civil and Family Case Records"
         self.log(f"Step 2/7: {self.navigation_steps[1]}")
         self.report_progress(2, 7, self.navigation_steps[1])
@@ -191,12 +621,14 @@ class GalvestonCourtScraper:
         civil_link = WebDriverWait(self.driver, 15).until(
             EC.element_to_be_clickable((By.LINK_TEXT, "Civil and Family Case Records"))
         )
+        started = self._record_step(1, started)
         civil_link.click()
         
         # Better wait for navigation instead of sleep
         WebDriverWait(self.driver, 10).until(
             EC.presence_of_element_located((By.XPATH, "//input[@type='radio']"))
         )
+        started = self._record_step(2, started)
         
         # Step 3: Select "Case" radio button  
         self.log(f"Step 3/7: {self.navigation_steps[2]}")
@@ -207,40 +639,41 @@ class GalvestonCourtScraper:
         )
         case_radio.click()
         
-        # Wait for form to update
-        time.sleep(1)
+        # Wait for the form to enable the case number field
+        case_input = WebDriverWait(self.driver, 15).until(
+            EC.element_to_be_clickable((By.ID, "CaseSearchValue"))
+        )
+        started = self._record_step(3, started)
         
         # Step 4: Enter case number
         self.log(f"Step 4/7: {self.navigation_steps[3]} - {case_number}")
         self.report_progress(4, 7, f"{self.navigation_steps[3]} - {case_number}")
         
-        case_input = WebDriverWait(self.driver, 15).until(
-            EC.element_to_be_clickable((By.ID, "CaseSearchValue"))
-        )
         case_input.clear()
         case_input.send_keys(case_number)
         case_input.send_keys(Keys.RETURN)
         
         # Wait for search results with better condition
-        WebDriverWait(self.driver, 15).until(
-            EC.presence_of_element_located((By.PARTIAL_LINK_TEXT, case_number))
+        case_link = WebDriverWait(self.driver, 15).until(
+            EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, case_number))
         )
+        started = self._record_step(4, started)
         
         # Step 5: Click case number hyperlink (first time)
         self.log(f"Step 5/7: {self.navigation_steps[4]}")
         self.report_progress(5, 7, self.navigation_steps[4])
         
-        case_link = WebDriverWait(self.driver, 15).until(
-            EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, case_number))
-        )
         case_link.click()
         
         # Wait for case details page
-        WebDriverWait(self.driver, 10).until(
-            lambda driver: case_number in driver.page_source
-        )
+        self._wait_for_case_page(case_number, case_link)
+        started = self._record_step(5, started)
         
         # Step 6: Click case number hyperlink again (CRUCIAL STEP)
+        return self._open_document_page(case_number, started)
+    
+    def _open_document_page(self, case_number: str, started: float) -> tuple:
+        """Steps 6 and 7 from the case detail page: open the documents and extract them"""
         self.log(f"Step 6/7: {self.navigation_steps[5]}")
         self.report_progress(6, 7, self.navigation_steps[5])
         
@@ -250,105 +683,339 @@ class GalvestonCourtScraper:
         case_link_second.click()
         
         # Wait for document list page - look for document indicators
-        WebDriverWait(self.driver, 15).until(
-            lambda driver: "ViewDocumentFragment.aspx" in driver.page_source or 
-                          "No records found" in driver.page_source
+        self._wait_for_document_page(case_link_second)
+        started = self._record_step(6, started)
+        document_page_url = self.driver.current_url
+        
+        result = self._extract_document_page(started)
+        if self.deep_link_cache:
+            self.deep_link_cache.record(case_number, document_page_url)
+        return result
+    
+    def _navigate_from_detail(self, case_number: str, url: str) -> tuple:
+        """Open a case detail URL from a search results grid, then run steps 6 and 7"""
+        self.step_timings = []
+        self.log(f"Opening case detail page for case {case_number}")
+        self.report_progress(5, 7, f"Opening case detail page for {case_number}")
+        
+        if not self.driver:
+            if not self.setup_driver():
+                raise Exception("Failed to setup browser driver")
+        
+        started = time.perf_counter()
+        self.driver.get(url)
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.PARTIAL_LINK_TEXT, case_number))
         )
+        started = self._record_step(5, started)
+        
+        return self._open_document_page(case_number, started)
+    
+    def _navigate_deep_link(self, case_number: str, url: str) -> tuple:
+        """Open a cached document page URL directly, raising if it does not show the case's documents"""
+        self.step_timings = []
+        self.log(f"Opening cached document page for case {case_number}")
+        self.report_progress(6, 7, f"Opening cached document page for {case_number}")
+        
+        if not self.driver:
+            if not self.setup_driver():
+                raise Exception("Failed to setup browser driver")
+        
+        started = time.perf_counter()
+        self.driver.get(url)
+        self._wait_for_dom(DOCUMENT_LINK_SELECTOR, NO_RECORDS_TEXT, timeout=10)
         
-        # Step 7: Extract HTML source and cookies
+        # A stale link may land on another case or a search page
+        if not self.driver.execute_script("return document.body.textContent.includes(arguments[0]);", case_number):
+            raise Exception("Cached page does not show the case number")
+        started = self._record_step(6, started)
+        
+        return self._extract_document_page(started)
+    
+    def _extract_document_page(self, started: float) -> tuple:
+        """Step 7: extract the document list and cookies from the current document page"""
         self.log(f"Step 7/7: {self.navigation_steps[6]}")
         self.report_progress(7, 7, self.navigation_steps[6])
         
-        html_source = self.driver.page_source
+        if self.extract_mode == "json":
+            content = [dict(zip(DOCUMENT_ROW_FIELDS, row))
+                       for row in self.driver.execute_script(EXTRACT_DOCUMENTS_SCRIPT, DOCUMENT_LINK_SELECTOR)]
+        else:
+            content = self.driver.page_source
         
         # Extract cookies from the browser session
         cookies = {}
         for cookie in self.driver.get_cookies():
             cookies[cookie['name']] = cookie['value']
         
+        self._record_step(7, started)
         self.log(f"Extracted {len(cookies)} cookies from browser session")
+        self.log("Step timings: " + ", ".join(f"{step}={seconds:.2f}s" for step, seconds in self.step_timings))
         
         # Validate we got the document page
-        if "ViewDocumentFragment.aspx" in html_source:
-            doc_count = len(re.findall(r'ViewDocumentFragment\.aspx', html_source))
+        if self.extract_mode == "json":
+            if content:
+                self.log(f"Successfully extracted {len(content)} document rows in-page")
+                return (content, cookies)
+            if self.driver.execute_script("return document.body.textContent.includes(arguments[0]);", NO_RECORDS_TEXT):
+                self.log("Case found but no documents available")
+                return (content, cookies)
+            raise Exception("Failed to reach document page - unexpected content")
+        
+        if "ViewDocumentFragment.aspx" in content:
+            doc_count = len(re.findall(r'ViewDocumentFragment\.aspx', content))
             self.log(f"Successfully extracted HTML with {doc_count} document links")
-            return (html_source, cookies)
-        elif "No records found" in html_source:
+            return (content, cookies)
+        elif NO_RECORDS_TEXT in content:
             self.log("Case found but no documents available")
-            return (html_source, cookies)
+            return (content, cookies)
         else:
             raise Exception("Failed to reach document page - unexpected content")
     
-    def parse_documents(self, html_content: str) -> List[DocumentInfo]:
-        """Parse HTML content and extract document information"""
-        self.log("Parsing document information from HTML")
+    def search_cases_by_date(self, date_from: str, date_to: str, max_pages: int = 500) -> List[Dict]:
+        """
+        Enumerate every case filed in a date range with the portal's Date Filed search
+        
+        Walks the results grid page by page ("Next" links) and reads case numbers
+        and detail URLs from each page in one pass.
+        
+        Args:
+            date_from: First filing date, MM/DD/YYYY
+            date_to: Last filing date (inclusive), MM/DD/YYYY
+            max_pages: Safety limit on result pages
+            
+        Returns:
+            List of {"case_number", "url"} dicts in result order, without duplicates
+        """
+        self.log(f"Searching cases filed {date_from} - {date_to}")
+        self.report_progress(1, 3, self.navigation_steps[0], "search")
         
+        if not self.driver:
+            if not self.setup_driver():
+                raise Exception("Failed to setup browser driver")
+        
+        self.driver.get(f"{self.base_url}default.aspx")
+        civil_link = WebDriverWait(self.driver, 15).until(
+            EC.element_to_be_clickable((By.LINK_TEXT, "Civil and Family Case Records"))
+        )
+        civil_link.click()
+        
+        self.report_progress(2, 3, "Selecting 'Date Filed' search", "search")
+        date_radio = WebDriverWait(self.driver, 15).until(
+            EC.element_to_be_clickable((By.XPATH, "//input[@type='radio' and contains(@id, 'DateFiled')]"))
+        )
+        date_radio.click()
+        
+        filed_after = WebDriverWait(self.driver, 15).until(
+            EC.element_to_be_clickable((By.ID, "DateFiledOnAfter"))
+        )
+        filed_before = self.driver.find_element(By.ID, "DateFiledOnBefore")
+        filed_after.clear()
+        filed_after.send_keys(date_from)
+        filed_before.clear()
+        filed_before.send_keys(date_to)
+        filed_before.send_keys(Keys.RETURN)
+        self._wait_for_page_change(filed_before)
+        
+        cases = {}
+        for page in range(1, max_pages + 1):
+            self._wait_for_dom(CASE_LINK_SELECTOR, NO_RECORDS_TEXT, timeout=30)
+            self.report_progress(3, 3, f"Reading search results page {page} ({len(cases)} cases so far)", "search")
+            
+            for row in self.extract_case_links(self.driver.page_source):
+                cases.setdefault(row["case_number"], urljoin(self.driver.current_url, row["url"]))
+            
+            next_links = self.driver.find_elements(By.XPATH, NEXT_PAGE_XPATH)
+            if not next_links:
+                break
+            next_links[0].click()
+            self._wait_for_page_change(next_links[0])
+        else:
+            self.log(f"Stopped after {max_pages} result pages", "WARNING")
+        
+        self.log(f"Found {len(cases)} cases filed {date_from} - {date_to}")
+        return [{"case_number": case_number, "url": url} for case_number, url in cases.items()]
+    
+    def extract_case_links(self, html_content: str) -> List[Dict]:
+        """Extract {"case_number", "url"} for each case link in a search results page"""
         soup = BeautifulSoup(html_content, 'html.parser')
-        documents = []
+        rows = []
+        for link in soup.find_all('a', href=lambda x: x and 'CaseDetail.aspx' in x):
+            match = CASE_NUMBER_SEARCH.search(link.get_text(strip=True))
+            if match:
+                rows.append({"case_number": match.group(0), "url": link.get('href')})
+        return rows
+    
+    def extract_document_rows(self, html_content: str) -> List[Dict]:
+        """
+        Extract one row dict per document link from the documents page HTML
+        
+        Rows hold the same fields as EXTRACT_DOCUMENTS_SCRIPT output: href, text,
+        first_cell (None when the link is not inside a table row) and fragment_id.
+        """
+        soup = BeautifulSoup(html_content, 'html.parser')
+        rows = []
         
         # Find all document links
-        all_links = soup.find_all('a', href=lambda x: x and 'ViewDocumentFragment.aspx' in x)
+        for link in soup.find_all('a', href=lambda x: x and 'ViewDocumentFragment.aspx' in x):
+            href = link.get('href')
+            first_cell = None
+            
+            # Find the parent row to get date information
+            row = link.find_parent('tr')
+            if row:
+                cells = row.find_all('td')
+                if len(cells) >= 1:
+                    first_cell = cells[0].get_text(strip=True)
+            
+            rows.append({
+                'href': href,
+                'text': link.get_text(strip=True),
+                'first_cell': first_cell,
+                'fragment_id': self.extract_fragment_id(href)
+            })
+        return rows
+    
+    def iter_document_rows(self, html_content: str) -> Iterator[Dict]:
+        """
+        Yield the row dicts of extract_document_rows while the HTML is still being parsed
         
-        if not all_links:
-            self.log("No document links found in HTML")
-            return documents
+        lxml's incremental parser hands over each table row as soon as its closing
+        tag is read, and parsed rows are freed again, so a huge docket is never
+        held as a full tree. Without lxml this falls back to extract_document_rows.
+        """
+        try:
+            from lxml import etree
+        except ImportError:
+            yield from self.extract_document_rows(html_content)
+            return
+        if not html_content or not html_content.strip():
+            return
         
-        self.log(f"Found {len(all_links)} document links")
+        def text_of(element) -> str:
+            # Same as BeautifulSoup's get_text(strip=True)
+            return "".join(text.strip() for text in element.itertext())
         
-        for i, link in enumerate(all_links, 1):
-            try:
-                href = link.get('href')
-                link_text = link.get_text(strip=True)
-                fragment_id = self.extract_fragment_id(href)
-                
-                # Find the parent row to get date information
-                row = link.find_parent('tr')
-                if row:
-                    cells = row.find_all('td')
-                    if len(cells) >= 1:
-                        first_cell = cells[0].get_text(strip=True)
-                        
-                        # Look for date pattern MM/DD/YYYY
-                        date_match = re.search(r'(\d{2})/(\d{2})/(\d{4})', first_cell)
-                        if date_match:
-                            month, day, year = date_match.groups()
-                            
-                            # Extract document type from date cell
-                            doc_type = first_cell[date_match.end():].strip()
-                            doc_type = doc_type.replace('\u00a0', ' ').replace('&nbsp;', ' ')
-                            doc_type = re.sub(r'\s+', ' ', doc_type).strip()
-                            
-                            # Choose the longest, most descriptive name
-                            if len(link_text) > len(doc_type) and link_text != doc_type:
-                                display_name = link_text
-                            else:
-                                display_name = doc_type
-                            
-                            # Remove .pdf extension if already present
-                            if display_name.lower().endswith('.pdf'):
-                                display_name = display_name[:-4]
-                            
-                            # Generate unique filename
-                            filename = self.generate_unique_filename(year, month, day, display_name, fragment_id)
-                            
-                            doc_info = DocumentInfo(
-                                index=i,
-                                filename=filename,
-                                url=href,
-                                fragment_id=fragment_id,
-                                date=f"{month}/{day}/{year}",
-                                display_name=display_name,
-                                doc_type=doc_type
-                            )
-                            
-                            documents.append(doc_info)
-                            
-            except Exception as e:
-                self.log(f"Error parsing document {i}: {e}", "ERROR")
+        events = etree.iterparse(io.BytesIO(html_content.encode("utf-8")), events=("end",), tag=("a", "tr"),
+                                 html=True, encoding="utf-8", recover=True)
+        waiting = []  # (row element, row dict) of links whose row has not closed yet
+        for _, element in events:
+            if element.tag == "a":
+                href = element.get("href")
+                if not href or "ViewDocumentFragment.aspx" not in href:
+                    continue
+                row = {'href': href, 'text': text_of(element), 'first_cell': None,
+                       'fragment_id': self.extract_fragment_id(href)}
+                parent_row = next(element.iterancestors("tr"), None)
+                if parent_row is None:
+                    yield row
+                else:
+                    waiting.append((parent_row, row))
                 continue
+            
+            # A closed row: its first cell now holds the date and type of its links
+            if waiting:
+                first_td = next(element.iter("td"), None)
+                first_cell = text_of(first_td) if first_td is not None else None
+                for parent_row, row in waiting:
+                    if parent_row is element:
+                        row['first_cell'] = first_cell
+                        yield row
+                waiting = [entry for entry in waiting if entry[0] is not element]
+            if next(element.iterancestors("tr"), None) is None:
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+    
+    def iter_documents(self, content, filenames: Optional[FilenameRegistry] = None) -> Iterator[DocumentInfo]:
+        """
+        Yield document information from the documents page as it is parsed
+        
+        Args:
+            content: Page HTML, or the list of row dicts extracted in-page (extract_mode="json")
+            filenames: The case's FilenameRegistry (default: a new in-memory namespace)
+        """
+        filenames = filenames if filenames is not None else FilenameRegistry()
+        if isinstance(content, str):
+            self.log("Parsing document information from HTML")
+            rows = self.iter_document_rows(content)
+        else:
+            self.log("Parsing document information from in-page rows")
+            rows = content or []
+        
+        parsed = 0
+        try:
+            for i, row in enumerate(rows, 1):
+                try:
+                    doc_info = self._build_document(i, row, filenames)
+                except Exception as e:
+                    self.log(f"Error parsing document {i}: {e}", "ERROR")
+                    continue
+                if doc_info:
+                    parsed += 1
+                    yield doc_info
+        finally:
+            # One write for the case's new names, also when parsing stops early
+            filenames.flush()
+        
+        if parsed:
+            self.log(f"Successfully parsed {parsed} documents")
+        else:
+            self.log("No documents found in the page")
+    
+    def parse_documents(self, content, filenames: Optional[FilenameRegistry] = None) -> List[DocumentInfo]:
+        """
+        Parse document information from the documents page
+        
+        Args:
+            content: Page HTML, or the list of row dicts extracted in-page (extract_mode="json")
+            filenames: The case's FilenameRegistry (default: a new in-memory namespace)
+        """
+        return list(self.iter_documents(content, filenames))
+    
+    def _build_document(self, index: int, row: Dict, filenames: FilenameRegistry) -> Optional[DocumentInfo]:
+        """Build a DocumentInfo from one document row, None if the row has no date"""
+        first_cell = row.get('first_cell')
+        if not first_cell:
+            return None
+        
+        href = row['href']
+        link_text = row.get('text') or ''
+        fragment_id = row.get('fragment_id') or self.extract_fragment_id(href)
+        
+        # Look for date pattern MM/DD/YYYY
+        date_match = re.search(r'(\d{2})/(\d{2})/(\d{4})', first_cell)
+        if not date_match:
+            return None
+        month, day, year = date_match.groups()
+        
+        # Extract document type from date cell
+        doc_type = first_cell[date_match.end():].strip()
+        doc_type = doc_type.replace('\u00a0', ' ').replace('&nbsp;', ' ')
+        doc_type = re.sub(r'\s+', ' ', doc_type).strip()
+        
+        # Choose the longest, most descriptive name
+        if len(link_text) > len(doc_type) and link_text != doc_type:
+            display_name = link_text
+        else:
+            display_name = doc_type
         
-        self.log(f"Successfully parsed {len(documents)} documents")
-        return documents
+        # Remove .pdf extension if already present
+        if display_name.lower().endswith('.pdf'):
+            display_name = display_name[:-4]
+        
+        # Generate unique filename
+        filename = self.generate_unique_filename(year, month, day, display_name, fragment_id, filenames)
+        
+        return DocumentInfo(
+            index=index,
+            filename=filename,
+            url=href,
+            fragment_id=fragment_id,
+            date=f"{month}/{day}/{year}",
+            display_name=display_name,
+            doc_type=doc_type
+        )
     
     def extract_fragment_id(self, url: str) -> str:
         """Extract DocumentFragmentID from URL"""
@@ -366,25 +1033,11 @@ class GalvestonCourtScraper:
         
         return filename
     
-    def generate_unique_filename(self, year: str, month: str, day: str, display_name: str, fragment_id: str) -> str:
-        """Generate guaranteed unique filename"""
+    def generate_unique_filename(self, year: str, month: str, day: str, display_name: str, fragment_id: str,
+                                 filenames: FilenameRegistry) -> str:
+        """Generate a filename unique within the case, or return the one already assigned to the fragment ID"""
         sanitized_name = self.sanitize_filename(display_name)
-        base_filename = f"{year}.{month}.{day}_{sanitized_name}"
-        final_filename = f"{base_filename}.pdf"
-        
-        # Check for duplicates and make unique if needed
-        counter = 1
-        while final_filename in self.used_filenames:
-            final_filename = f"{base_filename}_(ID{fragment_id}).pdf"
-            
-            if final_filename in self.used_filenames:
-                final_filename = f"{base_filename}_(ID{fragment_id})_{counter}.pdf"
-                counter += 1
-            else:
-                break
-        
-        self.used_filenames.add(final_filename)
-        return final_filename
+        return filenames.assign(f"{year}.{month}.{day}_{sanitized_name}", fragment_id)
     
     def _validate_pdf_content(self, content: bytes, filename: str) -> str:
         """
@@ -393,6 +1046,8 @@ class GalvestonCourtScraper:
         Returns:
             'valid' - Valid PDF content
             'secured' - Content indicates secured/protected document
+            'expired' - Portal login or session timeout page (settled as secured or failed by
+                        callers unless the session is renewed)
             'error' - Invalid content or error page
         """
         # Check minimum size (PDFs should be at least 1KB for real documents)
@@ -400,6 +1055,9 @@ class GalvestonCourtScraper:
             # Very small files are often error pages, check if they're secured
             if len(content) > 0:
                 content_str = content.decode('utf-8', errors='ignore').lower()
+                if self._is_session_expired_content(content_str):
+                    self.log(f"EXPIRED: {filename} - Portal session timeout page ({len(content)} bytes)")
+                    return 'expired'
                 if self._is_secured_content(content_str):
                     self.log(f"SECURED: {filename} - Access denied ({len(content)} bytes)")
                     return 'secured'
@@ -412,6 +1070,11 @@ class GalvestonCourtScraper:
             # Not a PDF, check if it's a secured document indicator
             content_str = content.decode('utf-8', errors='ignore').lower()
             
+            # A login or timeout page means the session expired, not that the document is secured
+            if self._is_session_expired_content(content_str):
+                self.log(f"EXPIRED: {filename} - Portal session timeout or login page")
+                return 'expired'
+            
             # Check for explicit secured content first
             if self._is_secured_content(content_str):
                 self.log(f"SECURED: {filename} - Access denied or login required")
@@ -445,6 +1108,16 @@ class GalvestonCourtScraper:
         
         return 'valid'
     
+    def _is_session_expired_content(self, content_str: str) -> bool:
+        """Check if content is the portal's session timeout or login page"""
+        expired_indicators = [
+            'session has timed out', 'session has expired', 'session timed out', 'session expired',
+            'session timeout', 'your session is no longer valid', 'please log in again',
+            'please login again', 'please sign in again', 'login.aspx'
+        ]
+        
+        return any(indicator in content_str for indicator in expired_indicators)
+    
     def _is_secured_content(self, content_str: str) -> bool:
         """Check if content indicates a secured/protected document"""
         secured_indicators = [
@@ -567,8 +1240,7 @@ startxref
             )
             
             # Write placeholder PDF
-            with open(file_path, 'wb') as f:
-                f.write(formatted_content.encode('utf-8'))
+            self._save_document(file_path, formatted_content.encode('utf-8'))
             
             return True
             
@@ -576,146 +1248,488 @@ startxref
             self.log(f"Failed to create placeholder PDF for {filename}: {e}", "ERROR")
             return False
     
-    def _download_with_retry(self, session, doc: DocumentInfo, file_path: Path, max_retries: int = 2) -> str:
-        """Download a single document with retry mechanism"""
+    def _save_document(self, file_path: Path, content: bytes):
+        """Write a document or placeholder to its file, or into the case archive when archiving"""
+        if self.archive is not None:
+            self.archive.add(file_path.name, content)
+        else:
+            with open(file_path, 'wb') as f:
+                f.write(content)
+    
+    def _saved_size(self, file_path: Path) -> Optional[int]:
+        """Size of a document saved before (in the case archive when archiving), None if there is none"""
+        if self.archive is not None:
+            return self.archive.size_of(file_path.name)
+        return file_path.stat().st_size if file_path.exists() else None
+    
+    def _finished_size(self, file_path: Path) -> Optional[int]:
+        """
+        Size of a saved document a resumed run can skip, None if it must be downloaded
+        
+        A session-expired placeholder left by an earlier run does not count: the
+        document behind it was never seen.
+        """
+        size = self._saved_size(file_path)
+        if size is None or self.archive is not None or size > 4096:
+            return size
+        with open(file_path, 'rb') as f:
+            if f"({EXPIRED_PLACEHOLDER_REASON})".encode('utf-8') in f.read():
+                return None
+        return size
+    
+    def _download_once(self, client, doc: DocumentInfo, file_path: Path, cookies: Optional[dict] = None,
+                       on_response: Optional[Callable[[int], None]] = None) -> Tuple[str, Optional[float]]:
+        """
+        Make one download attempt for a document
+        
+        Connection errors, timeouts, busy/unavailable statuses and invalid content
+        are retryable; other statuses fail at once. The request first passes the
+        portal's circuit breaker, so when the portal is down all download threads
+        of this process wait instead of retrying into it.
+        
+        Args:
+            on_response: Called with the size of every response body received,
+                whatever its status or content
+        
+        Returns:
+            (result, retry_after): result is 'success', 'secured', 'expired', 'failed'
+            (permanent) or 'retry'; retry_after is the server's Retry-After in seconds
+        """
         url = urljoin(self.base_url, doc.url)
+        policy = self.retry_policy
+        breaker = circuit_breaker_for(url, policy.breaker_threshold, policy.breaker_reset)
         
-        for attempt in range(max_retries + 1):
-            try:
-                if attempt > 0:
-                    self.log(f"Retry {attempt} for {doc.filename}")
-                    time.sleep(2)  # Wait before retry
-                else:
-                    self.log(f"Downloading: {doc.filename}")
-                
-                # Download file
-                response = session.get(url, timeout=30)
+        self.log(f"Downloading: {doc.filename}")
+        waited = breaker.before_request()
+        if waited >= 1:
+            self.log(f"Portal circuit breaker held {doc.filename} for {waited:.1f}s", "WARNING")
+        
+        try:
+            # Download file
+            response = client.get(url, cookies=cookies)
+        except Exception as e:
+            if not policy.should_retry_exception(e):
+                breaker.release()
+                self.log(f"ERROR downloading {doc.filename}: {str(e)}", "ERROR")
+                return 'failed', None
+            breaker.record_failure()
+            self.log(f"Exception downloading {doc.filename}, will retry: {str(e)}", "WARNING")
+            return 'retry', None
+        
+        if response.status_code in OUTAGE_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if on_response:
+            on_response(len(response.content))
+        
+        return self._handle_download_response(doc, file_path, response)
+    
+    def _handle_download_response(self, doc: DocumentInfo, file_path: Path, response) -> Tuple[str, Optional[float]]:
+        """
+        Validate and save a document response (anything with status_code, headers and content)
+        
+        Returns:
+            (result, retry_after) as for _download_once
+        """
+        policy = self.retry_policy
+        if response.status_code == 200:
+            content_length = len(response.content)
+            announced = response.headers.get('Content-Length')
+            self.emit_event(DocumentBytes, filename=doc.filename, received=content_length,
+                            total=int(announced) if announced and announced.isdigit() else None)
+            
+            # Validate content and determine status
+            validation_result = self._validate_pdf_content(response.content, doc.filename)
+            
+            if validation_result == 'valid':
+                # Save valid PDF file
+                self._save_document(file_path, response.content)
                 
-                if response.status_code == 200:
-                    content_length = len(response.content)
-                    
-                    # Validate content and determine status
-                    validation_result = self._validate_pdf_content(response.content, doc.filename)
-                    
-                    if validation_result == 'valid':
-                        # Save valid PDF file
-                        with open(file_path, 'wb') as file:
-                            file.write(response.content)
-                        
-                        self.log(f"SUCCESS: {doc.filename} ({content_length:,} bytes)")
-                        return 'success'
-                    
-                    elif validation_result == 'secured':
-                        # Create placeholder for secured document
-                        if self._create_placeholder_pdf(file_path, doc.filename):
-                            self.log(f"PLACEHOLDER: {doc.filename} - Created placeholder for secured document")
-                            return 'secured'
-                        else:
-                            self.log(f"FAILED: {doc.filename} - Could not create placeholder", "ERROR")
-                            return 'failed'
-                    
-                    elif validation_result == 'error':
-                        if attempt == max_retries:
-                            self.log(f"FAILED: {doc.filename} - Invalid PDF content after all retries", "ERROR")
-                            return 'failed'
-                        else:
-                            self.log(f"Invalid content on attempt {attempt + 1}, retrying...", "WARNING")
-                            continue
-                else:
-                    # Check for HTTP status codes that indicate secured files
-                    if response.status_code in [401, 403]:
-                        # Unauthorized or Forbidden - likely secured document
-                        if self._create_placeholder_pdf(file_path, doc.filename, f"HTTP {response.status_code} - Access Denied"):
-                            self.log(f"SECURED: {doc.filename} - HTTP {response.status_code}, created placeholder")
-                            return 'secured'
-                        else:
-                            self.log(f"FAILED: {doc.filename} - HTTP {response.status_code}, could not create placeholder", "ERROR")
-                            return 'failed'
-                    
-                    if attempt == max_retries:
-                        self.log(f"FAILED: {doc.filename} - HTTP {response.status_code} after all retries", "ERROR")
-                        return 'failed'
-                    else:
-                        self.log(f"HTTP {response.status_code} on attempt {attempt + 1}, retrying...")
-                        continue
-                        
-            except Exception as e:
-                if attempt == max_retries:
-                    self.log(f"ERROR downloading {doc.filename} after all retries: {str(e)}", "ERROR")
-                    return 'failed'
-                else:
-                    self.log(f"Exception on attempt {attempt + 1}, retrying: {str(e)}")
-                    continue
+                self.log(f"SUCCESS: {doc.filename} ({content_length:,} bytes)")
+                return 'success', None
+            
+            elif validation_result == 'expired':
+                # Nothing is saved yet: download_documents writes a placeholder only once it
+                # settles the document as secured, so an unrenewed session leaves no false placeholder
+                return 'expired', None
+            
+            elif validation_result == 'secured':
+                # Create placeholder for secured document
+                if self._create_placeholder_pdf(file_path, doc.filename):
+                    self.log(f"PLACEHOLDER: {doc.filename} - Created placeholder for secured document")
+                    return 'secured', None
+                self.log(f"FAILED: {doc.filename} - Could not create placeholder", "ERROR")
+                return 'failed', None
+            
+            self.log(f"Invalid content for {doc.filename}, will retry", "WARNING")
+            return 'retry', None
+        
+        # Check for HTTP status codes that indicate secured files
+        if response.status_code in [401, 403]:
+            # Unauthorized or Forbidden - likely secured document
+            if self._create_placeholder_pdf(file_path, doc.filename, f"HTTP {response.status_code} - Access Denied"):
+                self.log(f"SECURED: {doc.filename} - HTTP {response.status_code}, created placeholder")
+                return 'secured', None
+            self.log(f"FAILED: {doc.filename} - HTTP {response.status_code}, could not create placeholder", "ERROR")
+            return 'failed', None
         
-        return 'failed'
+        if not policy.should_retry_status(response.status_code):
+            self.log(f"FAILED: {doc.filename} - HTTP {response.status_code}", "ERROR")
+            return 'failed', None
+        
+        self.log(f"HTTP {response.status_code} for {doc.filename}, will retry", "WARNING")
+        return 'retry', parse_retry_after(response.headers.get('Retry-After'))
     
-    def download_documents(self, documents: List[DocumentInfo], download_dir: Path, cookies: dict = None, max_concurrent: int = 3) -> Dict:
-        """Download all documents with concurrent downloading"""
-        if not documents:
+    def download_documents(self, documents: Iterable[DocumentInfo], download_dir: Path, cookies: dict = None,
+                           max_concurrent: int = DEFAULT_DOWNLOAD_CONCURRENCY, case_number: Optional[str] = None) -> Dict:
+        """
+        Download all documents with concurrent downloading
+        
+        documents may be a list or any iterable, such as the iter_documents
+        generator: each document is requested as soon as it is produced, so
+        downloads begin before a large docket is fully parsed.
+        
+        Each document gets one attempt in the main pass. Retryable failures go to
+        a deferred queue, retried after the main pass once their backoff (or the
+        server's Retry-After) has elapsed, so a flaky document never holds up the
+        documents behind it. The stats separate first-try successes, recovered
+        documents and permanent failures.
+        
+        With a download_priority the documents are fetched in its order instead
+        of docket order. first_document_seconds reports the time from the start
+        of the call to the first successfully downloaded document (None if none).
+        
+        When a journal is configured and case_number is given, documents the
+        journal already lists as finished are skipped without any request.
+        
+        When SESSION_EXPIRY_THRESHOLD documents in a row come back as the portal's
+        session timeout page, the session is treated as expired rather than the
+        documents as secured: if case_number is given, the browser re-navigates
+        to the case once for fresh cookies and those documents are fetched again.
+        If the session cannot be renewed they count as failed and nothing is
+        saved for them, so a resumed run downloads them.
+        
+        With an archive_format the documents and placeholders go straight into
+        the case archive instead of download_dir (see case_archive); documents it
+        already holds are skipped like existing files.
+        """
+        if self.archive_format and self.archive is None:
+            with self.case_archive(download_dir):
+                return self.download_documents(documents, download_dir, cookies, max_concurrent, case_number)
+        
+        started = time.monotonic()
+        priority = self.download_priority
+        if priority and priority.active and not isinstance(documents, list):
+            # Sorting needs every document up front
+            documents = list(documents)
+        
+        # Main pass entries are (doc, attempt); a streamed iterable is read one document at a time
+        if isinstance(documents, list):
+            total = len(documents)
+            incoming = None
+            first_documents = documents
+        else:
+            total = None
+            incoming = iter(documents)
+            first_documents = [doc for doc in (next(incoming, None),) if doc is not None]
+        if not first_documents:
             self.log("No documents to download")
-            return {"successful": 0, "failed": 0, "skipped": 0, "secured": 0}
+            return {"successful": 0, "failed": 0, "skipped": 0, "secured": 0, "session_renewals": 0,
+                    "first_try": 0, "recovered": 0, "permanent_failures": [], "first_document_seconds": None}
         
-        download_dir.mkdir(parents=True, exist_ok=True)
-        self.log(f"Starting download of {len(documents)} documents to {download_dir}")
+        if self.archive is None:
+            download_dir.mkdir(parents=True, exist_ok=True)
+        if total is None:
+            self.log(f"Starting download of documents to {download_dir} while parsing")
+        else:
+            self.log(f"Starting download of {total} documents to {download_dir}")
         
         # Report initial download progress
-        self.report_progress(0, len(documents), f"Preparing to download {len(documents)} documents", "download")
+        self.report_progress(0, total, f"Preparing to download {total or 'parsed'} documents", "download")
         
-        # Setup session for downloads
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
-        })
+        # Setup HTTP client for downloads, its pool sized to the download concurrency
+        client_factory = shared_http_client if self.shared_http_pool else create_http_client
+        client = client_factory(self.http_backend, pool_size=self.http_pool_size or max_concurrent,
+                                connect_timeout=self.connect_timeout, read_timeout=self.read_timeout)
         
-        # Add cookies from browser session if provided
+        # Cookies from browser session, sent with every document request
+        cookies = dict(cookies or {})
         if cookies:
-            session.cookies.update(cookies)
-            self.log(f"Added {len(cookies)} cookies to download session")
+            self.log(f"Using {len(cookies)} browser cookies for {client.name} downloads")
+        
+        scheduler = None
+        if self.download_slots or self.download_bandwidth or self.download_queue_limit:
+            scheduler = shared_download_scheduler(self.download_slots or DEFAULT_DOWNLOAD_CONCURRENCY,
+                                                  self.download_bandwidth, self.download_queue_limit)
+        scheduler_case = case_number or str(download_dir)
+        case_priority = self.case_priorities.get(case_number, 0)
         
-        # Disable SSL verification for problematic certificates
-        session.verify = False
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        if priority and priority.active:
+            unsized = [doc for doc in first_documents if not doc.size]
+            if priority.needs_sizes and unsized:
+                self.fetch_document_sizes(unsized, cookies, max_concurrent)
+            first_documents = priority.sort(first_documents)
+            self.log(f"Download order: {priority.order}" + (f", types {priority.types}" if priority.types else ""))
         
         successful = 0
+        recovered = 0
         failed = 0
         skipped = 0
         secured = 0
+        session_renewals = 0
+        # Navigation is retried at most once per case, whether or not the renewal works
+        renewal_attempted = False
+        permanent_failures = []
+        first_document_seconds = None
+        journal = self.journal if case_number else None
+        policy = self.retry_policy
         
-        for doc_index, doc in enumerate(documents, 1):
+        # Documents that just got a session timeout page, held until the run is either
+        # broken by a real response or long enough to renew the session
+        expired_run = []
+        
+        def settle_expired_run():
+            nonlocal secured, failed
+            run_secured, run_failures = self._settle_expired_run(expired_run, journal, case_number)
+            secured += run_secured
+            failed += len(run_failures)
+            permanent_failures.extend(run_failures)
+            expired_run.clear()
+        
+        # Deferred retries are (ready_at, doc, attempt)
+        pending = deque((doc, 1) for doc in first_documents)
+        deferred = deque()
+        # Document key -> times the download scheduler shed its request
+        shed_counts = {}
+        doc_index = 0
+        while True:
+            if not pending and incoming is not None:
+                next_doc = next(incoming, None)
+                if next_doc is None:
+                    incoming = None
+                    # Every streamed document has been started: the total is known from here on
+                    total = doc_index
+                else:
+                    pending.append((next_doc, 1))
+            if pending:
+                doc, attempt = pending.popleft()
+                doc_index += 1
+            elif not deferred:
+                break
+            else:
+                # Main pass done: retry deferred documents once their backoff has elapsed
+                ready_at, doc, attempt = deferred.popleft()
+                wait = ready_at - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                self.log(f"Retry {attempt - 1} for {doc.filename} (deferred)")
             try:
                 file_path = download_dir / doc.filename
                 
                 # Report progress for current document
-                self.report_progress(doc_index, len(documents), f"Processing: {doc.filename}", "download")
+                self.report_progress(min(doc_index, total) if total else doc_index, total,
+                                     f"Processing: {doc.filename}", "download")
                 
-                # Skip if file already exists
-                if file_path.exists():
-                    existing_size = file_path.stat().st_size
-                    self.log(f"SKIP: {doc.filename} (exists, {existing_size:,} bytes)")
-                    skipped += 1
-                    continue
+                if attempt == 1:
+                    # Skip documents finished by an earlier (interrupted) run
+                    if journal and journal.is_document_done(case_number, doc.key):
+                        self.log(f"SKIP: {doc.filename} (completed in journal)")
+                        skipped += 1
+                        self.emit_event(DocumentFinished, filename=doc.filename, fragment_id=doc.fragment_id,
+                                        status='skipped')
+                        continue
+                    
+                    # Skip if file already exists
+                    existing_size = self._finished_size(file_path)
+                    if existing_size is not None:
+                        self.log(f"SKIP: {doc.filename} (exists, {existing_size:,} bytes)")
+                        skipped += 1
+                        if journal:
+                            journal.record_document(case_number, doc.key, doc.filename, 'skipped')
+                        self.emit_event(DocumentFinished, filename=doc.filename, fragment_id=doc.fragment_id,
+                                        status='skipped')
+                        continue
                 
-                # Try downloading with retry mechanism
-                download_result = self._download_with_retry(session, doc, file_path, max_retries=2)
+                self.emit_event(DocumentStarted, filename=doc.filename, fragment_id=doc.fragment_id, attempt=attempt)
+                if scheduler:
+                    download_result, retry_after = self._scheduled_download(
+                        scheduler, scheduler_case, case_priority, client, doc, file_path, cookies)
+                    if download_result == 'shed':
+                        shed_counts[doc.key] = shed_counts.get(doc.key, 0) + 1
+                        if shed_counts[doc.key] <= MAX_SHED_DEFERRALS:
+                            # Nothing was sent: defer the same attempt instead of using up a retry
+                            self.emit_event(DocumentFinished, filename=doc.filename, fragment_id=doc.fragment_id,
+                                            status='retry', attempt=attempt)
+                            delay = policy.delay(shed_counts[doc.key])
+                            self.log(f"Deferring {doc.filename} for {delay:.1f}s (shed by the download scheduler)")
+                            deferred.append((time.monotonic() + delay, doc, attempt))
+                            deferred = deque(sorted(deferred, key=lambda entry: entry[0]))
+                            continue
+                        download_result = 'retry'
+                else:
+                    download_result, retry_after = self._download_once(client, doc, file_path, cookies)
+                gave_up = download_result == 'retry' and attempt >= policy.max_attempts
+                self.emit_event(DocumentFinished, filename=doc.filename, fragment_id=doc.fragment_id,
+                                status='failed' if gave_up else download_result, attempt=attempt)
                 
-                if download_result == 'success':
-                    successful += 1
-                elif download_result == 'secured':
-                    secured += 1
-                else:  # 'failed'
-                    failed += 1
+                if download_result == 'retry':
+                    if attempt < policy.max_attempts:
+                        delay = policy.delay(attempt, retry_after)
+                        self.log(f"Deferring {doc.filename} for {delay:.1f}s (attempt {attempt} failed)")
+                        deferred.append((time.monotonic() + delay, doc, attempt + 1))
+                        deferred = deque(sorted(deferred, key=lambda entry: entry[0]))
+                    else:
+                        self.log(f"FAILED: {doc.filename} - giving up after {attempt} attempts", "ERROR")
+                        failed += 1
+                        permanent_failures.append(doc.filename)
+                elif download_result == 'expired':
+                    expired_run.append((doc, file_path))
+                    if (len(expired_run) >= SESSION_EXPIRY_THRESHOLD and case_number
+                            and not renewal_attempted):
+                        renewal_attempted = True
+                        fresh_cookies = self._renew_session(case_number)
+                        if fresh_cookies:
+                            session_renewals += 1
+                            cookies = dict(fresh_cookies)
+                            # Retry the documents that only failed because the session expired
+                            for expired_doc, _ in reversed(expired_run):
+                                pending.appendleft((expired_doc, 1))
+                                doc_index -= 1
+                            expired_run.clear()
+                            continue
+                else:
+                    settle_expired_run()
+                    if download_result == 'success':
+                        successful += 1
+                        if first_document_seconds is None:
+                            first_document_seconds = round(time.monotonic() - started, 3)
+                            self.log(f"First document after {first_document_seconds:.2f}s: {doc.filename}")
+                        if attempt > 1:
+                            recovered += 1
+                    elif download_result == 'secured':
+                        secured += 1
+                    else:  # 'failed'
+                        failed += 1
+                        permanent_failures.append(doc.filename)
+                    
+                    if journal and download_result in ('success', 'secured'):
+                        journal.record_document(case_number, doc.key, doc.filename, download_result)
                 
                 # Respectful delay
-                time.sleep(1.0)
+                if self.request_delay:
+                    time.sleep(self.request_delay)
                 
             except Exception as e:
                 self.log(f"ERROR downloading {doc.filename}: {str(e)}", "ERROR")
                 failed += 1
+                permanent_failures.append(doc.filename)
+        
+        settle_expired_run()
+        
+        if not self.shared_http_pool:
+            client.close()
+        self.log(f"Download complete: {successful} successful ({recovered} after retries), {secured} secured, "
+                 f"{failed} failed, {skipped} skipped")
+        return {"successful": successful, "failed": failed, "skipped": skipped, "secured": secured,
+                "session_renewals": session_renewals, "first_try": successful - recovered,
+                "recovered": recovered, "permanent_failures": permanent_failures,
+                "first_document_seconds": first_document_seconds}
+    
+    def _settle_expired_run(self, run: List[Tuple[DocumentInfo, Path]], journal,
+                            case_number: Optional[str]) -> Tuple[int, List[str]]:
+        """
+        Settle consecutive documents that got the session timeout page and were not fetched again
+        
+        A run shorter than SESSION_EXPIRY_THRESHOLD between real responses is
+        taken as the portal's page for secured documents: placeholders are saved
+        and journaled. A longer run is a session that could not be renewed: its
+        documents fail and nothing is saved or journaled, so a resumed run
+        tries them again.
+        
+        Returns:
+            (number of secured documents, filenames of failed documents)
+        """
+        if len(run) < SESSION_EXPIRY_THRESHOLD:
+            for doc, file_path in run:
+                self._create_placeholder_pdf(file_path, doc.filename, EXPIRED_PLACEHOLDER_REASON)
+                if journal:
+                    journal.record_document(case_number, doc.key, doc.filename, 'secured')
+            return len(run), []
+        for doc, _ in run:
+            self.log(f"FAILED: {doc.filename} - portal session expired", "ERROR")
+        return 0, [doc.filename for doc, _ in run]
+    
+    def _scheduled_download(self, scheduler, case_id: str, priority: int, client, doc: DocumentInfo,
+                            file_path: Path, cookies: Optional[dict] = None) -> Tuple[str, Optional[float]]:
+        """
+        _download_once inside a slot of the process-wide download scheduler
+        
+        Every response body counts against the bandwidth cap, error pages and
+        placeholders included. A request shed without being sent returns
+        ('shed', None) for the caller to defer.
+        """
+        try:
+            waited = scheduler.acquire(case_id, priority)
+        except SchedulerOverloaded as e:
+            self.log(f"{e}, deferring {doc.filename}", "WARNING")
+            return 'shed', None
+        if waited >= 1:
+            self.log(f"Download scheduler held {doc.filename} for {waited:.1f}s")
+        received = [0]
+        
+        def charge(nbytes: int):
+            received[0] += nbytes
+        
+        try:
+            return self._download_once(client, doc, file_path, cookies, on_response=charge)
+        finally:
+            scheduler.release(case_id, received[0])
+    
+    def fetch_document_sizes(self, documents: List[DocumentInfo], cookies: Optional[dict] = None,
+                             max_concurrent: int = DEFAULT_DOWNLOAD_CONCURRENCY):
+        """
+        Set DocumentInfo.size from HEAD requests (Content-Length), without downloading
+        
+        Sizes stay 0 when the portal does not report a length.
+        """
+        client_factory = shared_http_client if self.shared_http_pool else create_http_client
+        client = client_factory(self.http_backend, pool_size=self.http_pool_size or max_concurrent,
+                                connect_timeout=self.connect_timeout, read_timeout=self.read_timeout)
+        
+        def fetch_size(doc: DocumentInfo):
+            try:
+                response = client.head(urljoin(self.base_url, doc.url), cookies=cookies)
+                if response.status_code == 200:
+                    doc.size = int(response.headers.get('Content-Length') or 0)
+            except Exception as e:
+                self.log(f"HEAD failed for {doc.filename}: {str(e)}", "WARNING")
         
-        self.log(f"Download complete: {successful} successful, {secured} secured, {failed} failed, {skipped} skipped")
-        return {"successful": successful, "failed": failed, "skipped": skipped, "secured": secured}
+        self.log(f"Requesting sizes of {len(documents)} documents")
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+            list(executor.map(fetch_size, documents))
+        if not self.shared_http_pool:
+            client.close()
+    
+    def _renew_session(self, case_number: str) -> Optional[dict]:
+        """
+        Re-open the case in the browser to get a fresh portal session
+        
+        Returns:
+            The new session cookies, or None if navigation failed
+        """
+        self.log(f"Session expired during downloads - renewing session for case {case_number}", "WARNING")
+        self.report_progress(0, 1, "Portal session expired, renewing session", "navigation")
+        try:
+            _, fresh_cookies = self.navigate_to_case(case_number, use_deep_link=False)
+        except Exception as e:
+            self.log(f"Session renewal failed: {str(e)}", "ERROR")
+            return None
+        if not fresh_cookies:
+            self.log("Session renewal returned no cookies", "ERROR")
+            return None
+        self.log(f"Session renewed with {len(fresh_cookies)} cookies")
+        return fresh_cookies
     
     def create_manifest(self, download_dir: Path) -> Path:
         """Create detailed manifest of downloaded files"""
@@ -723,28 +1737,78 @@ startxref
         manifest_file = download_dir / "MANIFEST.txt"
         
         with open(manifest_file, 'w', encoding='utf-8') as f:
-            f.write("GALVESTON COUNTY COURT DOCUMENT MANIFEST\n")
-            f.write("=" * 50 + "\n")
-            f.write(f"Total Files: {len(pdf_files)}\n")
-            f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Download Directory: {download_dir}\n\n")
-            
-            total_size = 0
-            for i, file in enumerate(pdf_files, 1):
-                size = file.stat().st_size
-                total_size += size
-                f.write(f"{i:2d}. {file.name}\n")
-                f.write(f"    Size: {size:,} bytes\n\n")
-            
-            f.write(f"TOTAL SIZE: {total_size:,} bytes ({total_size/1024/1024:.1f} MB)\n")
+            f.write(self._manifest_text([(file.name, file.stat().st_size) for file in pdf_files],
+                                        "Download Directory", download_dir))
         
         self.log(f"Manifest created: {manifest_file}")
         return manifest_file
     
-    def scrape_case(self, case_number: str, download_dir: Optional[Path] = None) -> Dict:
+    def _manifest_text(self, files: List[Tuple[str, int]], location_label: str, location: Path) -> str:
+        """Manifest of (filename, size) pairs, as written by create_manifest"""
+        lines = ["GALVESTON COUNTY COURT DOCUMENT MANIFEST\n",
+                 "=" * 50 + "\n",
+                 f"Total Files: {len(files)}\n",
+                 f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n",
+                 f"{location_label}: {location}\n\n"]
+        
+        total_size = 0
+        for i, (name, size) in enumerate(files, 1):
+            total_size += size
+            lines.append(f"{i:2d}. {name}\n")
+            lines.append(f"    Size: {size:,} bytes\n\n")
+        
+        lines.append(f"TOTAL SIZE: {total_size:,} bytes ({total_size/1024/1024:.1f} MB)\n")
+        return "".join(lines)
+    
+    @contextmanager
+    def case_archive(self, download_dir: Path):
+        """
+        Send the documents saved while the block runs into the case's archive
+        
+        The archive (<out>/<case>.zip or .tar.zst, court_archive.py) takes the
+        place of download_dir. An existing archive is appended to, so a resumed
+        case only downloads what it does not hold yet. On exit the manifest is
+        added as the last member and the archive is closed.
+        """
+        archive_path = case_archive_path(download_dir, self.archive_format)
+        self.archive = CaseArchive.open(archive_path, self.archive_format)
+        self.log(f"Writing to archive {archive_path} ({len(self.archive.files())} documents already in it)")
+        try:
+            yield self.archive
+        finally:
+            archive, self.archive = self.archive, None
+            archive.close(self._manifest_text(archive.files(), "Archive", archive_path))
+    
+    def _filename_registry(self, download_dir: Optional[Path], persist: bool = True) -> FilenameRegistry:
+        """The case's FilenameRegistry; an archived case keeps it beside its archive"""
+        if self.archive_format and download_dir:
+            archive_path = case_archive_path(download_dir, self.archive_format)
+            return FilenameRegistry(archive_path.with_name(archive_path.name + FILENAME_MAP_FILENAME), persist)
+        return FilenameRegistry.for_case(download_dir, persist)
+    
+    def _select_documents(self, content, filenames: FilenameRegistry, document_filter: Optional[DocumentFilter],
+                          counts: Dict[str, int]) -> Iterator[DocumentInfo]:
+        """Yield the parsed documents that pass the filter, counting parsed and selected ones in `counts`"""
+        active = document_filter is not None and document_filter.active
+        for doc in self.iter_documents(content, filenames):
+            counts["documents"] += 1
+            if active and not document_filter.matches(doc):
+                continue
+            counts["selected"] += 1
+            yield doc
+    
+    def scrape_case(self, case_number: str, download_dir: Optional[Path] = None,
+                    document_filter: Optional[DocumentFilter] = None, list_only: Optional[bool] = None) -> Dict:
         """
         Complete process: navigate, parse, and download documents for a case
         
+        Args:
+            case_number: Case number like '25-CV-0880'
+            download_dir: Folder for the documents (None parses without downloading)
+            document_filter: Only download matching documents (default: the scraper's filter)
+            list_only: Return the selected documents as "listing" records (LISTING_FIELDS)
+                       instead of downloading them (default: the scraper's list_only)
+        
         Returns:
             Dictionary with results summary
         """
@@ -754,44 +1818,427 @@ startxref
             # Navigate and get HTML with cookies
             navigation_result = self.navigate_to_case(case_number)
             if not navigation_result:
-                return {"success": False, "error": "Navigation failed"}
+                return {"success": False, "error": "Navigation failed", "case_number": case_number}
             
             html_source, cookies = navigation_result
+            return self.process_case_page(case_number, html_source, cookies, download_dir,
+                                          document_filter, list_only)
             
-            # Parse documents (Phase between navigation and download)
-            self.report_progress(1, 1, "📄 Parsing document information from HTML", "parsing")
-            documents = self.parse_documents(html_source)
-            if not documents:
-                return {"success": True, "documents": 0, "downloaded": 0, "message": "No documents found"}
-            
-            # Download documents if directory specified
-            download_stats = {"successful": 0, "failed": 0, "skipped": 0, "secured": 0}
-            if download_dir:
-                download_stats = self.download_documents(documents, download_dir, cookies)
-                
-                # Create manifest if any files were processed
-                if download_stats["successful"] > 0 or download_stats["secured"] > 0:
-                    self.create_manifest(download_dir)
+        except Exception as e:
+            self.log(f"Scrape failed for case {case_number}: {str(e)}", "ERROR")
+            return {"success": False, "error": str(e), "case_number": case_number}
+        
+        finally:
+            self.close_driver()
+    
+    def scrape_case_iter(self, case_number: str, download_dir: Optional[Path] = None,
+                         document_filter: Optional[DocumentFilter] = None, list_only: Optional[bool] = None,
+                         max_pending: int = 64) -> Iterator[ScrapeEvent]:
+        """
+        Scrape a case like scrape_case, yielding typed events (court_events.py) as it goes
+        
+        Yields NavigationEvent, ParseEvent, DocumentStarted, DocumentBytes and
+        DocumentFinished events, then a CaseSummary with the scrape_case result.
+        The scrape runs on a background thread that hands events over through a
+        queue of at most max_pending events: a consumer that stops reading pauses
+        the scrape at its next event, and closing the generator early stops it.
+        
+        Args:
+            case_number, download_dir, document_filter, list_only: As for scrape_case
+            max_pending: Events that may wait for the consumer before the scrape pauses
+        """
+        events = queue.Queue(maxsize=max_pending)
+        cancelled = threading.Event()
+        finished = object()
+        
+        def deliver(item):
+            while not cancelled.is_set():
+                try:
+                    events.put(item, timeout=0.2)
+                    return
+                except queue.Full:
+                    continue
+            raise ScrapeCancelled()
+        
+        thread = threading.Thread(target=self._scrape_with_events, name=f"scrape-{case_number}", daemon=True,
+                                  args=(deliver, finished, case_number, download_dir, document_filter, list_only))
+        thread.start()
+        try:
+            while True:
+                item = events.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            cancelled.set()
+            thread.join()
+    
+    async def scrape_case_aiter(self, case_number: str, download_dir: Optional[Path] = None,
+                                document_filter: Optional[DocumentFilter] = None, list_only: Optional[bool] = None,
+                                max_pending: int = 64) -> AsyncIterator[ScrapeEvent]:
+        """
+        Async variant of scrape_case_iter for asyncio services
+        
+        The scrape runs in the event loop's default executor and its events go
+        through an asyncio.Queue of at most max_pending events, so the same
+        backpressure applies without blocking the event loop. Leaving the
+        `async for` early (or cancelling the task) stops the scrape.
+        """
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue(maxsize=max_pending)
+        cancelled = threading.Event()
+        finished = object()
+        
+        def deliver(item):
+            future = asyncio.run_coroutine_threadsafe(events.put(item), loop)
+            while True:
+                try:
+                    future.result(timeout=0.2)
+                    return
+                except concurrent.futures.TimeoutError:
+                    if cancelled.is_set():
+                        future.cancel()
+                        raise ScrapeCancelled() from None
+        
+        scrape = loop.run_in_executor(None, self._scrape_with_events, deliver, finished, case_number,
+                                      download_dir, document_filter, list_only)
+        try:
+            while True:
+                item = await events.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            cancelled.set()
+            await asyncio.shield(scrape)
+    
+    def _scrape_with_events(self, deliver: Callable, finished, case_number: str, download_dir: Optional[Path],
+                            document_filter: Optional[DocumentFilter], list_only: Optional[bool]):
+        """Run scrape_case with its events sent to deliver, then deliver its CaseSummary and `finished`"""
+        self.event_sink = deliver
+        self.event_case = case_number
+        try:
+            result = self.scrape_case(case_number, download_dir, document_filter, list_only)
+            deliver(CaseSummary(case_number, result=result))
+            deliver(finished)
+        except ScrapeCancelled:
+            self.log(f"Scrape of case {case_number} cancelled: its event consumer stopped", "WARNING")
+        finally:
+            self.event_sink = None
+            self.event_case = None
+    
+    def process_case_page(self, case_number: str, html_source, cookies: Optional[dict],
+                          download_dir: Optional[Path] = None, document_filter: Optional[DocumentFilter] = None,
+                          list_only: Optional[bool] = None) -> Dict:
+        """
+        Parse and download the documents of a case whose document page is already open
+        
+        The part of scrape_case after navigation; it needs no browser (unless the
+        session has to be renewed), so a pipeline can run it while the browser
+        navigates to the next case.
+        
+        Args:
+            case_number: Case number like '25-CV-0880'
+            html_source: Document page HTML or in-page rows, as returned by navigate_to_case
+            cookies: Portal session cookies from the navigation
+            download_dir, document_filter, list_only: As for scrape_case
+        
+        Returns:
+            Dictionary with results summary
+        """
+        # Parse documents (Phase between navigation and download); names already given
+        # to the case's documents by earlier runs are kept, listings store no new names
+        self.report_progress(1, 1, "📄 Parsing document information from HTML", "parsing")
+        listing = self.list_only if list_only is None else list_only
+        filenames = self._filename_registry(download_dir, persist=not listing)
+        document_filter = document_filter or self.document_filter
+        counts = {"documents": 0, "selected": 0}
+        selected = self._select_documents(html_source, filenames, document_filter, counts)
+        
+        # Downloads start while the docket is still being parsed, unless every document
+        # is needed first: for a listing, or to sort them into download priority order
+        priority = self.download_priority
+        if listing or not download_dir or (priority and priority.active):
+            selected = list(selected)
+        
+        # Download documents if directory specified
+        download_stats = {"successful": 0, "failed": 0, "skipped": 0, "secured": 0, "session_renewals": 0,
+                          "first_try": 0, "recovered": 0, "permanent_failures": [], "first_document_seconds": None}
+        if download_dir and not listing:
+            download_stats = self.download_documents(selected, download_dir, cookies,
+                                                     case_number=case_number)
             
+            # Create manifest if any files were processed (an archive got its own when it was closed)
+            if (download_stats["successful"] > 0 or download_stats["secured"] > 0) and not self.archive_format:
+                self.create_manifest(download_dir)
+        
+        if not counts["documents"]:
+            result = {"success": True, "documents": 0, "downloaded": 0, "message": "No documents found",
+                      "case_number": case_number}
+            if listing:
+                result.update(selected=0, listing=[])
+            return result
+        if document_filter and document_filter.active:
+            self.log(f"Filter selected {counts['selected']} of {counts['documents']} documents")
+        
+        if listing:
+            if self.head_sizes and selected:
+                self.fetch_document_sizes(selected, cookies)
             return {
                 "success": True,
-                "documents": len(documents),
-                "downloaded": download_stats["successful"],
-                "secured": download_stats["secured"], 
-                "failed": download_stats["failed"],
-                "skipped": download_stats["skipped"],
+                "documents": counts["documents"],
+                "selected": counts["selected"],
+                "listing": [document_record(doc) for doc in selected],
                 "case_number": case_number
             }
-            
-        except Exception as e:
-            self.log(f"Scrape failed for case {case_number}: {str(e)}", "ERROR")
-            return {"success": False, "error": str(e)}
         
-        finally:
-            self.close_driver()
+        result = self._case_result(case_number, counts, download_stats)
+        if self.archive_format and download_dir:
+            result["archive"] = str(case_archive_path(download_dir, self.archive_format))
+        return result
+    
+    @staticmethod
+    def _case_result(case_number: str, counts: Dict[str, int], download_stats: Dict) -> Dict:
+        """Result dict of a downloaded case from its document counts and download stats"""
+        return {
+            "success": True,
+            "documents": counts["documents"],
+            "selected": counts["selected"],
+            "downloaded": download_stats["successful"],
+            "secured": download_stats["secured"], 
+            "failed": download_stats["failed"],
+            "skipped": download_stats["skipped"],
+            "session_renewals": download_stats["session_renewals"],
+            "first_try": download_stats["first_try"],
+            "recovered": download_stats["recovered"],
+            "permanent_failures": download_stats["permanent_failures"],
+            "first_document_seconds": download_stats["first_document_seconds"],
+            "case_number": case_number
+        }
+    
+def expired_runs(outcomes: Iterable[Tuple[DocumentInfo, str]]) -> List[List[DocumentInfo]]:
+    """
+    Group documents into runs of consecutive 'expired' results, in the order given
+    
+    Skipped documents do not break a run, any other result does; this is how
+    download_documents sees runs while it downloads one document after another.
+    """
+    runs, run = [], []
+    for doc, result in outcomes:
+        if result == 'expired':
+            run.append(doc)
+        elif result != 'skipped' and run:
+            runs.append(run)
+            run = []
+    if run:
+        runs.append(run)
+    return runs
 
-def main():
-    """Main function for command line usage"""
+def document_record(doc: DocumentInfo) -> Dict:
+    """Listing record of a document (LISTING_FIELDS, filename is the planned download name)"""
+    return {field: getattr(doc, field) for field in LISTING_FIELDS}
+
+def case_download_dir(out_dir: Path, case_number: str) -> Path:
+    """Return the download directory for a case inside the output folder"""
+    return Path(out_dir) / case_number.replace('/', '_').replace('\\', '_')
+
+def load_case_numbers(cases_file: str) -> List[str]:
+    """
+    Read case numbers from a file, one per line ('-' reads stdin)
+    
+    Blank lines and lines starting with '#' are ignored, duplicates are dropped
+    while keeping the original order.
+    """
+    if cases_file == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(cases_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    
+    case_numbers = []
+    seen = set()
+    for line in lines:
+        case_number = line.strip()
+        if not case_number or case_number.startswith('#'):
+            continue
+        if case_number not in seen:
+            seen.add(case_number)
+            case_numbers.append(case_number)
+    return case_numbers
+
+def search_cases_filed(date_from: str, date_to: str, headless: bool = True, verbose: bool = False,
+                       scraper_options: Optional[Dict] = None) -> List[Dict]:
+    """
+    Enumerate the cases filed in a date range (see GalvestonCourtScraper.search_cases_by_date)
+    
+    Returns:
+        List of {"case_number", "url"} dicts
+    """
+    options = {key: value for key, value in (scraper_options or {}).items() if key != "case_detail_urls"}
+    scraper = GalvestonCourtScraper(headless=headless, verbose=verbose, **options)
+    try:
+        return scraper.search_cases_by_date(date_from, date_to)
+    finally:
+        scraper.close_driver()
+
+def run_cases(case_numbers: List[str], out_dir: Path, workers: int = 1, rate: float = 1.0,
+              headless: bool = True, verbose: bool = False, on_result=None, journal=None,
+              scraper_options: Optional[Dict] = None) -> List[Dict]:
+    """
+    Scrape several cases, each with its own scraper and browser
+    
+    Args:
+        case_numbers: Case numbers to process
+        out_dir: Folder that receives one sub-folder per case
+        workers: Number of cases processed at the same time
+        rate: Document requests per second for each case (0 = no delay)
+        headless: Run the browsers without a window
+        verbose: Print detailed scraper logs
+        on_result: Optional callable invoked with each result dict as its case finishes
+        journal: Optional BatchJournal; cases it lists as finished are not navigated again
+        scraper_options: Extra GalvestonCourtScraper keyword arguments (e.g. lean=True)
+        
+    Returns:
+        List of result dicts in completion order
+    """
+    # Cases share the process-wide download pool, size it for all workers
+    scraper_options = dict(scraper_options or {})
+    scraper_options.setdefault("http_pool_size", DEFAULT_DOWNLOAD_CONCURRENCY * max(1, workers))
+    if isinstance(scraper_options.get("deep_link_cache"), (str, Path)):
+        # One cache for every case of the batch instead of re-reading its file per case
+        from court_deeplinks import shared_deep_link_cache
+        scraper_options["deep_link_cache"] = shared_deep_link_cache(scraper_options["deep_link_cache"])
+    
+    def process(case_number: str) -> Dict:
+        download_dir = case_download_dir(out_dir, case_number)
+        scraper = GalvestonCourtScraper(headless=headless, verbose=verbose, request_rate=rate,
+                                        journal=journal, **scraper_options)
+        try:
+            result = scraper.scrape_case(case_number, download_dir)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        result.setdefault("case_number", case_number)
+        result["download_dir"] = str(download_dir)
+        if journal:
+            journal.record_case(case_number, result)
+        return result
+    
+    results = []
+    if journal:
+        for case_number in [case for case in case_numbers if journal.is_case_done(case)]:
+            result = dict(journal.case_result(case_number), resumed=True)
+            results.append(result)
+            if on_result:
+                on_result(result)
+        case_numbers = [case for case in case_numbers if not journal.is_case_done(case)]
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(process, case_number) for case_number in case_numbers]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser"""
+    parser = argparse.ArgumentParser(
+        description="Download Galveston County court documents for one or more cases.",
+        epilog="Run without --case, --cases-file or --filed-from for interactive mode."
+    )
+    parser.add_argument("--case", action="append", default=[], metavar="CASE_NUMBER",
+                        help="Case number to download (repeatable), e.g. 25-CV-0880")
+    parser.add_argument("--cases-file", metavar="PATH",
+                        help="File with one case number per line ('-' reads stdin)")
+    parser.add_argument("--filed-from", metavar="MM/DD/YYYY",
+                        help="Also download every case filed from this date (Date Filed search, needs --filed-to)")
+    parser.add_argument("--filed-to", metavar="MM/DD/YYYY",
+                        help="Last filing date (inclusive) of the Date Filed search")
+    parser.add_argument("--docs-from", metavar="MM/DD/YYYY",
+                        help="Only download documents dated on or after this date")
+    parser.add_argument("--docs-to", metavar="MM/DD/YYYY",
+                        help="Only download documents dated on or before this date")
+    parser.add_argument("--include", metavar="REGEX",
+                        help="Only download documents whose type or name matches (case-insensitive)")
+    parser.add_argument("--exclude", metavar="REGEX",
+                        help="Skip documents whose type or name matches (case-insensitive)")
+    parser.add_argument("--fragment-id", action="append", default=[], metavar="ID",
+                        help="Only download this DocumentFragmentID (repeatable)")
+    parser.add_argument("--priority", choices=DOWNLOAD_ORDERS, default="docket",
+                        help="Download order within a case: docket (default), newest first or smallest first")
+    parser.add_argument("--priority-type", action="append", default=[], metavar="REGEX",
+                        help="Download documents whose type or name matches first (repeatable, in priority order)")
+    parser.add_argument("--out", default="downloads", metavar="DIR",
+                        help="Output folder, one sub-folder per case (default: downloads)")
+    parser.add_argument("--archive", choices=ARCHIVE_FORMATS,
+                        help="Write each case into <out>/<case>.zip or .tar.zst instead of a sub-folder")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of cases processed concurrently (default: 1)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Shard cases across this many worker processes, each with its own browser (default: 1)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="One browser navigates the next case while --workers threads download the current ones")
+    parser.add_argument("--pipeline-queue", type=int, default=2, metavar="N",
+                        help="With --pipeline, navigated cases that may wait for a download thread (default: 2)")
+    parser.add_argument("--async", dest="async_engine", action="store_true",
+                        help="Download on one asyncio event loop; --workers browsers navigate at the same time")
+    parser.add_argument("--async-backend", choices=["httpx", "aiohttp"], default="httpx",
+                        help="With --async, the async download client (default: httpx)")
+    parser.add_argument("--max-in-flight", type=int, default=100, metavar="N",
+                        help="With --async, document requests in flight across all cases (default: 100)")
+    parser.add_argument("--max-downloads", type=int, metavar="N",
+                        help="Document requests running at once across all cases of a process, shared fairly")
+    parser.add_argument("--max-bandwidth", type=float, metavar="KB_PER_SEC",
+                        help="Document download bandwidth cap per process, in KB per second")
+    parser.add_argument("--max-queued", type=int, metavar="N",
+                        help="Waiting document requests per process before low-priority ones are deferred")
+    parser.add_argument("--urgent", action="append", default=[], metavar="CASE_NUMBER",
+                        help="Give this case's downloads priority over the others (repeatable, added to the batch)")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="Document requests per second per case, 0 for no delay (default: 1.0)")
+    parser.add_argument("--headless", dest="headless", action="store_true", default=True,
+                        help="Run the browser without a window (default)")
+    parser.add_argument("--no-headless", dest="headless", action="store_false",
+                        help="Show the browser window")
+    parser.add_argument("--lean", action="store_true",
+                        help="Lean browser profile: eager page loads, no images, CSS, fonts or third-party hosts")
+    parser.add_argument("--wait-strategy", choices=["element", "observer"], default="element",
+                        help="Navigation waits: poll specific elements or use an in-page MutationObserver")
+    parser.add_argument("--extract", dest="extract_mode", choices=["html", "json"], default="html",
+                        help="Document table extraction: transfer page HTML or extract rows in-page as JSON")
+    parser.add_argument("--http-backend", choices=["requests", "httpx"], default="requests",
+                        help="Document download client: requests (HTTP/1.1) or httpx (HTTP/2, needs httpx[http2])")
+    parser.add_argument("--connect-timeout", type=float, default=10.0,
+                        help="Seconds to connect for a document request (default: 10)")
+    parser.add_argument("--read-timeout", type=float, default=30.0,
+                        help="Seconds to wait for document data (default: 30)")
+    parser.add_argument("--max-retries", type=int, default=2,
+                        help="Retries per document request and case navigation (default: 2)")
+    parser.add_argument("--retry-delay", type=float, default=1.0,
+                        help="Base seconds of the exponential retry backoff (default: 1.0)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted batch from its journal, skipping finished cases and documents")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="Batch journal file (default: <out>/.batch_journal.jsonl)")
+    parser.add_argument("--deep-link-cache", metavar="PATH",
+                        help="Cache of case document page URLs (default: <out>/.deep_links.jsonl)")
+    parser.add_argument("--no-deep-links", action="store_true",
+                        help="Always run the full 7-step navigation, ignoring the deep-link cache")
+    parser.add_argument("--list", dest="list_only", action="store_true",
+                        help="Print each case's document list instead of downloading (nothing is written to --out)")
+    parser.add_argument("--list-format", choices=["json", "csv"], default="json",
+                        help="--list output: one JSON line per case or CSV rows per document (default: json)")
+    parser.add_argument("--head-sizes", action="store_true",
+                        help="With --list, fill in document sizes with HEAD requests")
+    parser.add_argument("--json", action="store_true",
+                        help="Print one JSON result line per case as it finishes")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Print detailed progress logs")
+    return parser
+
+def interactive_main():
+    """Prompt for a single case number and download it"""
     print("Galveston County Court Document Scraper")
     print("=" * 50)
     
@@ -800,20 +2247,20 @@ def main():
     
     if not case_number:
         print("Error: Case number is required")
-        return 1
+        return EXIT_USAGE
     
     # Validate case number format
-    if not re.match(r'^\d{2}-[A-Z]{2,3}-\d{3,5}$', case_number):
+    if not CASE_NUMBER_PATTERN.match(case_number):
         print(f"Warning: Case number '{case_number}' doesn't match expected format")
         confirm = input("Continue anyway? (y/n): ").strip().lower()
         if confirm != 'y':
-            return 1
+            return EXIT_USAGE
     
     # Ask about browser visibility
     show_browser = input("Show browser window? (y/n): ").strip().lower() == 'y'
     
     # Setup download directory
-    download_dir = Path("downloads") / case_number.replace('/', '_').replace('\\', '_')
+    download_dir = case_download_dir(Path("downloads"), case_number)
     
     print(f"\nProcessing case: {case_number}")
     print(f"Download directory: {download_dir}")
@@ -835,11 +2282,239 @@ def main():
             print(f"  {result.get('message', 'No documents available')}")
     else:
         print(f"\n✗ Failed: {result['error']}")
-        return 1
+        return EXIT_CASE_FAILED
     
     input("\nPress Enter to exit...")
-    return 0
+    return EXIT_OK
+
+def print_result(result: Dict, as_json: bool = False):
+    """Print one case result as a JSON line or a short status line"""
+    if as_json:
+        print(json.dumps(result, sort_keys=True), flush=True)
+    elif result.get("success"):
+        print(f"✓ {result['case_number']}: {result.get('documents', 0)} documents, "
+              f"{result.get('downloaded', 0)} downloaded, {result.get('secured', 0)} secured, "
+              f"{result.get('failed', 0)} failed, {result.get('skipped', 0)} skipped", flush=True)
+    else:
+        print(f"✗ {result['case_number']}: {result.get('error', 'Unknown error')}", flush=True)
+
+def print_pipeline_stats(stats: Dict):
+    """Print how busy the two --pipeline stages were (to stderr, beside the results)"""
+    print(f"Pipeline: {stats['cases']} cases in {stats['wall_seconds']:.1f}s, "
+          f"navigation {stats['navigation_utilization']:.0%} busy "
+          f"({stats['navigation_blocked_seconds']:.1f}s waiting for downloads), "
+          f"downloads {stats['download_utilization']:.0%} busy "
+          f"({stats['download_idle_seconds']:.1f}s waiting for pages)", file=sys.stderr)
+
+class ListingPrinter:
+    """Print --list results: one JSON line per case or CSV rows with a single header"""
+    
+    def __init__(self, output_format: str = "json", stream=None):
+        self.output_format = output_format
+        self.stream = stream or sys.stdout
+        self.writer = None
+    
+    def __call__(self, result: Dict):
+        if self.output_format == "json":
+            record = {key: result[key] for key in ("case_number", "success", "documents", "selected",
+                                                   "listing", "error") if key in result}
+            print(json.dumps(record, sort_keys=True), file=self.stream, flush=True)
+        elif not result.get("success"):
+            # Failed cases have no rows, report them beside the CSV
+            print(f"✗ {result['case_number']}: {result.get('error', 'Unknown error')}", file=sys.stderr)
+        else:
+            if self.writer is None:
+                self.writer = csv.DictWriter(self.stream, fieldnames=("case_number",) + LISTING_FIELDS)
+                self.writer.writeheader()
+            for record in result.get("listing", []):
+                self.writer.writerow(dict(record, case_number=result["case_number"]))
+            self.stream.flush()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for command line usage"""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    
+    if bool(args.filed_from) != bool(args.filed_to):
+        parser.error("--filed-from and --filed-to must be used together")
+    for value in (args.filed_from, args.filed_to):
+        if value:
+            try:
+                datetime.strptime(value, "%m/%d/%Y")
+            except ValueError:
+                parser.error(f"invalid date '{value}', expected MM/DD/YYYY")
+    
+    if not args.case and not args.cases_file and not args.filed_from and not args.urgent:
+        if sys.stdin.isatty():
+            return interactive_main()
+        parser.error("--case, --cases-file or --filed-from is required when stdin is not a terminal")
+    
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if args.pipeline and args.processes > 1:
+        parser.error("--pipeline cannot be combined with --processes")
+    if args.pipeline_queue < 1:
+        parser.error("--pipeline-queue must be at least 1")
+    if args.async_engine and (args.pipeline or args.processes > 1):
+        parser.error("--async cannot be combined with --pipeline or --processes")
+    if args.max_in_flight < 1:
+        parser.error("--max-in-flight must be at least 1")
+    if args.async_engine:
+        try:
+            __import__(args.async_backend)
+        except ImportError:
+            parser.error(f"--async-backend {args.async_backend} needs {args.async_backend}: "
+                         f"pip install {args.async_backend}")
+    if args.rate < 0:
+        parser.error("--rate cannot be negative")
+    if (args.max_downloads is not None and args.max_downloads < 1) or \
+            (args.max_queued is not None and args.max_queued < 1):
+        parser.error("--max-downloads and --max-queued must be at least 1")
+    if args.max_bandwidth is not None and args.max_bandwidth <= 0:
+        parser.error("--max-bandwidth must be positive")
+    try:
+        document_filter = DocumentFilter(date_from=args.docs_from, date_to=args.docs_to, include=args.include,
+                                         exclude=args.exclude, fragment_ids=args.fragment_id or None)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        download_priority = DownloadPriority(order=args.priority, types=args.priority_type or None)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.max_retries < 0 or args.retry_delay < 0:
+        parser.error("--max-retries and --retry-delay cannot be negative")
+    if args.head_sizes and not args.list_only:
+        parser.error("--head-sizes requires --list")
+    if args.list_only and args.resume:
+        parser.error("--resume cannot be used with --list")
+    if args.connect_timeout <= 0 or args.read_timeout <= 0:
+        parser.error("--connect-timeout and --read-timeout must be positive")
+    if args.archive == "tar.zst":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            parser.error("--archive tar.zst needs zstandard: pip install zstandard")
+    if args.http_backend == "httpx":
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            parser.error('--http-backend httpx needs httpx: pip install "httpx[http2]"')
+    
+    urgent_cases = [case.strip() for case in args.urgent if case.strip()]
+    case_numbers = list(dict.fromkeys(urgent_cases + [case.strip() for case in args.case if case.strip()]))
+    if args.cases_file:
+        try:
+            for case_number in load_case_numbers(args.cases_file):
+                if case_number not in case_numbers:
+                    case_numbers.append(case_number)
+        except OSError as e:
+            print(f"Error: cannot read cases file: {e}", file=sys.stderr)
+            return EXIT_USAGE
+    
+    scraper_options = {"lean": args.lean, "wait_strategy": args.wait_strategy,
+                       "extract_mode": args.extract_mode, "http_backend": args.http_backend,
+                       "connect_timeout": args.connect_timeout, "read_timeout": args.read_timeout,
+                       "retry_policy": RetryPolicy(max_attempts=args.max_retries + 1, base_delay=args.retry_delay)}
+    if document_filter.active:
+        scraper_options["document_filter"] = document_filter
+    if download_priority.active:
+        scraper_options["download_priority"] = download_priority
+    if args.max_downloads or args.max_bandwidth or args.max_queued or urgent_cases:
+        scraper_options.update(download_slots=args.max_downloads, download_queue_limit=args.max_queued,
+                               download_bandwidth=args.max_bandwidth * 1024 if args.max_bandwidth else None,
+                               case_priorities={case: 1 for case in urgent_cases})
+    if args.archive:
+        scraper_options["archive_format"] = args.archive
+    if args.list_only:
+        scraper_options.update(list_only=True, head_sizes=args.head_sizes)
+    # Listings and JSON results go to stdout, keep the scraper logs out of them
+    machine_output = args.json or args.list_only
+    
+    if args.filed_from:
+        try:
+            found = search_cases_filed(args.filed_from, args.filed_to, headless=args.headless,
+                                       verbose=args.verbose and not machine_output,
+                                       scraper_options=scraper_options)
+        except KeyboardInterrupt:
+            print("Interrupted", file=sys.stderr)
+            return EXIT_INTERRUPTED
+        except Exception as e:
+            print(f"Error: Date Filed search failed: {e}", file=sys.stderr)
+            return EXIT_CASE_FAILED
+        print(f"Found {len(found)} cases filed {args.filed_from} - {args.filed_to}", file=sys.stderr)
+        for case in found:
+            if case["case_number"] not in case_numbers:
+                case_numbers.append(case["case_number"])
+        # Found cases open their detail page directly instead of searching again
+        scraper_options["case_detail_urls"] = {case["case_number"]: case["url"] for case in found}
+    
+    if not case_numbers:
+        if args.filed_from:
+            # An empty date range is a valid answer, not a usage error
+            return EXIT_OK
+        print("Error: no case numbers to process", file=sys.stderr)
+        return EXIT_USAGE
+    
+    for case_number in case_numbers:
+        if not CASE_NUMBER_PATTERN.match(case_number):
+            print(f"Warning: Case number '{case_number}' doesn't match expected format", file=sys.stderr)
+    
+    from court_journal import BatchJournal, JOURNAL_FILENAME
+    journal_path = Path(args.journal) if args.journal else Path(args.out) / JOURNAL_FILENAME
+    # A listing downloads nothing, so it must not mark cases done in (or truncate) the journal
+    journal = None if args.list_only else BatchJournal(journal_path, resume=args.resume)
+    
+    if not args.no_deep_links:
+        from court_deeplinks import DEEP_LINK_FILENAME
+        # Passed as a path so every worker process opens the shared cache file itself
+        scraper_options["deep_link_cache"] = str(Path(args.deep_link_cache) if args.deep_link_cache
+                                                 else Path(args.out) / DEEP_LINK_FILENAME)
+    
+    if args.list_only:
+        on_result = ListingPrinter(args.list_format)
+    else:
+        on_result = lambda result: print_result(result, args.json)
+    
+    runner = run_cases
+    options = {"workers": args.workers}
+    if args.processes > 1:
+        from court_batch import run_sharded
+        runner = run_sharded
+        options = {"processes": args.processes}
+    elif args.pipeline:
+        from court_batch import run_pipelined
+        runner = run_pipelined
+        options = {"download_workers": args.workers, "queue_size": args.pipeline_queue,
+                   "on_stats": print_pipeline_stats}
+    elif args.async_engine:
+        from court_async import run_async
+        runner = run_async
+        options = {"browsers": args.workers, "max_in_flight": args.max_in_flight,
+                   "async_backend": args.async_backend}
+    
+    try:
+        results = runner(
+            case_numbers,
+            Path(args.out),
+            rate=args.rate,
+            headless=args.headless,
+            verbose=args.verbose and not machine_output,
+            on_result=on_result,
+            journal=journal,
+            scraper_options=scraper_options,
+            **options
+        )
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    
+    failed = sum(1 for result in results if not result.get("success"))
+    if not machine_output:
+        print(f"\nProcessed {len(results)} cases: {len(results) - failed} succeeded, {failed} failed")
+    return EXIT_CASE_FAILED if failed else EXIT_OK
 
 if __name__ == "__main__":
-    import sys
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -11,7 +11,7 @@ import queue
 import os
 import webbrowser
 from pathlib import Path
-from court_scraper import GalvestonCourtScraper
+from court_scraper import GalvestonCourtScraper, DocumentFilter
 
 class CourtScraperGUI:
     def __init__(self, root):
@@ -27,7 +27,7 @@ class CourtScraperGUI:
     def setup_window(self):
         """Setup main window"""
         self.root.title("Galveston County Court Document Downloader")
-        self.root.geometry("800x650")
+        self.root.geometry("800x760")
         self.root.resizable(True, True)
         
         # Set window icon and styling
@@ -36,14 +36,19 @@ class CourtScraperGUI:
         # Center window
         self.root.update_idletasks()
         x = (self.root.winfo_screenwidth() // 2) - (800 // 2)
-        y = (self.root.winfo_screenheight() // 2) - (650 // 2)
-        self.root.geometry(f"800x650+{x}+{y}")
+        y = (self.root.winfo_screenheight() // 2) - (760 // 2)
+        self.root.geometry(f"800x760+{x}+{y}")
         
     def setup_variables(self):
         """Setup tkinter variables"""
         self.case_number = tk.StringVar(value="25-CV-0880")
         self.download_folder = tk.StringVar(value=str(Path.cwd() / "downloads"))
         self.show_browser = tk.BooleanVar(value=False)  # Always headless
+        self.filter_date_from = tk.StringVar(value="")
+        self.filter_date_to = tk.StringVar(value="")
+        self.filter_include = tk.StringVar(value="")
+        self.filter_exclude = tk.StringVar(value="")
+        self.filter_fragments = tk.StringVar(value="")
         self.is_running = tk.BooleanVar(value=False)
         
     def setup_styles(self):
@@ -175,10 +180,36 @@ class CourtScraperGUI:
         browse_button.pack(side='right')
         
     def setup_options_section(self, parent):
-        """Setup options section - simplified"""
-        # Options section removed for simplicity
+        """Setup optional document filters"""
         # Browser always runs hidden for better user experience
-        pass
+        options_frame = ttk.LabelFrame(parent, text="Document Filters (optional)", padding=20)
+        options_frame.pack(fill='x', pady=(0, 20))
+        
+        fields = [
+            ("From (MM/DD/YYYY):", self.filter_date_from, 12),
+            ("To:", self.filter_date_to, 12),
+            ("Include types:", self.filter_include, 16),
+            ("Exclude types:", self.filter_exclude, 16)
+        ]
+        date_row = ttk.Frame(options_frame)
+        date_row.pack(fill='x', pady=(0, 10))
+        for label, variable, width in fields:
+            ttk.Label(date_row, text=label).pack(side='left')
+            ttk.Entry(date_row, textvariable=variable, width=width).pack(side='left', padx=(5, 15))
+        
+        fragment_row = ttk.Frame(options_frame)
+        fragment_row.pack(fill='x')
+        ttk.Label(fragment_row, text="Fragment IDs (comma-separated):").pack(side='left')
+        ttk.Entry(fragment_row, textvariable=self.filter_fragments).pack(side='left', padx=(5, 0), fill='x', expand=True)
+    
+    def build_document_filter(self):
+        """Create a DocumentFilter from the filter fields (raises ValueError on bad input)"""
+        fragments = [fragment.strip() for fragment in self.filter_fragments.get().split(',') if fragment.strip()]
+        return DocumentFilter(date_from=self.filter_date_from.get().strip() or None,
+                              date_to=self.filter_date_to.get().strip() or None,
+                              include=self.filter_include.get().strip() or None,
+                              exclude=self.filter_exclude.get().strip() or None,
+                              fragment_ids=fragments or None)
         
     def setup_action_section(self, parent):
         """Setup action buttons"""
@@ -299,6 +330,12 @@ class CourtScraperGUI:
             messagebox.showerror("Error", "Download folder path is invalid")
             return
             
+        try:
+            document_filter = self.build_document_filter()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+            
         # Update UI for running state
         self.is_running.set(True)
         self.download_button.configure(state='disabled')
@@ -312,12 +349,12 @@ class CourtScraperGUI:
         # Start download in separate thread
         self.download_thread = threading.Thread(
             target=self.download_documents,
-            args=(case_num, download_dir),
+            args=(case_num, download_dir, document_filter),
             daemon=True
         )
         self.download_thread.start()
         
-    def download_documents(self, case_number, download_dir):
+    def download_documents(self, case_number, download_dir, document_filter=None):
         """Download documents in background thread"""
         try:
             # Create case-specific download directory
@@ -333,7 +370,7 @@ class CourtScraperGUI:
             )
             
             # Run scraper
-            result = self.scraper.scrape_case(case_number, case_dir)
+            result = self.scraper.scrape_case(case_number, case_dir, document_filter)
             
             if result["success"]:
                 # Success - show results
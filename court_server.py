@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Galveston County Court Document Scraper - Job API Server
+Local HTTP API that queues case jobs for a pool of scraper threads and streams
+their progress as Server-Sent Events
+
+Other services submit case numbers, follow each job's typed events
+(court_events.py) over SSE and fetch the result dict of scrape_case. Admission
+control keeps the service responsive under load: the queue holds at most
+max_queued jobs and each client at most max_jobs_per_client active jobs, and
+submissions beyond that are refused with 429 and a Retry-After estimate.
+
+Usage:
+    python court_server.py --out downloads --port 8770 --workers 2
+
+API:
+    POST   /jobs              {"case_numbers": [...]} -> 202 {"jobs": [...]}, 429 when full
+    GET    /jobs              every job (without results)
+    GET    /jobs/<id>         one job with its result
+    GET    /jobs/<id>/events  Server-Sent Events until the job ends (Last-Event-ID resumes)
+    DELETE /jobs/<id>         cancel a queued or running job
+    GET    /status            job counts and limits
+"""
+
+import sys
+import json
+import time
+import queue
+import argparse
+import itertools
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from court_events import CaseSummary
+from court_scraper import GalvestonCourtScraper, case_download_dir
+from court_deeplinks import DEEP_LINK_FILENAME, shared_deep_link_cache
+
+DEFAULT_PORT = 8770
+DEFAULT_MAX_QUEUED = 100
+DEFAULT_MAX_JOBS_PER_CLIENT = 20
+
+# Seconds between SSE keep-alive comments while a job is quiet
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+class AdmissionRejected(Exception):
+    """A submission was refused; retry_after is the suggested wait in seconds (None: do not retry)"""
+
+    def __init__(self, message: str, status_code: int = 429, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class ScrapeJob:
+    """One submitted case and the events its scrape produced so far"""
+
+    def __init__(self, job_id: str, case_number: str, client: str):
+        self.id = job_id
+        self.case_number = case_number
+        self.client = client
+        self.status = QUEUED
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.cancel_requested = False
+        # (sequence, event dict); the oldest are dropped beyond max_events
+        self.events: deque = deque()
+        self.next_sequence = 0
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        job = {"id": self.id, "case_number": self.case_number, "client": self.client, "status": self.status,
+               "created": self.created, "started": self.started, "finished": self.finished,
+               "events": self.next_sequence}
+        if include_result:
+            job["result"] = self.result
+        return job
+
+class JobManager:
+    """
+    In-memory job queue served by a pool of scraper threads
+
+    Each worker thread runs one job at a time with scrape_case_iter and a new
+    scraper (so a browser per worker at most). Submitting a case that already
+    has a queued or running job returns that job instead of a second one.
+    Finished jobs are kept for inspection, the oldest dropped beyond
+    max_finished.
+    """
+
+    def __init__(self, out_dir: Path, workers: int = 2, max_queued: int = DEFAULT_MAX_QUEUED,
+                 max_jobs_per_client: Optional[int] = DEFAULT_MAX_JOBS_PER_CLIENT, max_events: int = 1000,
+                 max_finished: int = 1000, scraper_class=GalvestonCourtScraper,
+                 scraper_options: Optional[Dict] = None):
+        self.out_dir = Path(out_dir)
+        self.max_queued = max_queued
+        self.max_jobs_per_client = max_jobs_per_client
+        self.max_events = max_events
+        self.max_finished = max_finished
+        self.scraper_class = scraper_class
+        self.scraper_options = dict(scraper_options or {})
+        self.condition = threading.Condition()
+        self.jobs: Dict[str, ScrapeJob] = {}
+        self.finished_ids: deque = deque()
+        self.pending: "queue.Queue[Optional[ScrapeJob]]" = queue.Queue()
+        self.ids = itertools.count(1)
+        self.durations: deque = deque(maxlen=20)
+        self.closing = False
+        self.workers = [threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+                        for n in range(max(1, workers))]
+        for worker in self.workers:
+            worker.start()
+
+    def _count(self, status: str, client: Optional[str] = None) -> int:
+        return sum(1 for job in self.jobs.values()
+                   if job.status == status and (client is None or job.client == client))
+
+    def _retry_after(self) -> int:
+        """Estimated seconds until a queue slot frees up: the average job time per worker"""
+        if not self.durations:
+            return 30
+        return max(1, round(sum(self.durations) / len(self.durations) / len(self.workers)))
+
+    def submit(self, case_numbers: List[str], client: str = "local") -> List[ScrapeJob]:
+        """
+        Queue jobs for case numbers, all or none
+
+        Returns:
+            One job per case number; cases already queued or running return their job
+
+        Raises:
+            AdmissionRejected: The server is shutting down (503), or the queue or the
+                client's active job limit has no room for the new jobs (429)
+        """
+        with self.condition:
+            if self.closing:
+                raise AdmissionRejected("Server is shutting down", 503)
+            active = {job.case_number: job for job in self.jobs.values() if job.status in (QUEUED, RUNNING)}
+            new_cases = [case for case in dict.fromkeys(case_numbers) if case not in active]
+            queued = self._count(QUEUED)
+            if queued + len(new_cases) > self.max_queued:
+                raise AdmissionRejected(f"Queue full: {queued} of {self.max_queued} jobs queued, "
+                                        f"{len(new_cases)} more requested", retry_after=self._retry_after())
+            if self.max_jobs_per_client is not None:
+                client_active = self._count(QUEUED, client) + self._count(RUNNING, client)
+                if client_active + len(new_cases) > self.max_jobs_per_client:
+                    raise AdmissionRejected(f"Client {client} has {client_active} active jobs, limit "
+                                            f"{self.max_jobs_per_client}", retry_after=self._retry_after())
+            for case_number in new_cases:
+                job = ScrapeJob(str(next(self.ids)), case_number, client)
+                self.jobs[job.id] = job
+                active[case_number] = job
+                self._publish(job, {"kind": "status", "status": QUEUED})
+                self.pending.put(job)
+            return [active[case_number] for case_number in case_numbers]
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self.condition:
+            return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict]:
+        with self.condition:
+            return [job.to_dict(include_result=False) for job in self.jobs.values()]
+
+    def cancel(self, job_id: str) -> Optional[ScrapeJob]:
+        """Cancel a job: a queued job at once, a running one at its next event"""
+        with self.condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            job.cancel_requested = True
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED, {"success": False, "error": "Cancelled",
+                                              "case_number": job.case_number})
+            return job
+
+    def status(self) -> Dict:
+        with self.condition:
+            counts = {state: self._count(state) for state in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}
+            return {"counts": counts, "workers": len(self.workers), "max_queued": self.max_queued,
+                    "max_jobs_per_client": self.max_jobs_per_client, "closing": self.closing}
+
+    def wait_events(self, job: ScrapeJob, after: int, timeout: float) -> Tuple[List[Tuple[int, Dict]], bool]:
+        """
+        Wait up to timeout seconds for events of a job with a sequence above `after`
+
+        Returns:
+            (events, finished): the (sequence, event) pairs available, and whether
+            the job has ended (no events will follow the returned ones)
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                events = [(sequence, event) for sequence, event in job.events if sequence > after]
+                finished = job.status in FINISHED_STATES
+                remaining = deadline - time.monotonic()
+                if events or finished or remaining <= 0:
+                    return events, finished
+                self.condition.wait(remaining)
+
+    def close(self, timeout: Optional[float] = None):
+        """Refuse new jobs, cancel the queued ones and let running jobs finish"""
+        with self.condition:
+            self.closing = True
+            for job in list(self.jobs.values()):
+                if job.status == QUEUED:
+                    self._finish(job, CANCELLED, {"success": False, "error": "Server shut down",
+                                                  "case_number": job.case_number})
+        for _ in self.workers:
+            self.pending.put(None)
+        for worker in self.workers:
+            worker.join(timeout)
+
+    def _publish(self, job: ScrapeJob, event: Dict):
+        # Callers hold self.condition
+        job.events.append((job.next_sequence, event))
+        job.next_sequence += 1
+        if len(job.events) > self.max_events:
+            job.events.popleft()
+        self.condition.notify_all()
+
+    def _finish(self, job: ScrapeJob, status: str, result: Dict):
+        # Callers hold self.condition
+        job.status = status
+        job.result = result
+        job.finished = time.time()
+        self._publish(job, {"kind": "status", "status": status})
+        self.finished_ids.append(job.id)
+        while len(self.finished_ids) > self.max_finished:
+            self.jobs.pop(self.finished_ids.popleft(), None)
+
+    def _work(self):
+        while True:
+            job = self.pending.get()
+            if job is None:
+                return
+            with self.condition:
+                if job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started = time.time()
+                self._publish(job, {"kind": "status", "status": RUNNING})
+            self._run(job)
+
+    def _run(self, job: ScrapeJob):
+        download_dir = case_download_dir(self.out_dir, job.case_number)
+        result = None
+        try:
+            scraper = self.scraper_class(**self.scraper_options)
+            events = scraper.scrape_case_iter(job.case_number, download_dir)
+            try:
+                for event in events:
+                    if isinstance(event, CaseSummary):
+                        result = event.result
+                    with self.condition:
+                        self._publish(job, event.to_dict())
+                        if job.cancel_requested:
+                            break
+            finally:
+                # Stops the scrape if the job was cancelled
+                events.close()
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        with self.condition:
+            if result is None:
+                status, result = CANCELLED, {"success": False, "error": "Cancelled"}
+            else:
+                status = DONE if result.get("success") else FAILED
+            result = dict(result, case_number=job.case_number, download_dir=str(download_dir))
+            self.durations.append(time.time() - job.started)
+            self._finish(job, status, result)
+
+class JobApiHandler(BaseHTTPRequestHandler):
+    """JSON and Server-Sent Events API of the job server"""
+
+    server_version = "GalvestonJobServer/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status_code: int, payload: Optional[Dict] = None, headers: Optional[Dict] = None):
+        body = json.dumps(payload if payload is not None else {}).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object")
+        return payload
+
+    def _client(self) -> str:
+        """Client identity for the per-client limit: the X-Client-Id header, else the peer address"""
+        return self.headers.get("X-Client-Id") or self.client_address[0]
+
+    def _route(self) -> Tuple[Optional[str], Optional[str]]:
+        """(job id, sub-resource) of a /jobs/<id>[/<sub>] path"""
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if len(parts) < 2 or parts[0] != "jobs" or len(parts) > 3:
+            return None, None
+        return parts[1], parts[2] if len(parts) == 3 else None
+
+    def do_GET(self):
+        manager = self.server.manager
+        path = self.path.split("?")[0]
+        if path == "/status":
+            self._send_json(200, manager.status())
+            return
+        if path == "/jobs":
+            self._send_json(200, {"jobs": manager.list_jobs()})
+            return
+
+        job_id, sub = self._route()
+        job = manager.get(job_id) if job_id else None
+        if job is None or sub not in (None, "events"):
+            self._send_json(404, {"error": "Not found"})
+        elif sub == "events":
+            self._stream_events(job)
+        else:
+            with manager.condition:
+                payload = job.to_dict()
+            self._send_json(200, payload)
+
+    def do_POST(self):
+        if self.path.split("?")[0] != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            payload = self._read_json()
+        except ValueError:
+            self._send_json(400, {"error": "Invalid JSON body"})
+            return
+
+        case_numbers = payload.get("case_numbers")
+        if case_numbers is None and payload.get("case_number"):
+            case_numbers = [payload["case_number"]]
+        if not isinstance(case_numbers, list) or not all(isinstance(case, str) for case in case_numbers):
+            self._send_json(400, {"error": "Expected case_number or a case_numbers list"})
+            return
+        case_numbers = [case.strip() for case in case_numbers if case.strip()]
+        if not case_numbers:
+            self._send_json(400, {"error": "No case numbers"})
+            return
+
+        try:
+            jobs = self.server.manager.submit(case_numbers, self._client())
+        except AdmissionRejected as e:
+            headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
+            self._send_json(e.status_code, {"error": str(e)}, headers)
+            return
+        with self.server.manager.condition:
+            payload = {"jobs": [job.to_dict(include_result=False) for job in jobs]}
+        self._send_json(202, payload)
+
+    def do_DELETE(self):
+        job_id, sub = self._route()
+        job = self.server.manager.cancel(job_id) if job_id and sub is None else None
+        if job is None:
+            self._send_json(404, {"error": "Not found"})
+            return
+        with self.server.manager.condition:
+            payload = job.to_dict(include_result=False)
+        self._send_json(200, payload)
+
+    def _stream_events(self, job: ScrapeJob):
+        """
+        Send a job's events as Server-Sent Events until it ends
+
+        Each event's SSE id is its sequence number, so a client reconnecting with
+        Last-Event-ID continues after the last event it received. The stream ends
+        with an "end" event holding the job and its result.
+        """
+        try:
+            after = int(self.headers.get("Last-Event-ID", -1))
+        except ValueError:
+            after = -1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        manager = self.server.manager
+        try:
+            while True:
+                events, finished = manager.wait_events(job, after, self.server.keepalive_seconds)
+                chunks = []
+                for sequence, event in events:
+                    chunks.append(f"id: {sequence}\nevent: {event['kind']}\ndata: {json.dumps(event)}\n\n")
+                    after = sequence
+                if finished:
+                    with manager.condition:
+                        chunks.append(f"event: end\ndata: {json.dumps(job.to_dict())}\n\n")
+                elif not chunks:
+                    chunks.append(": keep-alive\n\n")
+                self.wfile.write("".join(chunks).encode("utf-8"))
+                self.wfile.flush()
+                if finished:
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            # The subscriber went away; the job keeps running
+            return
+
+class JobServer(ThreadingHTTPServer):
+    """HTTP server that owns the job manager"""
+
+    daemon_threads = True
+
+    def __init__(self, address, manager: JobManager, verbose: bool = False,
+                 keepalive_seconds: float = SSE_KEEPALIVE_SECONDS):
+        super().__init__(address, JobApiHandler)
+        self.manager = manager
+        self.verbose = verbose
+        self.keepalive_seconds = keepalive_seconds
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the job API server"""
+    parser = argparse.ArgumentParser(description="Serve a local HTTP API for case download jobs.")
+    parser.add_argument("--out", default="downloads", help="Output folder, one sub-folder per case (default: downloads)")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=2, help="Cases scraped at the same time (default: 2)")
+    parser.add_argument("--max-queued", type=int, default=DEFAULT_MAX_QUEUED,
+                        help=f"Queued jobs before submissions get 429 (default: {DEFAULT_MAX_QUEUED})")
+    parser.add_argument("--max-jobs-per-client", type=int, default=DEFAULT_MAX_JOBS_PER_CLIENT,
+                        help=f"Queued and running jobs per client (default: {DEFAULT_MAX_JOBS_PER_CLIENT})")
+    parser.add_argument("--rate", type=float, default=1.0, help="Document requests per second per case (default: 1.0)")
+    parser.add_argument("--no-headless", dest="headless", action="store_false", help="Show the browser windows")
+    parser.add_argument("--lean", action="store_true", help="Lean browser profile (no images, CSS or fonts)")
+    parser.add_argument("--deep-link-cache", metavar="PATH",
+                        help="Cache of case document page URLs (default: <out>/.deep_links.jsonl)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request and scraper step")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.max_queued < 1 or args.max_jobs_per_client < 1:
+        parser.error("--workers, --max-queued and --max-jobs-per-client must be at least 1")
+
+    # Jobs run in this process, so they all share one deep-link cache
+    deep_link_cache = shared_deep_link_cache(args.deep_link_cache or Path(args.out) / DEEP_LINK_FILENAME)
+    scraper_options = {"headless": args.headless, "verbose": args.verbose, "request_rate": args.rate,
+                       "lean": args.lean, "deep_link_cache": deep_link_cache}
+    manager = JobManager(Path(args.out), workers=args.workers, max_queued=args.max_queued,
+                         max_jobs_per_client=args.max_jobs_per_client, scraper_options=scraper_options)
+    server = JobServer((args.host, args.port), manager, args.verbose)
+    print(f"Job API listening on http://{args.host}:{server.server_port} (output: {args.out})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        manager.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,7 +11,7 @@ import queue
 import os
 import json
 from pathlib import Path
-from court_scraper import GalvestonCourtScraper
+from court_scraper import GalvestonCourtScraper, DocumentFilter
 import time
 
 class ModernCourtScraperGUI:
@@ -62,8 +62,13 @@ class ModernCourtScraperGUI:
         self.root.update_idletasks()
         
     def update_document_progress(self, current, total, status_text=""):
-        """Update document download progress"""
-        if total > 0:
+        """Update document download progress (total is None while it is not known yet)"""
+        if total is None:
+            progress_text = f"Documents: {current}"
+            if status_text:
+                progress_text += f" - {status_text}"
+            self.documents_progress.set(progress_text)
+        elif total > 0:
             progress_text = f"Documents: {current}/{total}"
             if status_text:
                 progress_text += f" - {status_text}"
@@ -73,8 +78,20 @@ class ModernCourtScraperGUI:
             
         self.root.update_idletasks()
         
+    def set_progress_indeterminate(self, indeterminate):
+        """Animate the progress bar while the download total is unknown, show the percentage otherwise"""
+        if indeterminate == (str(self.progress_bar.cget('mode')) == 'indeterminate'):
+            return
+        if indeterminate:
+            self.progress_bar.configure(mode='indeterminate')
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode='determinate')
+        
     def reset_progress(self):
         """Reset all progress indicators"""
+        self.set_progress_indeterminate(False)
         self.current_step = 0
         self.progress_percentage.set(0)
         self.percentage_label.configure(text="0%")
@@ -105,6 +122,15 @@ class ModernCourtScraperGUI:
             self.progress_queue.put(("status", f"📄 Parsing: {message}"))
             
         elif phase == 'download':
+            # Documents streamed while the page is still parsed: the total is not known yet
+            self.progress_queue.put(("indeterminate", total_steps is None))
+            if total_steps is None:
+                self.progress_queue.put(("document_progress", (step, None, message)))
+                self.progress_queue.put(("progress", (step, None, f"📥 {message}", 75)))
+                if step > 0:
+                    self.progress_queue.put(("status", f"📥 Downloading: {step} files (still parsing)"))
+                return
+            
             # Download phase: 75% to 95% (20% total)
             base_percentage = 75
             phase_percentage = 20
@@ -192,6 +218,13 @@ class ModernCourtScraperGUI:
         self.documents_progress = tk.StringVar(value="")
         self.current_phase = "idle"  # idle, navigation, download, complete
         
+        # Optional document filters (empty = download everything)
+        self.filter_date_from = tk.StringVar(value="")
+        self.filter_date_to = tk.StringVar(value="")
+        self.filter_include = tk.StringVar(value="")
+        self.filter_exclude = tk.StringVar(value="")
+        self.filter_fragments = tk.StringVar(value="")
+        
     def load_preferences(self):
         """Load user preferences"""
         try:
@@ -574,6 +607,47 @@ class ModernCourtScraperGUI:
                                   style='Secondary.TButton')
         browse_button.pack(side='right', padx=(10, 0))
         
+        self.setup_filter_section(card)
+        
+    def setup_filter_section(self, card):
+        """Setup optional document filters (date range, type/name patterns, fragment IDs)"""
+        filter_section = tk.Frame(card, bg=self.colors['bg_card'])
+        filter_section.pack(fill='x', pady=(20, 0))
+        
+        filter_label = ttk.Label(filter_section, text="Document Filters (optional)", style='FieldLabel.TLabel')
+        filter_label.pack(anchor='w', pady=(0, 8))
+        
+        fields = [
+            ("From (MM/DD/YYYY)", self.filter_date_from, 12),
+            ("To (MM/DD/YYYY)", self.filter_date_to, 12),
+            ("Include types", self.filter_include, 18),
+            ("Exclude types", self.filter_exclude, 18),
+            ("Fragment IDs", self.filter_fragments, 18)
+        ]
+        fields_frame = tk.Frame(filter_section, bg=self.colors['bg_card'])
+        fields_frame.pack(fill='x')
+        for column, (label, variable, width) in enumerate(fields):
+            tk.Label(fields_frame, text=label, font=('Segoe UI', 9),
+                     fg=self.colors['text_muted'], bg=self.colors['bg_card']).grid(row=0, column=column, sticky='w', padx=(0, 8))
+            ttk.Entry(fields_frame, textvariable=variable, width=width,
+                      style='Modern.TEntry').grid(row=1, column=column, sticky='we', padx=(0, 8))
+        
+        hint_label = tk.Label(filter_section,
+                              text="💡 Types are regular expressions, e.g. Order|Judgment. Fragment IDs are comma-separated.",
+                              font=('Segoe UI', 9),
+                              fg=self.colors['text_muted'],
+                              bg=self.colors['bg_card'])
+        hint_label.pack(anchor='w', pady=(6, 0))
+        
+    def build_document_filter(self):
+        """Create a DocumentFilter from the filter fields (raises ValueError on bad input)"""
+        fragments = [fragment.strip() for fragment in self.filter_fragments.get().split(',') if fragment.strip()]
+        return DocumentFilter(date_from=self.filter_date_from.get().strip() or None,
+                              date_to=self.filter_date_to.get().strip() or None,
+                              include=self.filter_include.get().strip() or None,
+                              exclude=self.filter_exclude.get().strip() or None,
+                              fragment_ids=fragments or None)
+        
     def setup_action_card(self, parent):
         """Setup modern action buttons card"""
         card = self.create_card_frame(parent, "⚡ Actions")
@@ -847,6 +921,12 @@ class ModernCourtScraperGUI:
             messagebox.showerror("Folder Error", "Download folder path is invalid")
             return
             
+        try:
+            document_filter = self.build_document_filter()
+        except ValueError as e:
+            messagebox.showerror("Filter Error", str(e))
+            return
+            
         # Add to recent cases
         self.add_to_recent_cases(case_num)
         
@@ -863,12 +943,12 @@ class ModernCourtScraperGUI:
         # Start download thread
         self.download_thread = threading.Thread(
             target=self.download_documents,
-            args=(case_num, download_dir),
+            args=(case_num, download_dir, document_filter),
             daemon=True
         )
         self.download_thread.start()
         
-    def download_documents(self, case_number, download_dir):
+    def download_documents(self, case_number, download_dir, document_filter=None):
         """Download documents with accurate progress reporting"""
         try:
             case_dir = download_dir / case_number.replace('/', '_').replace('\\', '_')
@@ -887,7 +967,7 @@ class ModernCourtScraperGUI:
             # Phase 3: Scraping (will be handled by progress callbacks) - 15% to 70%
             # Phase 4: Parsing (will be reported at 72%)
             # Phase 5: Downloading (will be handled by callbacks) - 75% to 95%
-            result = self.scraper.scrape_case(case_number, case_dir)
+            result = self.scraper.scrape_case(case_number, case_dir, document_filter)
             
             if result["success"]:
                 # Final processing and completion (98-100%)
@@ -905,6 +985,8 @@ class ModernCourtScraperGUI:
                 self.progress_queue.put(("status", "✅ Download completed successfully!"))
                 self.progress_queue.put(("log", f"✅ SUCCESS! Case {case_number} processed", "success"))
                 self.progress_queue.put(("log", f"📄 Total documents found: {docs_found}", "info"))
+                if result.get("selected", docs_found) != docs_found:
+                    self.progress_queue.put(("log", f"🔎 Matching filters: {result['selected']}", "info"))
                 self.progress_queue.put(("log", f"📥 Successfully downloaded: {downloaded}", "success"))
                 
                 if secured > 0:
@@ -1030,6 +1112,8 @@ class ModernCourtScraperGUI:
                     # Update current step with message
                     step_num, step_message = message
                     self.update_progress(step_num, message=step_message)
+                elif msg_type == "indeterminate":
+                    self.set_progress_indeterminate(message)
                 elif msg_type == "document_progress":
                     # Document download progress: (current, total, status_text)
                     current, total, status_text = message
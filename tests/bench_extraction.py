@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: page_source + BeautifulSoup vs in-page JSON rows for the document table
+
+Renders a mock documents page and compares the bytes that cross the WebDriver
+connection and the Python-side parse time of both extraction modes. The JSON
+rows are produced here with extract_document_rows, which returns the same shape
+as the in-page script, so no browser is needed.
+
+Usage:
+    python tests/bench_extraction.py [documents_per_case]
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_scraper import GalvestonCourtScraper, DOCUMENT_ROW_FIELDS
+from mock_portal import MockPortal
+
+def best_of(function, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    portal = MockPortal(documents_per_case=documents)
+    try:
+        case_id = portal.case_id("25-CV-0880")
+        rows_html = "".join(
+            f'<tr><td>{doc["date"]}&nbsp;{doc["type"]}</td>'
+            f'<td><a href="ViewDocumentFragment.aspx?DocumentFragmentID={doc["fragment_id"]}">{doc["type"]}</a></td></tr>'
+            for doc in portal.documents(case_id)
+        )
+        html = portal.page("Register of Actions", f"<table>{rows_html}</table>")
+    finally:
+        portal.server.server_close()
+    
+    # Same compact arrays the in-page script returns
+    rows = GalvestonCourtScraper().extract_document_rows(html)
+    payload = json.dumps([[row[field] for field in DOCUMENT_ROW_FIELDS] for row in rows])
+    
+    def parse_json():
+        content = [dict(zip(DOCUMENT_ROW_FIELDS, row)) for row in json.loads(payload)]
+        return GalvestonCourtScraper().parse_documents(content)
+    
+    html_time = best_of(lambda: GalvestonCourtScraper().parse_documents(html))
+    json_time = best_of(parse_json)
+    
+    print(f"Documents: {documents}")
+    print(f"{'mode':<6} {'transfer KB':>12} {'parse ms':>10}")
+    print(f"{'html':<6} {len(html.encode('utf-8')) / 1024:>12.1f} {html_time * 1000:>10.1f}")
+    print(f"{'json':<6} {len(payload.encode('utf-8')) / 1024:>12.1f} {json_time * 1000:>10.1f}")
+    print(f"\nJSON rows parse {html_time / json_time:.1f}x faster")
+    print("The mock page has almost no markup besides the table; real docket pages carry far more,")
+    print("so the transfer saving on the portal is larger than shown here.")
+
+if __name__ == "__main__":
+    main()
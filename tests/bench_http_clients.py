@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests vs httpx document download clients against the mock portal
+
+Downloads every document of a mock case with download_documents using each
+backend, then fetches the same documents concurrently through one client to
+show connection reuse. The mock portal speaks plain HTTP/1.1, so httpx uses
+HTTP/1.1 keep-alive here; HTTP/2 is only negotiated with the real (TLS) portal.
+The httpx rows are skipped when httpx is not installed.
+
+Usage:
+    python tests/bench_http_clients.py [documents_per_case] [concurrency]
+"""
+
+import sys
+import time
+import tempfile
+import requests
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_scraper import GalvestonCourtScraper
+from court_http import HTTP_BACKENDS, create_http_client
+from mock_portal import MockPortal, SESSION_COOKIE
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with MockPortal(documents_per_case=documents, asset_delay=0) as portal:
+        landing = requests.get(f"{portal.base_url}default.aspx", timeout=10)
+        cookies = {SESSION_COOKIE: landing.cookies[SESSION_COOKIE]}
+        case_id = portal.case_id("25-CV-0880")
+        html = requests.get(f"{portal.base_url}CaseDetail.aspx?CaseID={case_id}&Documents=1", timeout=10).text
+
+        print(f"Documents: {documents}, concurrency: {concurrency}")
+        print(f"{'backend':<9} {'mode':<11} {'seconds':>8} {'docs/s':>8} {'connections':>12}")
+        for backend in HTTP_BACKENDS:
+            try:
+                create_http_client(backend).close()
+            except ImportError as e:
+                print(f"{backend:<9} skipped: {e}")
+                continue
+
+            scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, http_backend=backend)
+            docs = scraper.parse_documents(html)
+            with tempfile.TemporaryDirectory() as download_dir:
+                connections = portal.connection_count
+                start = time.perf_counter()
+                scraper.download_documents(docs, Path(download_dir), cookies)
+                elapsed = time.perf_counter() - start
+            print(f"{backend:<9} {'sequential':<11} {elapsed:>8.2f} {len(docs) / elapsed:>8.0f} "
+                  f"{portal.connection_count - connections:>12}")
+
+            client = create_http_client(backend, pool_size=concurrency)
+            urls = [f"{portal.base_url}{doc.url}" for doc in docs]
+            connections = portal.connection_count
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(lambda url: client.get(url, cookies=cookies).content, urls))
+            elapsed = time.perf_counter() - start
+            client.close()
+            print(f"{backend:<9} {'concurrent':<11} {elapsed:>8.2f} {len(urls) / elapsed:>8.0f} "
+                  f"{portal.connection_count - connections:>12}")
+
+if __name__ == "__main__":
+    main()
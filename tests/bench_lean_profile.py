@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: standard vs lean browser profile against the local mock portal
+
+Measures per-case navigation time (steps 1-7) and the resident memory of the
+Chrome process tree after navigation. Requires Chrome; psutil is optional and
+only needed for the memory column.
+
+Usage:
+    python tests/bench_lean_profile.py [cases_per_profile]
+"""
+
+import sys
+import time
+import statistics
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_scraper import GalvestonCourtScraper
+from mock_portal import MockPortal
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def browser_rss(scraper: GalvestonCourtScraper) -> int:
+    """Total RSS in bytes of chromedriver and every Chrome process it started"""
+    if psutil is None or not scraper.driver:
+        return 0
+    driver_process = psutil.Process(scraper.driver.service.process.pid)
+    processes = [driver_process] + driver_process.children(recursive=True)
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+def run_profile(portal: MockPortal, lean: bool, cases: int):
+    """Navigate `cases` cases with a fresh browser each, return (timings, rss values)"""
+    timings, rss_values = [], []
+    for n in range(cases):
+        # The mock serves "third-party" assets from localhost, block it like a real CDN
+        scraper = GalvestonCourtScraper(headless=True, lean=lean, base_url=portal.base_url,
+                                        blocked_url_patterns=[f"{portal.third_party_origin}/*"])
+        try:
+            scraper.setup_driver()
+            start = time.perf_counter()
+            result = scraper.navigate_to_case(f"25-CV-{n:04d}", max_retries=0)
+            elapsed = time.perf_counter() - start
+            if result is None:
+                raise RuntimeError("navigation failed")
+            timings.append(elapsed)
+            rss_values.append(browser_rss(scraper))
+        finally:
+            scraper.close_driver()
+    return timings, rss_values
+
+def main():
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with MockPortal(documents_per_case=200, asset_delay=0.25) as portal:
+        print(f"Mock portal: {portal.base_url} ({cases} cases per profile)")
+        print(f"{'profile':<10} {'median s/case':>14} {'mean s/case':>12} {'median RSS MB':>14}")
+        results = {}
+        for name, lean in (("standard", False), ("lean", True)):
+            timings, rss_values = run_profile(portal, lean, cases)
+            results[name] = (statistics.median(timings), statistics.median(rss_values))
+            rss = f"{results[name][1] / 1024 / 1024:.0f}" if psutil else "n/a"
+            print(f"{name:<10} {results[name][0]:>14.2f} {statistics.mean(timings):>12.2f} {rss:>14}")
+        
+        time_saved = results["standard"][0] - results["lean"][0]
+        print(f"\nLean profile saves {time_saved:.2f} s per case "
+              f"({time_saved / results['standard'][0]:.0%} of navigation time)")
+        if psutil:
+            rss_saved = (results["standard"][1] - results["lean"][1]) / 1024 / 1024
+            print(f"Lean profile saves {rss_saved:.0f} MB browser RSS")
+
+if __name__ == "__main__":
+    main()
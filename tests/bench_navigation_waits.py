@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: page_source polling waits vs targeted DOM waits on the mock portal
+
+Compares three navigation wait layers on a large docket:
+  legacy   - the old `... in driver.page_source` lambdas with implicitly_wait(10)
+  element  - explicit waits on specific elements (default)
+  observer - in-page MutationObserver through execute_async_script
+and prints the median time of each navigation step. Requires Chrome.
+
+Usage:
+    python tests/bench_navigation_waits.py [cases_per_strategy] [documents_per_case]
+"""
+
+import sys
+import statistics
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from selenium.webdriver.support.ui import WebDriverWait
+from court_scraper import GalvestonCourtScraper
+from mock_portal import MockPortal
+
+class LegacyWaitScraper(GalvestonCourtScraper):
+    """Scraper with the waits used before the targeted wait layer"""
+    
+    def setup_driver(self):
+        if not super().setup_driver():
+            return False
+        self.driver.implicitly_wait(10)
+        return True
+    
+    def _wait_for_case_page(self, case_number, clicked_element):
+        WebDriverWait(self.driver, 10).until(
+            lambda driver: case_number in driver.page_source
+        )
+    
+    def _wait_for_document_page(self, clicked_element):
+        WebDriverWait(self.driver, 15).until(
+            lambda driver: "ViewDocumentFragment.aspx" in driver.page_source or
+                          "No records found" in driver.page_source
+        )
+
+def run_strategy(portal: MockPortal, name: str, cases: int):
+    """Navigate `cases` cases and return {step: [seconds, ...]}"""
+    if name == "legacy":
+        scraper = LegacyWaitScraper(headless=True, base_url=portal.base_url)
+    else:
+        scraper = GalvestonCourtScraper(headless=True, base_url=portal.base_url, wait_strategy=name)
+    
+    timings = {}
+    try:
+        scraper.setup_driver()
+        for n in range(cases):
+            if scraper.navigate_to_case(f"24-CV-{n:04d}", max_retries=0) is None:
+                raise RuntimeError(f"{name}: navigation failed")
+            for step, seconds in scraper.step_timings:
+                timings.setdefault(step, []).append(seconds)
+    finally:
+        scraper.close_driver()
+    return timings
+
+def main():
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    documents = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    strategies = ("legacy", "element", "observer")
+    
+    with MockPortal(documents_per_case=documents, asset_delay=0) as portal:
+        print(f"Mock portal: {portal.base_url} ({cases} cases, {documents} documents each)")
+        results = {name: run_strategy(portal, name, cases) for name in strategies}
+    
+    print(f"\n{'step':<6}" + "".join(f"{name:>12}" for name in strategies) + f"{'saved':>12}")
+    totals = {name: 0.0 for name in strategies}
+    for step in sorted(results["legacy"]):
+        medians = {name: statistics.median(results[name][step]) for name in strategies}
+        for name in strategies:
+            totals[name] += medians[name]
+        best = min(medians["element"], medians["observer"])
+        print(f"{step:<6}" + "".join(f"{medians[name]:>11.3f}s" for name in strategies)
+              + f"{medians['legacy'] - best:>11.3f}s")
+    print(f"{'total':<6}" + "".join(f"{totals[name]:>11.3f}s" for name in strategies)
+          + f"{totals['legacy'] - min(totals['element'], totals['observer']):>11.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Galveston County Public Access portal for tests and benchmarks
+
+Serves the same 7-step flow the scraper drives (landing page, Civil and Family
+search, case search, case detail, document list) plus PDF document fragments.
+Pages reference a stylesheet, a web font, images and a "third-party" script on
+a second host name so browser profiles can be compared.
+
+Usage:
+    python tests/mock_portal.py            # serve on http://127.0.0.1:8642/PublicAccess/
+"""
+
+import time
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from http.cookies import SimpleCookie
+from urllib.parse import urlparse, parse_qs, urlencode
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SESSION_COOKIE = "ASP.NET_SessionId"
+
+DOCUMENT_TYPES = ["Original Petition", "Citation", "Answer", "Motion to Compel", "Order",
+                  "Notice of Hearing", "Exhibit", "Affidavit", "Proposed Order", "Final Judgment"]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>Galveston County Public Access - {title}</title>
+<link rel="stylesheet" href="/assets/site.css">
+<script src="{third_party}/analytics.js"></script>
+</head><body>
+<img src="/assets/banner.png" alt="Galveston County"><img src="{third_party}/pixel.gif" alt="">
+{body}
+</body></html>"""
+
+def fake_pdf(fragment_id: str, size: int) -> bytes:
+    """Deterministic PDF-looking payload of roughly `size` bytes"""
+    header = f"%PDF-1.4\n% Mock document {fragment_id}\n".encode("ascii")
+    filler = hashlib.sha256(fragment_id.encode("ascii")).hexdigest().encode("ascii")
+    body = (filler * (size // len(filler) + 1))[:max(0, size - len(header) - 6)]
+    return header + body + b"\n%%EOF"
+
+class MockPortal:
+    """
+    Threaded mock portal server
+
+    Every case number exists and has `documents_per_case` documents. Fragment IDs
+    listed in `secured_fragments` return a court HTML page instead of a PDF.
+    Assets are delayed by `asset_delay` seconds to mimic a slow CDN.
+
+    With `session_document_limit`, document requests need the session cookie set
+    by default.aspx, and each session expires after that many documents: later
+    requests get the portal's session timeout page.
+
+    The first `unavailable_documents` document requests get "503 Service
+    Unavailable", with a Retry-After header when `retry_after` is set.
+
+    `document_sizes` maps fragment IDs to PDF sizes other than `pdf_size`.
+
+    The Date Filed search lists `cases_per_day` cases for every day in the range,
+    `search_page_size` per result page with a "Next" link to the following page.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, documents_per_case: int = 20,
+                 pdf_size: int = 50_000, asset_delay: float = 0.2, asset_size: int = 400_000,
+                 secured_fragments: Optional[List[str]] = None,
+                 session_document_limit: Optional[int] = None, cases_per_day: int = 3,
+                 search_page_size: int = 10, unavailable_documents: int = 0,
+                 retry_after: Optional[str] = None, document_sizes: Optional[Dict[str, int]] = None):
+        self.documents_per_case = documents_per_case
+        self.pdf_size = pdf_size
+        self.asset_delay = asset_delay
+        self.asset_size = asset_size
+        self.secured_fragments = set(secured_fragments or [])
+        self.session_document_limit = session_document_limit
+        self.cases_per_day = cases_per_day
+        self.search_page_size = search_page_size
+        self.unavailable_documents = unavailable_documents
+        self.retry_after = retry_after
+        self.document_sizes = dict(document_sizes or {})
+        self.sessions: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.request_log: List[str] = []
+        self.connection_count = 0
+        self.cases: Dict[str, int] = {}
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def origin(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    @property
+    def third_party_origin(self) -> str:
+        """Same server under another host name, standing in for third-party hosts"""
+        return f"http://localhost:{self.server.server_port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.origin}/PublicAccess/"
+
+    def start(self) -> "MockPortal":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def case_id(self, case_number: str) -> int:
+        with self.lock:
+            return self.cases.setdefault(case_number, 1000 + len(self.cases))
+
+    def case_number(self, case_id: int) -> Optional[str]:
+        with self.lock:
+            for case_number, known_id in self.cases.items():
+                if known_id == case_id:
+                    return case_number
+        return None
+
+    def cases_filed(self, date_from: str, date_to: str) -> List[str]:
+        """Case numbers filed between two MM/DD/YYYY dates (inclusive), oldest first"""
+        day = datetime.strptime(date_from, "%m/%d/%Y")
+        last = datetime.strptime(date_to, "%m/%d/%Y")
+        case_numbers = []
+        while day <= last:
+            for n in range(self.cases_per_day):
+                number = day.timetuple().tm_yday * 10 + n
+                case_numbers.append(f"{day:%y}-CV-{number:04d}")
+            day += timedelta(days=1)
+        return case_numbers
+
+    def documents(self, case_id: int) -> List[Dict]:
+        """Documents of a case, oldest first"""
+        documents = []
+        for n in range(self.documents_per_case):
+            month, day = 1 + (n // 28) % 12, 1 + n % 28
+            documents.append({
+                "fragment_id": str(case_id * 1000 + n),
+                "date": f"{month:02d}/{day:02d}/2025",
+                "type": DOCUMENT_TYPES[n % len(DOCUMENT_TYPES)]
+            })
+        return documents
+
+    def page(self, title: str, body: str) -> str:
+        return PAGE_TEMPLATE.format(title=title, body=body, third_party=self.third_party_origin)
+
+    def _handler_class(self):
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients can reuse connections (every response has a Content-Length)
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with portal.lock:
+                    portal.connection_count += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_body(self, body: bytes, content_type: str = "text/html; charset=utf-8",
+                          status: int = 200, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def send_page(self, title: str, body: str, headers: Optional[Dict[str, str]] = None):
+                self.send_body(portal.page(title, body).encode("utf-8"), headers=headers)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with portal.lock:
+                    portal.request_log.append(self.path)
+
+                if url.path.startswith("/assets/") or url.path in ("/analytics.js", "/pixel.gif"):
+                    self.serve_asset(url.path)
+                elif url.path.endswith("/default.aspx"):
+                    session_id = f"mock{time.time_ns()}"
+                    with portal.lock:
+                        portal.sessions[session_id] = 0
+                    self.send_page("Home", '<a href="Search.aspx?ID=200">Civil and Family Case Records</a>',
+                                   {"Set-Cookie": f"{SESSION_COOKIE}={session_id}; Path=/"})
+                elif url.path.endswith("/Search.aspx"):
+                    self.serve_search(query)
+                elif url.path.endswith("/CaseDetail.aspx"):
+                    self.serve_case(query)
+                elif url.path.endswith("/ViewDocumentFragment.aspx"):
+                    self.serve_document(query)
+                else:
+                    self.send_body(b"Not found", "text/plain", 404)
+
+            def serve_asset(self, path: str):
+                time.sleep(portal.asset_delay)
+                content_type = {"css": "text/css", "js": "application/javascript", "png": "image/png",
+                                "gif": "image/gif", "woff2": "font/woff2"}[path.rsplit(".", 1)[1]]
+                if path.endswith(".css"):
+                    body = b"@font-face { font-family: Portal; src: url(/assets/portal.woff2); }\n"
+                    body += b"body { font-family: Portal; }\n" * (portal.asset_size // 30)
+                else:
+                    body = b"\0" * portal.asset_size
+                self.send_body(body, content_type)
+
+            def serve_search(self, query: Dict[str, str]):
+                if query.get("DateFiledOnAfter") and query.get("DateFiledOnBefore"):
+                    self.serve_date_search(query)
+                    return
+                case_number = query.get("CaseSearchValue", "").strip()
+                if not case_number:
+                    self.send_page("Search", """
+                        <form action="Search.aspx" method="get">
+                        <input type="hidden" name="ID" value="200">
+                        <input type="radio" name="SearchBy" id="DateFiled" value="DateFiled">
+                        <label for="DateFiled">Date Filed</label>
+                        <input type="radio" name="SearchBy" id="Case" value="Case">
+                        <label for="Case">Case</label>
+                        <input type="text" id="CaseSearchValue" name="CaseSearchValue">
+                        <input type="text" id="DateFiledOnAfter" name="DateFiledOnAfter">
+                        <input type="text" id="DateFiledOnBefore" name="DateFiledOnBefore">
+                        </form>""")
+                    return
+                case_id = portal.case_id(case_number)
+                self.send_page("Search Results", f"""
+                    <table><tr><th>Case Number</th><th>Style</th></tr>
+                    <tr><td><a href="CaseDetail.aspx?CaseID={case_id}">{case_number}</a></td>
+                    <td>Mock v. Case</td></tr></table>""")
+
+            def serve_date_search(self, query: Dict[str, str]):
+                try:
+                    case_numbers = portal.cases_filed(query["DateFiledOnAfter"], query["DateFiledOnBefore"])
+                except ValueError:
+                    self.send_page("Search Results", "<p>Invalid date</p>")
+                    return
+                if not case_numbers:
+                    self.send_page("Search Results", "<p>No records found</p>")
+                    return
+                page = int(query.get("page", 1))
+                size = portal.search_page_size
+                rows = "".join(
+                    f'<tr><td><a href="CaseDetail.aspx?CaseID={portal.case_id(case_number)}">{case_number}</a></td>'
+                    f'<td>Mock v. Case</td><td>{query["DateFiledOnAfter"]}</td></tr>'
+                    for case_number in case_numbers[(page - 1) * size:page * size]
+                )
+                pager = ""
+                if page * size < len(case_numbers):
+                    next_query = urlencode(dict(query, page=page + 1))
+                    pager = f'<a href="Search.aspx?{next_query.replace("&", "&amp;")}">Next</a>'
+                self.send_page("Search Results", f"""
+                    <p>Records {(page - 1) * size + 1} to {min(page * size, len(case_numbers))}
+                    of {len(case_numbers)}</p>
+                    <table><tr><th>Case Number</th><th>Style</th><th>Filed</th></tr>{rows}</table>{pager}""")
+
+            def serve_case(self, query: Dict[str, str]):
+                case_id = int(query.get("CaseID", 0))
+                case_number = portal.case_number(case_id)
+                if case_number is None:
+                    self.send_page("Case", "<p>No records found</p>")
+                    return
+                if "Documents" not in query:
+                    self.send_page("Case Detail", f"""
+                        <h1>Case No. <a href="CaseDetail.aspx?CaseID={case_id}&amp;Documents=1">{case_number}</a></h1>
+                        <p>Register of actions loading...</p>""")
+                    return
+                rows = "".join(
+                    f'<tr><td>{doc["date"]}&nbsp;{doc["type"]}</td>'
+                    f'<td><a href="ViewDocumentFragment.aspx?DocumentFragmentID={doc["fragment_id"]}">'
+                    f'{doc["type"]}</a></td></tr>'
+                    for doc in portal.documents(case_id)
+                )
+                self.send_page("Register of Actions",
+                               f"<h1>Case No. {case_number}</h1><table>{rows}</table>")
+
+            def session_valid(self) -> bool:
+                """Count a document request against its session, False once the session expired"""
+                if portal.session_document_limit is None:
+                    return True
+                cookies = SimpleCookie(self.headers.get("Cookie", ""))
+                session_id = cookies[SESSION_COOKIE].value if SESSION_COOKIE in cookies else None
+                with portal.lock:
+                    if session_id not in portal.sessions:
+                        return False
+                    portal.sessions[session_id] += 1
+                    return portal.sessions[session_id] <= portal.session_document_limit
+
+            def serve_document(self, query: Dict[str, str]):
+                fragment_id = query.get("DocumentFragmentID", "")
+                with portal.lock:
+                    unavailable = portal.unavailable_documents > 0
+                    portal.unavailable_documents -= unavailable
+                if unavailable:
+                    headers = {"Retry-After": portal.retry_after} if portal.retry_after else None
+                    self.send_body(b"Service Unavailable", "text/plain", 503, headers)
+                    return
+                if not self.session_valid():
+                    self.send_page("Session Timeout", """
+                        <h2>Session Timeout</h2>
+                        <p>Your session has timed out. Please <a href="Login.aspx">log in</a> again.</p>""")
+                    return
+                if fragment_id in portal.secured_fragments:
+                    self.send_page("Document", "<p>Access denied: this document is sealed by court order.</p>")
+                    return
+                self.send_body(fake_pdf(fragment_id, portal.document_sizes.get(fragment_id, portal.pdf_size)), "application/pdf")
+
+        return Handler
+
+if __name__ == "__main__":
+    portal = MockPortal(port=8642)
+    print(f"Mock portal running at {portal.base_url}")
+    try:
+        portal.server.serve_forever()
+    except KeyboardInterrupt:
+        portal.server.server_close()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for ZIP and tar.zst case archives (no browser required)
+"""
+
+import io
+import sys
+import tarfile
+import zipfile
+import pytest
+import requests
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_archive import CaseArchive, MANIFEST_NAME
+from court_scraper import GalvestonCourtScraper
+from mock_portal import MockPortal, SESSION_COOKIE
+
+def portal_cookies(portal: MockPortal) -> dict:
+    response = requests.get(f"{portal.base_url}default.aspx", timeout=10)
+    return {SESSION_COOKIE: response.cookies[SESSION_COOKIE]}
+
+def fake_navigation(portal: MockPortal, calls: list):
+    def navigate_to_case(case_number, max_retries=None, use_deep_link=True):
+        calls.append(case_number)
+        case_id = portal.case_id(case_number)
+        html = requests.get(f"{portal.base_url}CaseDetail.aspx?CaseID={case_id}&Documents=1", timeout=10).text
+        return html, portal_cookies(portal)
+    return navigate_to_case
+
+def read_tar_zst(path: Path) -> tarfile.TarFile:
+    import zstandard
+    with open(path, "rb") as f:
+        data = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True).read()
+    return tarfile.open(fileobj=io.BytesIO(data))
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.zst"])
+def test_reopened_archive_appends_and_replaces_the_manifest(tmp_path, archive_format):
+    if archive_format == "tar.zst":
+        pytest.importorskip("zstandard")
+    path = tmp_path / f"case.{archive_format}"
+    archive = CaseArchive.open(path, archive_format)
+    archive.add("a.pdf", b"%PDF-a")
+    archive.close("first manifest")
+
+    archive = CaseArchive.open(path, archive_format)
+    assert "a.pdf" in archive and MANIFEST_NAME not in archive
+    archive.add("b.pdf", b"%PDF-b")
+    archive.close("second manifest")
+
+    if archive_format == "zip":
+        with zipfile.ZipFile(path) as zf:
+            assert zf.namelist() == ["a.pdf", "b.pdf", MANIFEST_NAME] and zf.testzip() is None
+            assert zf.read(MANIFEST_NAME) == b"second manifest"
+    else:
+        with read_tar_zst(path) as tf:
+            assert tf.getnames() == ["a.pdf", "b.pdf", MANIFEST_NAME]
+            assert tf.extractfile(MANIFEST_NAME).read() == b"second manifest"
+
+def test_interrupted_zip_member_is_dropped_on_reopen(tmp_path):
+    path = tmp_path / "case.zip"
+    archive = CaseArchive.open(path, "zip")
+    archive.add("a.pdf", b"%PDF-a" * 100)
+    archive.add("b.pdf", b"%PDF-b" * 100)
+    # What a kill leaves on disk: the fsynced members and no central directory
+    killed = path.read_bytes()
+    archive.close()
+    with zipfile.ZipFile(path) as zf:
+        assert zf.namelist() == ["a.pdf", "b.pdf"]
+    path.write_bytes(killed)
+    reopened = CaseArchive.open(path, "zip")
+    assert reopened.files() == [("a.pdf", 600), ("b.pdf", 600)]
+    reopened.close()
+
+    # Killed while writing b.pdf: its data is cut short
+    path.write_bytes(killed[:-400])
+    archive = CaseArchive.open(path, "zip")
+    assert archive.files() == [("a.pdf", 600)]
+    archive.add("b.pdf", b"%PDF-b" * 100)
+    archive.close()
+    with zipfile.ZipFile(path) as zf:
+        assert zf.namelist() == ["a.pdf", "b.pdf"] and zf.testzip() is None
+
+def test_zip_central_directory_is_written_once_on_close(tmp_path, monkeypatch):
+    path = tmp_path / "case.zip"
+    archive = CaseArchive.open(path, "zip")
+    writes = []
+    monkeypatch.setattr(archive.zip, "_write_end_record", lambda: writes.append(len(archive.zip.filelist)))
+    for index in range(20):
+        archive.add(f"{index}.pdf", b"%PDF-" + bytes([index]) * 50)
+    assert writes == []
+    monkeypatch.undo()
+    archive.close("manifest")
+    with zipfile.ZipFile(path) as zf:
+        assert len(zf.namelist()) == 21 and zf.testzip() is None
+
+def test_archive_formats_must_implement_add_and_close(tmp_path):
+    class Incomplete(CaseArchive):
+        def _add(self, name, data):
+            pass
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path / "case.bin")
+
+def test_case_is_written_into_its_archive_and_resumed(tmp_path, monkeypatch):
+    out = tmp_path / "out"
+    with MockPortal(documents_per_case=8, asset_delay=0, session_document_limit=5,
+                    secured_fragments=["1000007"]) as portal:
+        calls = []
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, archive_format="zip")
+        monkeypatch.setattr(scraper, "navigate_to_case", fake_navigation(portal, calls))
+        result = scraper.scrape_case("25-CV-0880", out / "25-CV-0880")
+
+        # The session expired after 5 documents: it was renewed and the rest fetched again
+        assert result["downloaded"] == 7 and result["secured"] == 1 and result["session_renewals"] == 1
+        assert result["archive"] == str(out / "25-CV-0880.zip")
+        assert not (out / "25-CV-0880").exists()
+        with zipfile.ZipFile(out / "25-CV-0880.zip") as zf:
+            names = zf.namelist()
+            assert len(names) == 9 and names[-1] == MANIFEST_NAME and len(set(names)) == 9
+            assert b"Total Files: 8" in zf.read(MANIFEST_NAME)
+            documents = [zf.read(name) for name in names if name.endswith(".pdf")]
+        assert sum(data.startswith(b"%PDF-1.4\n% Mock document") for data in documents) == 7
+
+        requests_before = len(portal.request_log)
+        resumed = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, archive_format="zip")
+        monkeypatch.setattr(resumed, "navigate_to_case", fake_navigation(portal, calls))
+        again = resumed.scrape_case("25-CV-0880", out / "25-CV-0880")
+        document_requests = [path for path in portal.request_log[requests_before:] if "DocumentFragmentID" in path]
+
+    assert again["skipped"] == 8 and again["downloaded"] == 0 and document_requests == []
+    with zipfile.ZipFile(out / "25-CV-0880.zip") as zf:
+        assert zf.namelist() == names
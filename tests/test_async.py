@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio scraping engine against the local mock portal (no browser required)
+"""
+
+import sys
+import asyncio
+import pytest
+import requests
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_async import AsyncGalvestonCourtScraper, scrape_cases_async
+from court_journal import BatchJournal
+from court_retry import RetryPolicy
+from court_scraper import GalvestonCourtScraper
+from mock_portal import MockPortal, SESSION_COOKIE
+
+def portal_cookies(portal: MockPortal) -> dict:
+    response = requests.get(f"{portal.base_url}default.aspx", timeout=10)
+    return {SESSION_COOKIE: response.cookies[SESSION_COOKIE]}
+
+def document_page(portal: MockPortal, case_number: str) -> str:
+    case_id = portal.case_id(case_number)
+    return requests.get(f"{portal.base_url}CaseDetail.aspx?CaseID={case_id}&Documents=1", timeout=10).text
+
+def fake_navigation(portal: MockPortal):
+    """navigate_to_case replacement: the document page over plain HTTP and a fresh portal session"""
+    def navigate_to_case(self, case_number, max_retries=None, use_deep_link=True):
+        return document_page(portal, case_number), portal_cookies(portal)
+    return navigate_to_case
+
+@pytest.mark.parametrize("backend", ["httpx", "aiohttp"])
+def test_async_case_matches_sync_result(tmp_path, monkeypatch, backend):
+    pytest.importorskip(backend)
+    with MockPortal(documents_per_case=6, asset_delay=0, secured_fragments=["1000002"]) as portal:
+        monkeypatch.setattr(GalvestonCourtScraper, "navigate_to_case", fake_navigation(portal))
+        sync_result = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url).scrape_case(
+            "25-CV-0880", tmp_path / "sync")
+
+        async def scrape():
+            async with AsyncGalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                                  async_backend=backend) as scraper:
+                return await scraper.scrape_case_async("25-CV-0880", tmp_path / "async")
+
+        async_result = asyncio.run(scrape())
+
+    assert async_result == dict(sync_result, first_document_seconds=async_result["first_document_seconds"])
+    assert async_result["downloaded"] == 5 and async_result["secured"] == 1
+    sync_files = sorted(path.name for path in (tmp_path / "sync").iterdir())
+    assert sorted(path.name for path in (tmp_path / "async").iterdir()) == sync_files
+    for path in (tmp_path / "sync").glob("*.pdf"):
+        assert (tmp_path / "async" / path.name).read_bytes() == path.read_bytes()
+
+def test_async_retries_and_session_renewal(tmp_path, monkeypatch):
+    with MockPortal(documents_per_case=8, asset_delay=0, session_document_limit=5,
+                    unavailable_documents=2, retry_after="1") as portal:
+        renewals = []
+        navigate = fake_navigation(portal)
+
+        def renewing_navigation(self, case_number, max_retries=None, use_deep_link=True):
+            renewals.append(use_deep_link)
+            return navigate(self, case_number)
+
+        monkeypatch.setattr(GalvestonCourtScraper, "navigate_to_case", renewing_navigation)
+        policy = RetryPolicy(base_delay=0.01, max_retry_after=0.1)
+
+        async def scrape():
+            async with AsyncGalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                                  retry_policy=policy, max_concurrent=4) as scraper:
+                return await scraper.scrape_case_async("25-CV-0880", tmp_path)
+
+        result = asyncio.run(scrape())
+
+    assert renewals == [True, False]
+    assert (result["downloaded"], result["secured"], result["failed"]) == (8, 0, 0)
+    assert result["session_renewals"] == 1
+    for path in tmp_path.glob("*.pdf"):
+        assert path.read_bytes().startswith(b"%PDF-1.4\n% Mock document")
+
+def test_cases_share_the_in_flight_limit(tmp_path, monkeypatch):
+    cases = ["25-CV-0880", "25-CV-0881", "25-CV-0882"]
+    with MockPortal(documents_per_case=5, asset_delay=0) as portal:
+        monkeypatch.setattr(GalvestonCourtScraper, "navigate_to_case", fake_navigation(portal))
+        journal = BatchJournal(tmp_path / "journal.jsonl")
+        in_flight = {"now": 0, "max": 0}
+
+        class CountingScraper(AsyncGalvestonCourtScraper):
+            async def _download_once_async(self, client, doc, file_path, cookies=None, on_response=None):
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                try:
+                    await asyncio.sleep(0.02)
+                    return await super()._download_once_async(client, doc, file_path, cookies, on_response)
+                finally:
+                    in_flight["now"] -= 1
+
+        results = asyncio.run(scrape_cases_async(cases, tmp_path, browsers=2, max_in_flight=4, rate=0,
+                                                 journal=journal, scraper_options={"base_url": portal.base_url},
+                                                 scraper_class=CountingScraper))
+
+    assert sorted(result["case_number"] for result in results) == cases
+    assert all(result["downloaded"] == 5 for result in results)
+    assert in_flight["max"] == 4
+    assert BatchJournal(tmp_path / "journal.jsonl", resume=True).is_case_done("25-CV-0882")
+
+@pytest.mark.parametrize("renewal", [True, False])
+def test_expired_sessions_settle_like_the_sync_engine(tmp_path, monkeypatch, renewal):
+    with MockPortal(documents_per_case=6, asset_delay=0, session_document_limit=2) as portal:
+        navigate = fake_navigation(portal)
+        monkeypatch.setattr(GalvestonCourtScraper, "navigate_to_case", navigate)
+        if not renewal:
+            monkeypatch.setattr(GalvestonCourtScraper, "_renew_session", lambda self, case_number: None)
+        progress = []
+        sync_result = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url).scrape_case(
+            "25-CV-0880", tmp_path / "sync")
+
+        async def scrape():
+            # One request at a time, so the portal sees the documents in the same order
+            async with AsyncGalvestonCourtScraper(request_rate=0, base_url=portal.base_url, max_concurrent=1,
+                                                  progress_callback=progress.append) as scraper:
+                return await scraper.scrape_case_async("25-CV-0880", tmp_path / "async")
+
+        async_result = asyncio.run(scrape())
+
+    # With renewal: 2 downloaded, 3 timeouts renew the session, 2 more downloaded, a trailing pair is secured.
+    # Without: the 4 timeouts after the first 2 documents fail
+    expected = (4, 2, 0, 1) if renewal else (2, 0, 4, 0)
+    assert (sync_result["downloaded"], sync_result["secured"], sync_result["failed"],
+            sync_result["session_renewals"]) == expected
+    assert async_result == dict(sync_result, first_document_seconds=async_result["first_document_seconds"],
+                                permanent_failures=async_result["permanent_failures"])
+    assert sorted(async_result["permanent_failures"]) == sorted(sync_result["permanent_failures"])
+    steps = [info["step"] for info in progress if info["phase"] == "download"]
+    assert max(steps) == 6 and all(info["total_steps"] == 6 for info in progress if info["phase"] == "download")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-process and pipelined batch runners (no browser required)
+"""
+
+import os
+import sys
+import time
+import signal
+import threading
+import pytest
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_batch import ShardedBatchRunner, PipelinedBatchRunner, summarize_results
+from court_journal import BatchJournal
+
+class FakeScraper:
+    """Scraper stand-in: '*-CRASH' kills its worker once, '*-DEAD' always does"""
+    
+    def __init__(self, headless=True, verbose=False, request_rate=1.0):
+        pass
+    
+    def scrape_case(self, case_number, download_dir=None):
+        marker = Path(download_dir).parent / f"{case_number}.crashed"
+        if case_number.endswith("-DEAD") or (case_number.endswith("-CRASH") and not marker.exists()):
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+            os._exit(3)
+        return {"success": True, "documents": 1, "downloaded": 1, "secured": 0, "failed": 0,
+                "skipped": 0, "case_number": case_number}
+
+def test_sharded_runner_recovers_crashed_workers(tmp_path):
+    cases = ["25-CV-0001", "25-CV-0002", "25-CV-CRASH", "25-CV-DEAD", "25-CV-0003"]
+    progress = []
+    runner = ShardedBatchRunner(tmp_path, processes=2, max_case_retries=1, scraper_class=FakeScraper)
+    results = runner.run(cases, on_progress=lambda done, total: progress.append((done, total)))
+    
+    by_case = {result["case_number"]: result for result in results}
+    assert sorted(by_case) == sorted(cases)
+    assert by_case["25-CV-CRASH"]["success"]
+    assert not by_case["25-CV-DEAD"]["success"]
+    assert "exited with code 3" in by_case["25-CV-DEAD"]["error"]
+    assert progress[-1] == (5, 5)
+    
+    summary = summarize_results(results)
+    assert summary["succeeded"] == 4 and summary["failed"] == 1 and summary["downloaded"] == 4
+
+class SlowScraper:
+    """
+    Scraper stand-in for the pipeline: '*-LOST' fails to navigate
+
+    The download of 25-CV-0000 only finishes once the browser has started on
+    25-CV-0001, so a run that does not overlap the stages fails instead of
+    hanging. Navigations and the start and end of downloads are logged in order.
+    """
+    
+    log = []
+    navigating = {}
+    
+    def __init__(self, headless=True, verbose=False, request_rate=1.0, http_pool_size=None, journal=None):
+        pass
+    
+    @classmethod
+    def reset(cls, cases):
+        cls.log = []
+        cls.navigating = {case: threading.Event() for case in cases}
+    
+    def navigate_to_case(self, case_number):
+        SlowScraper.log.append(("navigate", case_number))
+        SlowScraper.navigating[case_number].set()
+        time.sleep(0.01)
+        return None if case_number.endswith("-LOST") else (f"<html>{case_number}</html>", {"session": "1"})
+    
+    def process_case_page(self, case_number, html_source, cookies, download_dir=None):
+        assert html_source == f"<html>{case_number}</html>" and cookies == {"session": "1"}
+        SlowScraper.log.append(("download", case_number))
+        if case_number == "25-CV-0000" and not SlowScraper.navigating["25-CV-0001"].wait(5):
+            return {"success": False, "error": "navigation did not overlap the download", "case_number": case_number}
+        time.sleep(0.01)
+        SlowScraper.log.append(("downloaded", case_number))
+        return {"success": True, "documents": 1, "downloaded": 1, "case_number": case_number}
+    
+    def close_driver(self):
+        pass
+
+def test_pipeline_overlaps_navigation_and_downloads(tmp_path):
+    cases = [f"25-CV-000{n}" for n in range(6)] + ["25-CV-LOST"]
+    SlowScraper.reset(cases)
+    runner = PipelinedBatchRunner(tmp_path, queue_size=1, scraper_class=SlowScraper,
+                                  journal=BatchJournal(tmp_path / "journal.jsonl"))
+    results = runner.run(cases)
+    
+    by_case = {result["case_number"]: result for result in results}
+    assert sorted(by_case) == sorted(cases)
+    assert all(result["success"] for case, result in by_case.items() if case != "25-CV-LOST")
+    assert by_case["25-CV-LOST"] == {"success": False, "error": "Navigation failed", "case_number": "25-CV-LOST",
+                                     "download_dir": str(tmp_path / "25-CV-LOST")}
+    # The browser navigated the next case while the previous one downloaded
+    assert SlowScraper.log.index(("navigate", "25-CV-0001")) < SlowScraper.log.index(("downloaded", "25-CV-0000"))
+    assert runner.stats["cases"] == 7 and runner.stats["max_queue_depth"] <= 1
+    assert BatchJournal(tmp_path / "journal.jsonl", resume=True).is_case_done("25-CV-0005")
+
+def test_interrupted_pipeline_drops_queued_pages(tmp_path):
+    cases = [f"25-CV-000{n}" for n in range(6)]
+    SlowScraper.reset(cases)
+    interrupted = threading.Event()
+    
+    class InterruptingScraper(SlowScraper):
+        def process_case_page(self, case_number, html_source, cookies, download_dir=None):
+            result = super().process_case_page(case_number, html_source, cookies, download_dir)
+            if case_number == "25-CV-0000":
+                # 25-CV-0001 is queued once the browser has moved on to 25-CV-0002
+                assert SlowScraper.navigating["25-CV-0002"].wait(5)
+                os.kill(os.getpid(), signal.SIGINT)
+                # Finish only once run() has stopped, with 25-CV-0001 still queued
+                assert interrupted.wait(5)
+            return result
+    
+    runner = PipelinedBatchRunner(tmp_path, queue_size=1, scraper_class=InterruptingScraper)
+    with pytest.raises(KeyboardInterrupt):
+        runner.run(cases)
+    interrupted.set()
+    for thread in threading.enumerate():
+        if thread.name.startswith(("navigation", "download-")):
+            thread.join(timeout=5)
+    
+    assert [case for stage, case in SlowScraper.log if stage == "download"] == ["25-CV-0000"]
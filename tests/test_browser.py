@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for the browser setup and navigation waits with a fake WebDriver (no browser required)
+"""
+
+import sys
+import time
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import court_scraper
+from court_scraper import GalvestonCourtScraper, LEAN_BLOCKED_URL_PATTERNS, DOCUMENT_LINK_SELECTOR
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+
+CASE_NUMBER = "25-CV-0880"
+CASE_RADIO = "//input[@type='radio' and contains(@id, 'Case')]"
+
+# Locators present on each portal page, and the page a click (or Enter) on them opens
+PORTAL_PAGES = {
+    "home": {(By.LINK_TEXT, "Civil and Family Case Records"): "search"},
+    "search": {(By.XPATH, "//input[@type='radio']"): None, (By.XPATH, CASE_RADIO): None,
+               (By.ID, "CaseSearchValue"): "results"},
+    "results": {(By.PARTIAL_LINK_TEXT, CASE_NUMBER): "detail"},
+    "detail": {(By.PARTIAL_LINK_TEXT, CASE_NUMBER): "documents"},
+    "documents": {(By.CSS_SELECTOR, DOCUMENT_LINK_SELECTOR): None},
+}
+
+class FakeChrome:
+    """webdriver.Chrome stand-in that records its options and DevTools commands"""
+    
+    def __init__(self, options=None):
+        self.options = options
+        self.cdp_commands = []
+    
+    def set_page_load_timeout(self, seconds):
+        pass
+    
+    def implicitly_wait(self, seconds):
+        self.implicit_wait = seconds
+    
+    def set_script_timeout(self, seconds):
+        pass
+    
+    def execute_cdp_cmd(self, command, params):
+        self.cdp_commands.append((command, params))
+    
+    def quit(self):
+        pass
+
+def start_browser(monkeypatch, **options) -> FakeChrome:
+    monkeypatch.setattr(court_scraper.webdriver, "Chrome", FakeChrome)
+    scraper = GalvestonCourtScraper(**options)
+    assert scraper.setup_driver()
+    return scraper.driver
+
+def test_lean_profile_blocks_subresources_and_loads_eagerly(monkeypatch):
+    driver = start_browser(monkeypatch, lean=True, blocked_url_patterns=["*tracker.example*"])
+    options = driver.options
+    
+    assert options.page_load_strategy == "eager"
+    prefs = options.experimental_options["prefs"]
+    for content in ("images", "stylesheets", "fonts"):
+        assert prefs[f"profile.managed_default_content_settings.{content}"] == 2
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+    assert "--disable-remote-fonts" in options.arguments
+    
+    blocked = dict(driver.cdp_commands)["Network.setBlockedURLs"]["urls"]
+    assert blocked == LEAN_BLOCKED_URL_PATTERNS + ["*tracker.example*"]
+    assert {"*.png", "*.css", "*.woff2", "*googletagmanager.com*", "*cdn.jsdelivr.net*"} <= set(blocked)
+    assert driver.implicit_wait == 0
+
+def test_standard_profile_loads_everything(monkeypatch):
+    driver = start_browser(monkeypatch)
+    
+    assert driver.options.page_load_strategy == "normal"
+    assert "prefs" not in driver.options.experimental_options
+    assert driver.cdp_commands == []
+
+class FakeElement:
+    """Element of a FakePortalDriver page; goes stale once the driver leaves that page"""
+    
+    def __init__(self, driver, page, target):
+        self.driver = driver
+        self.page = page
+        self.target = target
+    
+    def _check_attached(self):
+        if self.driver.page != self.page:
+            raise StaleElementReferenceException("element is not attached to the page document")
+    
+    def is_displayed(self):
+        self._check_attached()
+        return True
+    
+    def is_enabled(self):
+        self._check_attached()
+        return True
+    
+    def click(self):
+        self._check_attached()
+        if self.target:
+            self.driver.page = self.target
+    
+    def clear(self):
+        pass
+    
+    def send_keys(self, keys):
+        if keys == Keys.RETURN and self.target:
+            self.driver.page = self.target
+
+class FakePortalDriver:
+    """WebDriver stand-in that walks PORTAL_PAGES and records every element lookup"""
+    
+    def __init__(self, missing=()):
+        self.page = None
+        self.missing = set(missing)
+        self.lookups = []
+        self.current_url = "https://portal.example/documents"
+        self.page_source = f"<a href='ViewDocumentFragment.aspx?id=1'>{CASE_NUMBER}</a>"
+    
+    def get(self, url):
+        self.page = "home"
+    
+    def find_element(self, by, value):
+        self.lookups.append((self.page, by, value))
+        locators = PORTAL_PAGES[self.page]
+        if (by, value) not in locators or (by, value) in self.missing:
+            raise NoSuchElementException(f"{by}={value}")
+        return FakeElement(self, self.page, locators[(by, value)])
+    
+    def get_cookies(self):
+        return [{"name": "ASP.NET_SessionId", "value": "abc"}]
+    
+    def quit(self):
+        pass
+
+def fake_navigation_scraper(monkeypatch, driver) -> GalvestonCourtScraper:
+    def no_sleep(seconds):
+        raise AssertionError(f"navigation slept for {seconds}s instead of waiting on a condition")
+    monkeypatch.setattr(court_scraper.time, "sleep", no_sleep)
+    scraper = GalvestonCourtScraper()
+    scraper.driver = driver
+    return scraper
+
+def test_each_navigation_step_waits_on_its_condition(monkeypatch):
+    driver = FakePortalDriver()
+    scraper = fake_navigation_scraper(monkeypatch, driver)
+    
+    html, cookies = scraper.navigate_to_case(CASE_NUMBER, max_retries=0, use_deep_link=False)
+    
+    assert "ViewDocumentFragment.aspx" in html
+    assert cookies == {"ASP.NET_SessionId": "abc"}
+    assert driver.lookups == [
+        ("home", By.LINK_TEXT, "Civil and Family Case Records"),
+        ("search", By.XPATH, "//input[@type='radio']"),
+        ("search", By.XPATH, CASE_RADIO),
+        ("search", By.ID, "CaseSearchValue"),
+        ("results", By.PARTIAL_LINK_TEXT, CASE_NUMBER),
+        ("detail", By.PARTIAL_LINK_TEXT, CASE_NUMBER),
+        ("detail", By.PARTIAL_LINK_TEXT, CASE_NUMBER),
+        ("documents", By.CSS_SELECTOR, DOCUMENT_LINK_SELECTOR),
+    ]
+    assert [step for step, _ in scraper.step_timings] == [1, 2, 3, 4, 5, 6, 7]
+
+def test_navigation_timeout_takes_the_failure_path(monkeypatch, caplog):
+    driver = FakePortalDriver(missing=[(By.ID, "CaseSearchValue")])
+    scraper = fake_navigation_scraper(monkeypatch, driver)
+    timeouts = []
+    
+    def short_wait(wait_driver, timeout):
+        timeouts.append(timeout)
+        return WebDriverWait(wait_driver, 0.05, poll_frequency=0.01)
+    monkeypatch.setattr(court_scraper, "WebDriverWait", short_wait)
+    # WebDriverWait itself polls with time.sleep between checks
+    monkeypatch.setattr(court_scraper.time, "sleep", lambda seconds: None)
+    
+    started = time.perf_counter()
+    result = scraper.navigate_to_case(CASE_NUMBER, max_retries=0, use_deep_link=False)
+    
+    assert result is None
+    assert time.perf_counter() - started < 5
+    assert timeouts == [15, 10, 15, 15]
+    assert driver.page == "search"
+    assert f"All navigation attempts failed for case {CASE_NUMBER}" in caplog.text
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-interactive command line interface (no browser required)
+"""
+
+import sys
+import json
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import court_scraper
+from court_scraper import GalvestonCourtScraper, load_case_numbers, main
+
+def fake_scrape_case(self, case_number, download_dir=None):
+    """Stand-in for scrape_case that fails every case ending in 9"""
+    if case_number.endswith("9"):
+        return {"success": False, "error": "Navigation failed", "case_number": case_number}
+    return {"success": True, "documents": 2, "downloaded": 2, "secured": 0, "failed": 0,
+            "skipped": 0, "case_number": case_number}
+
+def test_load_case_numbers(tmp_path):
+    cases_file = tmp_path / "cases.txt"
+    cases_file.write_text("# backfill\n25-CV-0880\n\n 24-CV-1234 \n25-CV-0880\n", encoding="utf-8")
+    assert load_case_numbers(str(cases_file)) == ["25-CV-0880", "24-CV-1234"]
+
+def test_json_lines_and_exit_codes(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(GalvestonCourtScraper, "scrape_case", fake_scrape_case)
+    
+    code = main(["--case", "25-CV-0880", "--case", "24-CV-1234", "--out", str(tmp_path), "--json", "--workers", "2"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == court_scraper.EXIT_OK
+    assert sorted(line["case_number"] for line in lines) == ["24-CV-1234", "25-CV-0880"]
+    assert all(line["download_dir"].startswith(str(tmp_path)) for line in lines)
+    
+    code = main(["--case", "25-CV-0880", "--case", "24-CV-1239", "--out", str(tmp_path), "--json"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == court_scraper.EXIT_CASE_FAILED
+    assert [line["success"] for line in lines] == [True, False]
+
+def test_missing_cases_file_is_usage_error(tmp_path):
+    assert main(["--cases-file", str(tmp_path / "missing.txt")]) == court_scraper.EXIT_USAGE
+
+def test_date_filed_search_feeds_batch(tmp_path, monkeypatch, capsys):
+    found = [{"case_number": "25-CV-0010", "url": "https://portal.test/CaseDetail.aspx?CaseID=1000"},
+             {"case_number": "25-CV-0011", "url": "https://portal.test/CaseDetail.aspx?CaseID=1001"}]
+    searched = []
+    detail_urls = {}
+    
+    def fake_search(date_from, date_to, **kwargs):
+        searched.append((date_from, date_to))
+        return found
+    
+    def scrape_with_detail_url(self, case_number, download_dir=None):
+        detail_urls[case_number] = self.case_detail_urls.get(case_number)
+        return fake_scrape_case(self, case_number, download_dir)
+    
+    monkeypatch.setattr(court_scraper, "search_cases_filed", fake_search)
+    monkeypatch.setattr(GalvestonCourtScraper, "scrape_case", scrape_with_detail_url)
+    
+    code = main(["--filed-from", "01/01/2025", "--filed-to", "01/03/2025", "--case", "25-CV-0010",
+                 "--out", str(tmp_path), "--json"])
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == court_scraper.EXIT_OK
+    assert searched == [("01/01/2025", "01/03/2025")]
+    assert [line["case_number"] for line in lines] == ["25-CV-0010", "25-CV-0011"]
+    assert detail_urls == {case["case_number"]: case["url"] for case in found}
+
+def test_date_filed_search_needs_both_dates(tmp_path):
+    try:
+        main(["--filed-from", "01/01/2025", "--out", str(tmp_path)])
+    except SystemExit as e:
+        assert e.code == court_scraper.EXIT_USAGE
+    else:
+        raise AssertionError("expected a usage error")
+
+def test_list_mode_prints_csv_without_journal(tmp_path, monkeypatch, capsys):
+    def fake_listing(self, case_number, download_dir=None):
+        assert self.list_only and self.journal is None
+        record = {"index": 1, "date": "01/02/2025", "doc_type": "Order", "display_name": "Order",
+                  "fragment_id": "1000000", "filename": "2025.01.02_Order.pdf", "size": 0}
+        return {"success": True, "documents": 1, "selected": 1, "listing": [record], "case_number": case_number}
+    
+    monkeypatch.setattr(GalvestonCourtScraper, "scrape_case", fake_listing)
+    code = main(["--case", "25-CV-0880", "--case", "24-CV-1234", "--out", str(tmp_path),
+                 "--list", "--list-format", "csv"])
+    lines = capsys.readouterr().out.splitlines()
+    assert code == court_scraper.EXIT_OK
+    assert lines[0] == "case_number," + ",".join(court_scraper.LISTING_FIELDS)
+    assert sorted(line.split(",")[0] for line in lines[1:]) == ["24-CV-1234", "25-CV-0880"]
+    assert not (tmp_path / ".batch_journal.jsonl").exists()
+
+def test_pipeline_cannot_combine_with_processes(tmp_path):
+    try:
+        main(["--case", "25-CV-0880", "--out", str(tmp_path), "--pipeline", "--processes", "2"])
+    except SystemExit as e:
+        assert e.code == court_scraper.EXIT_USAGE
+    else:
+        raise AssertionError("expected a usage error")
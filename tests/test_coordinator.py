@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite job coordinator and worker mode (no browser required)
+"""
+
+import sys
+import time
+import threading
+import pytest
+import requests
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_coordinator import JobStore, CoordinatorServer, CoordinatorWorker, CoordinatorClient
+
+class FakeScraper:
+    """Scraper stand-in that succeeds immediately"""
+    
+    def __init__(self, headless=True, verbose=False, request_rate=1.0):
+        pass
+    
+    def scrape_case(self, case_number, download_dir=None):
+        time.sleep(0.05)
+        return {"success": True, "documents": 0, "downloaded": 0, "case_number": case_number}
+
+def test_expired_lease_is_reassigned(tmp_path):
+    store = JobStore(tmp_path / "jobs.db", max_attempts=2)
+    assert store.add_jobs(["25-CV-0001", "25-CV-0002"]) == 2
+    assert store.add_jobs(["25-CV-0001"]) == 0
+    
+    first = store.lease("worker-a", lease_seconds=0.05)
+    assert first["case_number"] == "25-CV-0001"
+    assert store.heartbeat("25-CV-0001", "worker-a", lease_seconds=0.05)
+    
+    # worker-a dies: its lease expires and worker-b picks the case up again
+    time.sleep(0.1)
+    assert not store.heartbeat("25-CV-0001", "worker-a")
+    again = store.lease("worker-b")
+    assert again["case_number"] == "25-CV-0001" and again["attempts"] == 2
+    assert not store.complete("25-CV-0001", "worker-a", {"success": True})
+    assert store.complete("25-CV-0001", "worker-b", {"success": True})
+    
+    # A failing case is retried until max_attempts, then marked failed
+    store.lease("worker-b")
+    assert store.complete("25-CV-0002", "worker-b", {"success": False, "error": "boom"})
+    store.lease("worker-b")
+    store.complete("25-CV-0002", "worker-b", {"success": False, "error": "boom"})
+    assert store.status()["counts"] == {"queued": 0, "leased": 0, "done": 1, "failed": 1}
+    store.close()
+
+def test_workers_drain_queue_over_http(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    server = CoordinatorServer(("127.0.0.1", 0), store, lease_seconds=5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        cases = [f"25-CV-{n:04d}" for n in range(8)]
+        assert CoordinatorClient(url).submit(cases) == 8
+        
+        processed = []
+        workers = [CoordinatorWorker(url, tmp_path / "out", worker_id=f"w{n}", poll_interval=0.05,
+                                     scraper_class=FakeScraper) for n in range(3)]
+        threads = [threading.Thread(target=lambda w=w: processed.append(w.run(exit_when_idle=True)))
+                   for w in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        
+        assert sum(processed) == 8
+        status = CoordinatorClient(url).status(include_jobs=True)
+        assert status["counts"]["done"] == 8
+        assert {job["result"]["worker"] for job in status["jobs"]} <= {"w0", "w1", "w2"}
+    finally:
+        server.shutdown()
+        server.server_close()
+        store.close()
+
+def test_malformed_requests_and_failed_writes_leave_the_store_usable(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    server = CoordinatorServer(("127.0.0.1", 0), store, lease_seconds=5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        store.add_jobs(["25-CV-0001"])
+        for path, payload in [("/lease", {}), ("/heartbeat", {"worker": "w0"}), ("/complete", {"case_number": "x"}),
+                              ("/jobs", {"case_numbers": "25-CV-0002"}), ("/lease", ["w0"])]:
+            response = requests.post(f"{url}{path}", json=payload, timeout=5)
+            assert response.status_code == 400 and response.json()["error"]
+        
+        assert store.lease("w0")["case_number"] == "25-CV-0001"
+        # A result that cannot be stored rolls its transaction back instead of leaving it open
+        with pytest.raises(TypeError):
+            store.complete("25-CV-0001", "w0", {"success": True, "log": object()})
+        assert store.complete("25-CV-0001", "w0", {"success": True})
+        assert store.status()["counts"]["done"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        store.close()
+
+def test_worker_survives_coordinator_errors_on_complete_and_status(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    server = CoordinatorServer(("127.0.0.1", 0), store, lease_seconds=5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    
+    class FlakyClient(CoordinatorClient):
+        """Fails the first complete and the first status request"""
+        failures = {"complete": 1, "status": 1}
+        
+        def _fail_once(self, call):
+            if self.failures[call]:
+                self.failures[call] -= 1
+                raise requests.ConnectionError(f"{call} failed")
+        
+        def complete(self, worker, case_number, result):
+            self._fail_once("complete")
+            return super().complete(worker, case_number, result)
+        
+        def status(self, include_jobs=False):
+            self._fail_once("status")
+            return super().status(include_jobs)
+    
+    try:
+        CoordinatorClient(url).submit(["25-CV-0001"])
+        worker = CoordinatorWorker(url, tmp_path / "out", worker_id="w0", poll_interval=0.05,
+                                   scraper_class=FakeScraper)
+        worker.client = FlakyClient(url)
+        assert worker.run(exit_when_idle=True) == 1
+        assert FlakyClient.failures == {"complete": 0, "status": 0}
+        # The result sent again after the failure was recorded
+        assert store.status()["counts"]["done"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+        store.close()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the deep-link cache and its navigation fallback (no browser required)
+"""
+
+import sys
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_deeplinks import DeepLinkCache
+from court_scraper import GalvestonCourtScraper
+
+DOCUMENT_PAGE = "https://example.test/PublicAccess/CaseDetail.aspx?CaseID=1000&Documents=1"
+
+def test_cache_persists_and_discards(tmp_path):
+    path = tmp_path / "links.jsonl"
+    cache = DeepLinkCache(path)
+    cache.record("25-CV-0880", DOCUMENT_PAGE)
+    cache.record("25-CV-0881", DOCUMENT_PAGE + "1")
+    cache.discard("25-CV-0881")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"case_number": "25-CV-0882", "ur')
+
+    reloaded = DeepLinkCache(path)
+    assert reloaded.get("25-CV-0880") == DOCUMENT_PAGE
+    assert reloaded.get("25-CV-0881") is None
+    assert len(reloaded) == 1
+
+def test_cached_case_skips_full_navigation(tmp_path, monkeypatch):
+    scraper = GalvestonCourtScraper(deep_link_cache=tmp_path / "links.jsonl")
+    scraper.deep_link_cache.record("25-CV-0880", DOCUMENT_PAGE)
+    opened = []
+    monkeypatch.setattr(scraper, "_navigate_deep_link", lambda case, url: opened.append(url) or ("<html/>", {}))
+    monkeypatch.setattr(scraper, "_perform_navigation", lambda case: unexpected_full_navigation())
+
+    assert scraper.navigate_to_case("25-CV-0880") == ("<html/>", {})
+    assert opened == [DOCUMENT_PAGE]
+
+def test_failed_deep_link_falls_back_and_is_discarded(tmp_path, monkeypatch):
+    scraper = GalvestonCourtScraper(deep_link_cache=tmp_path / "links.jsonl")
+    scraper.deep_link_cache.record("25-CV-0880", DOCUMENT_PAGE)
+    navigated = []
+
+    def stale_link(case_number, url):
+        raise Exception("Cached page does not show the case number")
+
+    monkeypatch.setattr(scraper, "_navigate_deep_link", stale_link)
+    monkeypatch.setattr(scraper, "_perform_navigation", lambda case: navigated.append(case) or ("<html/>", {}))
+
+    assert scraper.navigate_to_case("25-CV-0880") == ("<html/>", {})
+    assert navigated == ["25-CV-0880"]
+    assert DeepLinkCache(tmp_path / "links.jsonl").get("25-CV-0880") is None
+
+def test_scrapers_of_a_process_share_one_cache(tmp_path, monkeypatch):
+    loads = []
+    monkeypatch.setattr(DeepLinkCache, "_load", lambda self: loads.append(self.path))
+    first = GalvestonCourtScraper(deep_link_cache=tmp_path / "shared.jsonl")
+    second = GalvestonCourtScraper(deep_link_cache=str(tmp_path / "shared.jsonl"))
+
+    assert first.deep_link_cache is second.deep_link_cache
+    assert len(loads) == 1
+
+def unexpected_full_navigation():
+    raise AssertionError("full navigation should not run for a cached case")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for document downloads against the local mock portal (no browser required)
+"""
+
+import sys
+import pytest
+import requests
+from bs4 import BeautifulSoup
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import court_scraper
+from court_journal import BatchJournal
+from court_scraper import GalvestonCourtScraper
+from mock_portal import MockPortal, SESSION_COOKIE
+
+def portal_cookies(portal: MockPortal) -> dict:
+    """Open the landing page like the browser does and return the session cookies"""
+    response = requests.get(f"{portal.base_url}default.aspx", timeout=10)
+    return {SESSION_COOKIE: response.cookies[SESSION_COOKIE]}
+
+def case_documents(portal: MockPortal, scraper: GalvestonCourtScraper, case_number: str):
+    case_id = portal.case_id(case_number)
+    html = requests.get(f"{portal.base_url}CaseDetail.aspx?CaseID={case_id}&Documents=1", timeout=10).text
+    return scraper.parse_documents(html)
+
+def test_downloads_and_secured_placeholders(tmp_path):
+    with MockPortal(documents_per_case=4, asset_delay=0, secured_fragments=["1000001"]) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url)
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        stats = scraper.download_documents(documents, tmp_path, portal_cookies(portal))
+
+    assert stats == {"successful": 3, "failed": 0, "skipped": 0, "secured": 1, "session_renewals": 0,
+                     "first_try": 3, "recovered": 0, "permanent_failures": [],
+                     "first_document_seconds": stats["first_document_seconds"]}
+    assert len(list(tmp_path.glob("*.pdf"))) == 4
+    assert stats["first_document_seconds"] > 0
+
+@pytest.mark.parametrize("backend", ["requests", "httpx"])
+def test_http_backends_send_case_cookies(tmp_path, backend):
+    if backend == "httpx":
+        pytest.importorskip("httpx")
+    # Documents need the session cookie: without it every request gets the timeout page
+    with MockPortal(documents_per_case=4, asset_delay=0, session_document_limit=10) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, http_backend=backend,
+                                        connect_timeout=2, read_timeout=5)
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        stats = scraper.download_documents(documents, tmp_path, portal_cookies(portal))
+
+    assert stats["successful"] == 4
+
+def test_cases_share_warm_connections(tmp_path):
+    with MockPortal(documents_per_case=3, asset_delay=0, session_document_limit=10) as portal:
+        connections = portal.connection_count
+        for case_number in ("25-CV-0880", "25-CV-0881"):
+            # Each case has its own scraper and portal session but the same download pool
+            scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, http_pool_size=7)
+            documents = case_documents(portal, scraper, case_number)
+            connections += 2  # landing page and document list fetched by the test itself
+            stats = scraper.download_documents(documents, tmp_path / case_number, portal_cookies(portal))
+            assert stats["successful"] == 3
+        document_connections = portal.connection_count - connections
+
+    assert document_connections == 1
+
+def test_expired_session_is_renewed_and_documents_refetched(tmp_path, monkeypatch):
+    with MockPortal(documents_per_case=8, asset_delay=0, session_document_limit=5) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url)
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        renewals = []
+
+        def navigate_to_case(case_number, max_retries=None, use_deep_link=True):
+            renewals.append(case_number)
+            return "", portal_cookies(portal)
+
+        monkeypatch.setattr(scraper, "navigate_to_case", navigate_to_case)
+        stats = scraper.download_documents(documents, tmp_path, portal_cookies(portal),
+                                           case_number="25-CV-0880")
+
+    assert renewals == ["25-CV-0880"]
+    assert stats == {"successful": 8, "failed": 0, "skipped": 0, "secured": 0, "session_renewals": 1,
+                     "first_try": 8, "recovered": 0, "permanent_failures": [],
+                     "first_document_seconds": stats["first_document_seconds"]}
+    for path in tmp_path.glob("*.pdf"):
+        assert path.read_bytes().startswith(b"%PDF-1.4\n% Mock document")
+
+def test_expired_session_without_case_number_is_not_renewed(tmp_path):
+    with MockPortal(documents_per_case=4, asset_delay=0, session_document_limit=1) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url)
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        stats = scraper.download_documents(documents, tmp_path, portal_cookies(portal))
+
+    # Three timeout pages in a row are an expired session, not secured documents: nothing is saved for them
+    assert stats == {"successful": 1, "failed": 3, "skipped": 0, "secured": 0, "session_renewals": 0,
+                     "first_try": 1, "recovered": 0, "permanent_failures": [doc.filename for doc in documents[1:]],
+                     "first_document_seconds": stats["first_document_seconds"]}
+    assert sorted(path.name for path in tmp_path.iterdir()) == [documents[0].filename]
+
+def test_unrenewed_expired_documents_are_downloaded_on_resume(tmp_path, monkeypatch):
+    with MockPortal(documents_per_case=6, asset_delay=0, session_document_limit=2) as portal:
+        journal = BatchJournal(tmp_path / "journal.jsonl")
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, journal=journal)
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        renewals = []
+        monkeypatch.setattr(scraper, "_renew_session", lambda case_number: renewals.append(case_number))
+        stats = scraper.download_documents(documents, tmp_path / "case", portal_cookies(portal),
+                                           case_number="25-CV-0880")
+        # The failed renewal is not retried for every further timeout page
+        assert renewals == ["25-CV-0880"]
+        assert (stats["successful"], stats["secured"], stats["failed"]) == (2, 0, 4)
+        assert len(list((tmp_path / "case").iterdir())) == 2
+
+        # A leftover session-expired placeholder (from an older run) is not a finished document either
+        scraper._create_placeholder_pdf(tmp_path / "case" / documents[2].filename, documents[2].filename,
+                                        court_scraper.EXPIRED_PLACEHOLDER_REASON)
+        resumed = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                        journal=BatchJournal(tmp_path / "journal.jsonl", resume=True))
+        requests_before = len(portal.request_log)
+        again = resumed.download_documents(documents, tmp_path / "case", portal_cookies(portal),
+                                           case_number="25-CV-0880")
+        document_requests = [path for path in portal.request_log[requests_before:] if "DocumentFragmentID" in path]
+
+    assert (again["skipped"], again["successful"]) == (2, 2) and len(document_requests) >= 3
+    for doc in documents[2:4]:
+        assert (tmp_path / "case" / doc.filename).read_bytes().startswith(b"%PDF-1.4\n% Mock document")
+
+def test_mock_date_filed_search_pages():
+    with MockPortal(asset_delay=0, cases_per_day=3, search_page_size=4) as portal:
+        scraper = GalvestonCourtScraper()
+        url = f"{portal.base_url}Search.aspx?DateFiledOnAfter=01/01/2025&DateFiledOnBefore=01/02/2025"
+        case_numbers = []
+        while url:
+            html = requests.get(url, timeout=10).text
+            case_numbers += [row["case_number"] for row in scraper.extract_case_links(html)]
+            next_link = BeautifulSoup(html, "html.parser").find("a", string="Next")
+            url = requests.compat.urljoin(url, next_link["href"]) if next_link else None
+
+    assert case_numbers == ["25-CV-0010", "25-CV-0011", "25-CV-0012", "25-CV-0020", "25-CV-0021", "25-CV-0022"]
+
+def test_listing_reports_head_sizes_without_downloading(tmp_path, monkeypatch):
+    with MockPortal(documents_per_case=3, asset_delay=0, pdf_size=12_345) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, list_only=True, head_sizes=True)
+        case_id = portal.case_id("25-CV-0880")
+        html = requests.get(f"{portal.base_url}CaseDetail.aspx?CaseID={case_id}&Documents=1", timeout=10).text
+        cookies = portal_cookies(portal)
+        monkeypatch.setattr(scraper, "navigate_to_case", lambda case_number: (html, cookies))
+        result = scraper.scrape_case("25-CV-0880", tmp_path / "25-CV-0880")
+        methods = portal.request_log
+
+    assert result["success"] and result["selected"] == 3
+    assert [record["fragment_id"] for record in result["listing"]] == ["1000000", "1000001", "1000002"]
+    assert all(record["size"] == 12_345 for record in result["listing"])
+    assert set(result["listing"][0]) == set(court_scraper.LISTING_FIELDS)
+    assert not (tmp_path / "25-CV-0880").exists()
+    assert "downloaded" not in result and len(methods) == 2 + 3
+
+def test_downloads_start_before_parsing_finishes(tmp_path):
+    with MockPortal(documents_per_case=5, asset_delay=0) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url)
+        case_id = portal.case_id("25-CV-0880")
+        html = requests.get(f"{portal.base_url}CaseDetail.aspx?CaseID={case_id}&Documents=1", timeout=10).text
+        events = []
+
+        def parsed_documents():
+            for doc in scraper.iter_documents(html):
+                events.append(("parsed", doc.fragment_id))
+                yield doc
+                events.append(("resumed", len(list(tmp_path.glob("*.pdf")))))
+
+        stats = scraper.download_documents(parsed_documents(), tmp_path, portal_cookies(portal))
+
+    assert stats["successful"] == 5
+    # Parsing only resumes after the previous document has been saved
+    assert [count for event, count in events if event == "resumed"] == [1, 2, 3, 4, 5]
+
+def test_streamed_download_reports_unknown_total_until_parsing_ends(tmp_path):
+    with MockPortal(documents_per_case=3, asset_delay=0) as portal:
+        progress = []
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                        progress_callback=lambda info: progress.append(info))
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        stats = scraper.download_documents(iter(documents), tmp_path, portal_cookies(portal))
+        streamed = [(info["step"], info["total_steps"], info["percentage"]) for info in progress
+                    if info["phase"] == "download"]
+        progress.clear()
+        scraper.download_documents(documents, tmp_path / "list", portal_cookies(portal))
+
+    assert stats["successful"] == 3
+    # While documents are still being parsed the count grows and no total or percentage is claimed
+    assert streamed == [(0, None, None), (1, None, None), (2, None, None), (3, None, None)]
+    assert [(info["step"], info["total_steps"]) for info in progress if info["phase"] == "download"] == \
+        [(0, 3), (1, 3), (2, 3), (3, 3)]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the scrape event stream (no browser required)
+"""
+
+import sys
+import asyncio
+import requests
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_events import CaseSummary, DocumentBytes, DocumentFinished, DocumentStarted, ParseEvent
+from court_scraper import GalvestonCourtScraper
+from mock_portal import MockPortal
+from test_downloads import portal_cookies
+
+def portal_scraper(portal: MockPortal, monkeypatch) -> GalvestonCourtScraper:
+    """Scraper whose navigation fetches the case's document page without a browser"""
+    scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url)
+    case_id = portal.case_id("25-CV-0880")
+    html = requests.get(f"{portal.base_url}CaseDetail.aspx?CaseID={case_id}&Documents=1", timeout=10).text
+    cookies = portal_cookies(portal)
+    monkeypatch.setattr(scraper, "navigate_to_case", lambda case_number: (html, cookies))
+    return scraper
+
+def test_events_follow_each_document(tmp_path, monkeypatch):
+    with MockPortal(documents_per_case=3, asset_delay=0, pdf_size=5_000, secured_fragments=["1000001"]) as portal:
+        scraper = portal_scraper(portal, monkeypatch)
+        events = list(scraper.scrape_case_iter("25-CV-0880", tmp_path, max_pending=1))
+
+    assert isinstance(events[0], ParseEvent)
+    per_document = [type(event) for event in events[1:-1]]
+    assert per_document == [DocumentStarted, DocumentBytes, DocumentFinished] * 3
+    assert [event.status for event in events if isinstance(event, DocumentFinished)] == ["success", "secured", "success"]
+    assert events[2].received == events[2].total == 5_000
+    summary = events[-1]
+    assert isinstance(summary, CaseSummary) and summary.result["downloaded"] == 2
+    assert all(event.case_number == "25-CV-0880" for event in events)
+    assert summary.to_dict()["kind"] == "summary"
+
+def test_closing_the_stream_stops_the_scrape(tmp_path, monkeypatch):
+    with MockPortal(documents_per_case=10, asset_delay=0) as portal:
+        scraper = portal_scraper(portal, monkeypatch)
+        stream = scraper.scrape_case_iter("25-CV-0880", tmp_path, max_pending=1)
+        for event in stream:
+            if isinstance(event, DocumentFinished):
+                break
+        stream.close()
+        requested = [path for path in portal.request_log if "DocumentFragmentID" in path]
+
+    # The consumer stopped after the first document: the queued event and the one
+    # being delivered are the only documents fetched after it
+    assert len(requested) <= 3
+    assert scraper.event_sink is None
+
+def test_async_stream(tmp_path, monkeypatch):
+    with MockPortal(documents_per_case=2, asset_delay=0) as portal:
+        scraper = portal_scraper(portal, monkeypatch)
+
+        async def consume():
+            return [event async for event in scraper.scrape_case_aiter("25-CV-0880", tmp_path, max_pending=2)]
+
+        events = asyncio.run(consume())
+
+    assert [event.status for event in events if isinstance(event, DocumentFinished)] == ["success", "success"]
+    assert events[-1].result["downloaded"] == 2
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for stable per-case document filenames (no browser required)
+"""
+
+import sys
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_filenames import FilenameRegistry, FILENAME_MAP_FILENAME
+from court_scraper import GalvestonCourtScraper
+from test_parsing import DOCKET_HTML
+
+def test_names_survive_a_shifted_docket(tmp_path):
+    scraper = GalvestonCourtScraper()
+    rows = scraper.extract_document_rows(DOCKET_HTML)
+    first = scraper.parse_documents(rows, FilenameRegistry.for_case(tmp_path))
+
+    # The next run sees the two "Order" rows in the opposite order
+    rows[2], rows[3] = rows[3], rows[2]
+    second = scraper.parse_documents(rows, FilenameRegistry.for_case(tmp_path))
+
+    assert {doc.fragment_id: doc.filename for doc in first} == {doc.fragment_id: doc.filename for doc in second}
+    assert {doc.fragment_id: doc.filename for doc in second}["104"] == "2025.01.20_Order_(ID104).pdf"
+
+def test_new_document_does_not_take_an_assigned_name(tmp_path):
+    registry = FilenameRegistry(tmp_path / FILENAME_MAP_FILENAME)
+    assert registry.assign("2025.01.20_Order", "104") == "2025.01.20_Order.pdf"
+    registry.flush()
+    reloaded = FilenameRegistry(tmp_path / FILENAME_MAP_FILENAME)
+    assert reloaded.assign("2025.01.20_Order", "103") == "2025.01.20_Order_(ID103).pdf"
+    assert reloaded.get("104") == "2025.01.20_Order.pdf" and len(reloaded) == 2
+
+def test_cases_have_separate_namespaces(tmp_path):
+    scraper = GalvestonCourtScraper()
+    for case_number in ("25-CV-0880", "25-CV-0881"):
+        documents = scraper.parse_documents(DOCKET_HTML, FilenameRegistry.for_case(tmp_path / case_number))
+        assert documents[2].filename == "2025.01.20_Order.pdf"
+    # Without a registry every parse starts a fresh in-memory namespace
+    assert scraper.parse_documents(DOCKET_HTML)[2].filename == "2025.01.20_Order.pdf"
+
+def test_listing_registry_does_not_write(tmp_path):
+    registry = FilenameRegistry.for_case(tmp_path, persist=False)
+    registry.assign("2025.01.20_Order", "104")
+    registry.assign("2025.01.20_Order", "unknown")
+    registry.flush()
+    assert not (tmp_path / FILENAME_MAP_FILENAME).exists()
+    assert len(registry) == 1
+
+def test_names_are_written_once_per_parsed_case(tmp_path, monkeypatch):
+    scraper = GalvestonCourtScraper()
+    registry = FilenameRegistry.for_case(tmp_path)
+    fsyncs = []
+    monkeypatch.setattr("court_filenames.os.fsync", fsyncs.append)
+
+    documents = scraper.iter_documents(DOCKET_HTML, registry)
+    next(documents)
+    assert not (tmp_path / FILENAME_MAP_FILENAME).exists()
+    rest = list(documents)
+
+    assert len(fsyncs) == 1
+    assert len(FilenameRegistry.for_case(tmp_path)) == len(rest) + 1
+    # A parse that changes no names does not touch the file again
+    scraper.parse_documents(DOCKET_HTML, FilenameRegistry.for_case(tmp_path))
+    assert len(fsyncs) == 1
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for document filters (no browser required)
+"""
+
+import sys
+import pytest
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import court_scraper
+from court_scraper import GalvestonCourtScraper, DocumentFilter, main
+from test_parsing import DOCKET_HTML
+
+def parsed_documents():
+    return GalvestonCourtScraper().parse_documents(DOCKET_HTML)
+
+def test_date_range_and_patterns():
+    documents = parsed_documents()
+    assert [doc.fragment_id for doc in DocumentFilter(date_from="01/16/2025").apply(documents)] == ["102", "103", "104"]
+    assert [doc.fragment_id for doc in DocumentFilter(date_to="01/15/2025").apply(documents)] == ["101"]
+    # include/exclude look at both doc_type and display_name, ignoring case
+    assert [doc.fragment_id for doc in DocumentFilter(include="granting").apply(documents)] == ["102"]
+    assert [doc.fragment_id for doc in DocumentFilter(include="order", exclude="motion").apply(documents)] == ["103", "104"]
+    assert [doc.fragment_id for doc in DocumentFilter(fragment_ids=["101", " 104"]).apply(documents)] == ["101", "104"]
+    assert not DocumentFilter().active
+
+def test_invalid_filters_raise_value_error():
+    with pytest.raises(ValueError):
+        DocumentFilter(date_from="2025-01-01")
+    with pytest.raises(ValueError):
+        DocumentFilter(include="(unclosed")
+
+def test_filtered_documents_are_never_requested(tmp_path, monkeypatch):
+    scraper = GalvestonCourtScraper(document_filter=DocumentFilter(include="petition"))
+    requested = []
+    monkeypatch.setattr(scraper, "navigate_to_case", lambda case_number: (DOCKET_HTML, {}))
+
+    def download_documents(documents, download_dir, cookies, case_number=None):
+        requested.extend(documents)
+        return {"successful": len(requested), "failed": 0, "skipped": 0, "secured": 0, "session_renewals": 0,
+                "first_try": len(requested), "recovered": 0, "permanent_failures": [], "first_document_seconds": 0.1}
+
+    monkeypatch.setattr(scraper, "download_documents", download_documents)
+    monkeypatch.setattr(scraper, "create_manifest", lambda download_dir: None)
+
+    result = scraper.scrape_case("25-CV-0880", tmp_path)
+    assert [doc.fragment_id for doc in requested] == ["101"]
+    assert (result["documents"], result["selected"], result["downloaded"]) == (4, 1, 1)
+
+def test_cli_rejects_invalid_filter(tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--case", "25-CV-0880", "--out", str(tmp_path), "--docs-from", "yesterday"])
+    assert exit_info.value.code == court_scraper.EXIT_USAGE
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the checkpoint journal and resumable batch runs (no browser required)
+"""
+
+import sys
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_journal import BatchJournal
+from court_scraper import GalvestonCourtScraper, DocumentInfo, run_cases
+
+def make_document(index: int) -> DocumentInfo:
+    return DocumentInfo(index=index, filename=f"2025.01.0{index}_Order.pdf",
+                        url=f"ViewDocumentFragment.aspx?DocumentFragmentID={index}",
+                        fragment_id=str(index), date=f"01/0{index}/2025",
+                        display_name="Order", doc_type="Order")
+
+def test_journal_survives_truncated_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = BatchJournal(path)
+    journal.record_document("25-CV-0880", "1", "a.pdf", "success")
+    journal.record_case("25-CV-0880", {"success": True, "failed": 0, "case_number": "25-CV-0880"})
+    journal.record_case("25-CV-0881", {"success": True, "failed": 2, "case_number": "25-CV-0881"})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "document", "case_nu')
+    
+    resumed = BatchJournal(path, resume=True)
+    assert resumed.is_document_done("25-CV-0880", "1")
+    assert resumed.is_case_done("25-CV-0880")
+    assert not resumed.is_case_done("25-CV-0881")
+    assert BatchJournal(path).cases == {}
+
+def test_finished_documents_are_not_requested(tmp_path):
+    journal = BatchJournal(tmp_path / "journal.jsonl")
+    for index in (1, 2):
+        journal.record_document("25-CV-0880", str(index), f"doc{index}.pdf", "success")
+    
+    scraper = GalvestonCourtScraper(request_rate=0, journal=journal)
+    # Nothing listens here: any request would count as a failure
+    scraper.base_url = "http://127.0.0.1:9/"
+    stats = scraper.download_documents([make_document(1), make_document(2)], tmp_path / "case",
+                                       case_number="25-CV-0880")
+    assert stats == {"successful": 0, "failed": 0, "skipped": 2, "secured": 0, "session_renewals": 0,
+                     "first_try": 0, "recovered": 0, "permanent_failures": [],
+                     "first_document_seconds": None}
+
+def test_resume_skips_finished_cases(tmp_path, monkeypatch):
+    journal = BatchJournal(tmp_path / "journal.jsonl")
+    journal.record_case("25-CV-0880", {"success": True, "failed": 0, "documents": 3, "case_number": "25-CV-0880"})
+    
+    navigated = []
+    def fake_scrape_case(self, case_number, download_dir=None):
+        navigated.append(case_number)
+        return {"success": True, "documents": 1, "failed": 0, "case_number": case_number}
+    monkeypatch.setattr(GalvestonCourtScraper, "scrape_case", fake_scrape_case)
+    
+    results = run_cases(["25-CV-0880", "24-CV-1234"], tmp_path,
+                        journal=BatchJournal(tmp_path / "journal.jsonl", resume=True))
+    assert navigated == ["24-CV-1234"]
+    assert [result.get("resumed", False) for result in results] == [True, False]
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for download priority scheduling (no browser required)
+"""
+
+import sys
+import pytest
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_scraper import GalvestonCourtScraper, DownloadPriority
+from mock_portal import MockPortal
+from test_downloads import case_documents, portal_cookies
+from test_parsing import DOCKET_HTML
+
+def parsed_documents():
+    return GalvestonCourtScraper().parse_documents(DOCKET_HTML)
+
+def test_newest_first_and_type_groups():
+    documents = parsed_documents()
+    assert [doc.fragment_id for doc in DownloadPriority().sort(documents)] == ["101", "102", "103", "104"]
+    assert [doc.fragment_id for doc in DownloadPriority(order="newest").sort(documents)] == ["102", "103", "104", "101"]
+    # Type groups first, in pattern order, then the rest; docket order within a group
+    ordered = DownloadPriority(types=["granting", "petition"]).sort(documents)
+    assert [doc.fragment_id for doc in ordered] == ["102", "101", "103", "104"]
+
+def test_invalid_priority_raises_value_error():
+    with pytest.raises(ValueError):
+        DownloadPriority(order="largest")
+    with pytest.raises(ValueError):
+        DownloadPriority(types=["(unclosed"])
+
+def test_smallest_first_uses_head_sizes(tmp_path):
+    sizes = {"1000000": 90_000, "1000001": 5_000, "1000002": 40_000}
+    with MockPortal(documents_per_case=3, asset_delay=0, document_sizes=sizes) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                        download_priority=DownloadPriority(order="smallest"))
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        stats = scraper.download_documents(documents, tmp_path, portal_cookies(portal))
+        fragments = [path.rsplit("=", 1)[1] for path in portal.request_log if "DocumentFragmentID" in path]
+
+    # Three HEAD requests (any order), then the downloads smallest first
+    assert sorted(fragments[:3]) == sorted(sizes)
+    assert fragments[3:] == ["1000001", "1000002", "1000000"]
+    assert stats["successful"] == 3 and stats["first_document_seconds"] > 0
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the retry policy and circuit breaker (no browser required)
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from email.utils import formatdate
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_retry import RetryPolicy, CircuitBreaker, parse_retry_after
+from court_scraper import GalvestonCourtScraper, DocumentInfo
+from mock_portal import MockPortal
+
+def make_document(url: str) -> DocumentInfo:
+    return DocumentInfo(index=1, filename="2025.01.01_Order.pdf", url=url, fragment_id="1000000",
+                        date="01/01/2025", display_name="Order", doc_type="Order")
+
+def test_backoff_grows_with_jitter_and_cap():
+    policy = RetryPolicy(base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=0.5)
+    for attempt, full in ((1, 1.0), (2, 2.0), (3, 4.0), (6, 5.0)):
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert all(full * 0.5 <= delay <= full for delay in delays)
+    assert RetryPolicy(jitter=0).delay(1, retry_after=3) == 3
+    assert RetryPolicy(jitter=0, max_retry_after=2).delay(1, retry_after=30) == 2
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert 50 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+def test_circuit_breaker_pauses_until_trial_succeeds():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+
+    # The first caller after the reset timeout gets the trial request, the others wait for it
+    waits = []
+    def worker():
+        waits.append(breaker.before_request())
+    trial_wait = breaker.before_request()
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    assert waits == []
+    breaker.record_success()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert trial_wait >= 0.15
+    assert len(waits) == 3 and not breaker.is_open
+
+def test_unavailable_portal_is_retried_after_retry_after(tmp_path):
+    with MockPortal(asset_delay=0, unavailable_documents=2, retry_after="1") as portal:
+        policy = RetryPolicy(base_delay=0.01, max_retry_after=0.2)
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, retry_policy=policy)
+        started = time.monotonic()
+        stats = scraper.download_documents([make_document("ViewDocumentFragment.aspx?DocumentFragmentID=1000000")],
+                                           tmp_path)
+        elapsed = time.monotonic() - started
+
+    assert stats["successful"] == 1
+    assert elapsed >= 0.4
+
+def test_client_errors_are_not_retried(tmp_path):
+    with MockPortal(asset_delay=0) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                        retry_policy=RetryPolicy(base_delay=0.01))
+        stats = scraper.download_documents([make_document("Missing.aspx")], tmp_path)
+        requests_made = [path for path in portal.request_log if "Missing.aspx" in path]
+
+    assert stats["failed"] == 1
+    assert len(requests_made) == 1
+
+def test_failed_document_is_deferred_behind_the_others(tmp_path):
+    with MockPortal(documents_per_case=3, asset_delay=0, unavailable_documents=1, retry_after="1") as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                        retry_policy=RetryPolicy(base_delay=0.01, max_retry_after=0.2))
+        documents = [make_document(f"ViewDocumentFragment.aspx?DocumentFragmentID={1000000 + n}") for n in range(3)]
+        for n, doc in enumerate(documents):
+            doc.filename = f"doc{n}.pdf"
+        stats = scraper.download_documents(documents, tmp_path)
+        fragments = [path.rsplit("=", 1)[1] for path in portal.request_log if "DocumentFragmentID" in path]
+
+    assert fragments == ["1000000", "1000001", "1000002", "1000000"]
+    assert (stats["first_try"], stats["recovered"], stats["failed"]) == (2, 1, 0)
+
+def test_permanent_failures_are_listed(tmp_path):
+    with MockPortal(asset_delay=0, unavailable_documents=10) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url,
+                                        retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01))
+        stats = scraper.download_documents([make_document("ViewDocumentFragment.aspx?DocumentFragmentID=1000000")],
+                                           tmp_path)
+
+    assert stats["failed"] == 1
+    assert stats["permanent_failures"] == ["2025.01.01_Order.pdf"]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide download scheduler (no browser required)
+"""
+
+import sys
+import time
+import threading
+import pytest
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import court_scraper
+from court_retry import RetryPolicy
+from court_scheduler import DownloadScheduler, SchedulerOverloaded
+from court_scraper import GalvestonCourtScraper
+from mock_portal import MockPortal
+from test_downloads import case_documents
+
+def wait_for_waiters(scheduler: DownloadScheduler, count: int):
+    deadline = time.monotonic() + 5
+    while scheduler.stats()["waiting"] < count:
+        assert time.monotonic() < deadline, "waiters did not queue"
+        time.sleep(0.01)
+
+def start(target, *args) -> threading.Thread:
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    return thread
+
+def test_new_case_is_served_before_busy_case():
+    scheduler = DownloadScheduler(max_concurrent=1)
+    for _ in range(10):
+        scheduler.acquire("big")
+        scheduler.release("big")
+    scheduler.acquire("holder")
+    order = []
+
+    def request(case_id):
+        scheduler.acquire(case_id)
+        order.append(case_id)
+        scheduler.release(case_id)
+
+    threads = [start(request, "big")]
+    wait_for_waiters(scheduler, 1)
+    threads.append(start(request, "small"))
+    wait_for_waiters(scheduler, 2)
+    scheduler.release("holder")
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == ["small", "big"]
+
+def test_full_queue_sheds_lowest_priority():
+    scheduler = DownloadScheduler(max_concurrent=1, max_waiting=1)
+    scheduler.acquire("holder")
+    outcomes = {}
+
+    def request(case_id, priority):
+        try:
+            scheduler.acquire(case_id, priority)
+            outcomes[case_id] = "granted"
+            scheduler.release(case_id)
+        except SchedulerOverloaded:
+            outcomes[case_id] = "shed"
+
+    threads = [start(request, "routine", 0)]
+    wait_for_waiters(scheduler, 1)
+    threads.append(start(request, "urgent", 1))
+    threads[0].join(timeout=5)
+    scheduler.release("holder")
+    threads[1].join(timeout=5)
+
+    assert outcomes == {"routine": "shed", "urgent": "granted"}
+    assert scheduler.stats()["shed"] == 1
+
+def test_bandwidth_debt_delays_next_request():
+    scheduler = DownloadScheduler(max_concurrent=4, max_bytes_per_second=100_000)
+    scheduler.acquire("case")
+    scheduler.release("case", nbytes=150_000)
+    assert scheduler.acquire("case") >= 0.4
+
+def test_invalid_concurrency_raises_value_error():
+    with pytest.raises(ValueError):
+        DownloadScheduler(max_concurrent=0)
+
+def test_small_case_finishes_while_large_case_downloads(tmp_path):
+    with MockPortal(documents_per_case=12, asset_delay=0, pdf_size=200_000) as portal:
+        finished = {}
+
+        def run_case(case_number, count, delay):
+            time.sleep(delay)
+            scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, download_slots=1,
+                                            download_bandwidth=1_000_000)
+            documents = case_documents(portal, scraper, case_number)[:count]
+            stats = scraper.download_documents(documents, tmp_path / case_number, case_number=case_number)
+            finished[case_number] = (time.monotonic(), stats["successful"])
+
+        threads = [start(run_case, "25-CV-0880", 12, 0), start(run_case, "25-CV-0881", 2, 0.3)]
+        for thread in threads:
+            thread.join(timeout=30)
+
+    assert finished["25-CV-0881"][1] == 2 and finished["25-CV-0880"][1] == 12
+    assert finished["25-CV-0881"][0] < finished["25-CV-0880"][0]
+
+class SheddingScheduler(DownloadScheduler):
+    """Sheds the first `sheds` requests and records the bytes charged by every release"""
+
+    def __init__(self, sheds: int):
+        super().__init__(max_concurrent=4)
+        self.sheds = sheds
+        self.charged = []
+
+    def acquire(self, case_id, priority=0):
+        if self.sheds:
+            self.sheds -= 1
+            raise SchedulerOverloaded("shed")
+        return super().acquire(case_id, priority)
+
+    def release(self, case_id, nbytes=0):
+        self.charged.append(nbytes)
+        super().release(case_id, nbytes)
+
+def test_shed_requests_do_not_use_up_retries(tmp_path, monkeypatch):
+    scheduler = SheddingScheduler(sheds=5)
+    monkeypatch.setattr(court_scraper, "shared_download_scheduler", lambda *args: scheduler)
+    with MockPortal(documents_per_case=2, asset_delay=0, unavailable_documents=1) as portal:
+        scraper = GalvestonCourtScraper(request_rate=0, base_url=portal.base_url, download_queue_limit=1,
+                                        retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01))
+        documents = case_documents(portal, scraper, "25-CV-0880")
+        stats = scraper.download_documents(documents, tmp_path, case_number="25-CV-0880")
+
+    # More sheds than attempts, yet only the 503 counted as a failed attempt
+    assert (stats["successful"], stats["failed"], stats["recovered"]) == (2, 0, 1)
+    # The 503 error page was charged against the bandwidth cap too
+    assert len(scheduler.charged) == 3 and all(nbytes > 0 for nbytes in scheduler.charged)
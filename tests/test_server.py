@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the local job API server (no browser required)
+"""
+
+import sys
+import json
+import time
+import threading
+import requests
+from pathlib import Path
+# Add parent directory to path to import court_scraper
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from court_events import NavigationEvent, DocumentFinished, CaseSummary
+from court_server import JobManager, JobServer
+
+class FakeScraper:
+    """Scraper stand-in: each case yields a few events; '*-HOLD' cases wait until released"""
+
+    release = threading.Event()
+
+    def __init__(self, **options):
+        pass
+
+    def scrape_case_iter(self, case_number, download_dir=None):
+        yield NavigationEvent(case_number, step=1, total_steps=7, message="Opening portal")
+        if case_number.endswith("-HOLD"):
+            while not FakeScraper.release.wait(0.01):
+                yield NavigationEvent(case_number, step=2, total_steps=7, message="Waiting")
+        yield DocumentFinished(case_number, filename="2025.01.01_Order.pdf", fragment_id="1", status="success")
+        yield CaseSummary(case_number, result={"success": True, "documents": 1, "downloaded": 1,
+                                               "case_number": case_number})
+
+def start_server(tmp_path, **options):
+    manager = JobManager(tmp_path, scraper_class=FakeScraper, **options)
+    server = JobServer(("127.0.0.1", 0), manager, keepalive_seconds=0.2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def read_sse(response):
+    """Parse a Server-Sent Events stream into (id, event, data) tuples"""
+    events, fields = [], {}
+    for line in response.iter_lines(decode_unicode=True):
+        if line:
+            if not line.startswith(":"):
+                name, _, value = line.partition(": ")
+                fields[name] = value
+            continue
+        if fields:
+            events.append((fields.get("id"), fields.get("event"), json.loads(fields["data"])))
+            fields = {}
+    return events
+
+def test_job_lifecycle_and_event_stream(tmp_path):
+    server, url = start_server(tmp_path, workers=2)
+    try:
+        response = requests.post(f"{url}/jobs", json={"case_numbers": ["25-CV-0001", "25-CV-0002"]}, timeout=5)
+        assert response.status_code == 202
+        job_id = response.json()["jobs"][0]["id"]
+
+        with requests.get(f"{url}/jobs/{job_id}/events", stream=True, timeout=5) as stream:
+            events = read_sse(stream)
+        kinds = [event for _, event, _ in events]
+        assert kinds[0] == "status" and kinds[-1] == "end"
+        assert "navigation" in kinds and "document_finished" in kinds and "summary" in kinds
+        assert events[-1][2]["status"] == "done" and events[-1][2]["result"]["downloaded"] == 1
+
+        # Reconnecting with Last-Event-ID only replays what came after it
+        last_id = events[-3][0]
+        with requests.get(f"{url}/jobs/{job_id}/events", headers={"Last-Event-ID": last_id}, stream=True,
+                          timeout=5) as stream:
+            assert [event for _, event, _ in read_sse(stream)] == [events[-2][1], "end"]
+
+        job = requests.get(f"{url}/jobs/{job_id}", timeout=5).json()
+        assert job["result"]["download_dir"] == str(tmp_path / "25-CV-0001")
+        assert requests.get(f"{url}/jobs/999", timeout=5).status_code == 404
+    finally:
+        server.shutdown()
+        server.manager.close(timeout=5)
+
+def test_admission_control_and_cancellation(tmp_path):
+    FakeScraper.release.clear()
+    server, url = start_server(tmp_path, workers=1, max_queued=3, max_jobs_per_client=3)
+    try:
+        running = requests.post(f"{url}/jobs", json={"case_number": "25-CV-0001-HOLD"}, timeout=5).json()["jobs"][0]
+        deadline = time.monotonic() + 5
+        while requests.get(f"{url}/jobs/{running['id']}", timeout=5).json()["status"] != "running":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        queued = requests.post(f"{url}/jobs", json={"case_numbers": ["25-CV-0002", "25-CV-0003"]}, timeout=5)
+        assert queued.status_code == 202
+        # This client has 3 active jobs (1 running, 2 queued): its next submission is refused
+        limited = requests.post(f"{url}/jobs", json={"case_number": "25-CV-0004"}, timeout=5)
+        assert limited.status_code == 429 and "active jobs" in limited.json()["error"]
+        other_client = {"X-Client-Id": "other-service"}
+        assert requests.post(f"{url}/jobs", json={"case_number": "25-CV-0004"}, headers=other_client,
+                             timeout=5).status_code == 202
+        # The queue is full: the whole submission is refused with a Retry-After hint
+        full = requests.post(f"{url}/jobs", json={"case_numbers": ["25-CV-0005"]}, headers=other_client, timeout=5)
+        assert full.status_code == 429 and "Queue full" in full.json()["error"]
+        assert int(full.headers["Retry-After"]) >= 1
+        # A duplicate of a queued case returns the existing job
+        again = requests.post(f"{url}/jobs", json={"case_number": "25-CV-0002"}, timeout=5).json()["jobs"][0]
+        assert again["id"] == queued.json()["jobs"][0]["id"]
+        cancelled = requests.delete(f"{url}/jobs/{again['id']}", timeout=5).json()
+        assert cancelled["status"] == "cancelled"
+
+        assert requests.delete(f"{url}/jobs/{running['id']}", timeout=5).status_code == 200
+        FakeScraper.release.set()
+        with requests.get(f"{url}/jobs/{running['id']}/events", stream=True, timeout=5) as stream:
+            assert read_sse(stream)[-1][2]["status"] == "cancelled"
+
+        deadline = time.monotonic() + 5
+        while requests.get(f"{url}/status", timeout=5).json()["counts"]["done"] < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert requests.post(f"{url}/jobs", json={"case_numbers": "25-CV-0007"}, timeout=5).status_code == 400
+    finally:
+        FakeScraper.release.set()
+        server.shutdown()
+        server.manager.close(timeout=5)